@@ -0,0 +1,121 @@
+"""The MIT License (MIT)
+
+Copyright (c) 2018 EvieePy
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+
+Benchmark for the NumPy PCM mixer against the audioop calls it replaced, in frames per second.
+
+    python benchmarks/audio_mixing.py
+"""
+import audioop
+import os
+import sys
+import time
+
+import numpy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from eaudio.mixing import Fade, PCMMixer, scale  # noqa: E402
+
+
+FRAMES = 20_000
+FADE = 600
+SOURCES = [os.urandom(3840) for _ in range(4)]
+
+
+def rate(func):
+    started = time.perf_counter()
+    for _ in range(FRAMES):
+        func()
+    return FRAMES / (time.perf_counter() - started)
+
+
+def audioop_crossfade(count):
+    # The old path: a stepped gain per source per frame, then pairwise adds.
+    state = {'frame': 0}
+
+    def run():
+        step = state['frame'] % FADE / FADE
+        state['frame'] += 1
+
+        data = audioop.mul(SOURCES[0], 2, 0.5 * (1 - step))
+        for source in SOURCES[1:count]:
+            data = audioop.add(data, audioop.mul(source, 2, 0.5 * step), 2)
+        return data
+    return run
+
+
+def numpy_crossfade(count, curve):
+    mixer = PCMMixer()
+    state = {'fade': Fade(FADE, curve=curve)}
+
+    def run():
+        fade = state['fade']
+        if fade.done:
+            fade = state['fade'] = Fade(FADE, curve=curve)
+
+        if count == 2:
+            return mixer.crossfade(SOURCES[0], SOURCES[1], fade, volume=0.5)
+
+        fade_out, fade_in = fade.gains()
+        return mixer.mix(SOURCES[:count], [fade_out] + [fade_in] * (count - 1), volume=0.5)
+    return run
+
+
+def check():
+    """The mixer agrees with a float64 reference to within rounding, and fades have no step at frame edges."""
+    mixer = PCMMixer()
+    fade = Fade(3, curve='equal_power')
+    edges = []
+
+    for _ in range(3):
+        reference = Fade(3, curve='equal_power')
+        reference.position = fade.position
+        fade_out, fade_in = (g.astype(numpy.float64) for g in reference.gains())
+        edges.append((fade_out[0], fade_out[-1]))
+
+        a, b = (numpy.frombuffer(s, dtype=numpy.int16).astype(numpy.float64) for s in SOURCES[:2])
+        expected = numpy.clip(a * fade_out * 0.5 + b * fade_in * 0.5, -32768, 32767)
+        got = numpy.frombuffer(mixer.crossfade(SOURCES[0], SOURCES[1], fade, volume=0.5), dtype=numpy.int16)
+        assert numpy.abs(got - expected).max() <= 1
+
+    step = edges[0][0] - edges[0][1]
+    for (_, last), (first, _) in zip(edges, edges[1:]):
+        assert abs(last - first) < step / 100, 'fade steps at a frame boundary'
+
+    expected = numpy.frombuffer(SOURCES[0], dtype=numpy.int16) * 0.3
+    got = numpy.frombuffer(scale(SOURCES[0], 0.3), dtype=numpy.int16)
+    assert numpy.abs(got - expected.astype(numpy.int16)).max() <= 1
+
+
+if __name__ == '__main__':
+    check()
+    print(f'{FRAMES} frames of 20ms stereo PCM\n')
+
+    old = rate(lambda: audioop.mul(SOURCES[0], 2, 0.5))
+    new = rate(lambda: scale(SOURCES[0], 0.5))
+    print(f'volume          audioop {old:>9,.0f}/s   numpy {new:>9,.0f}/s   {new / old:4.2f}x')
+
+    for count in (2, 4):
+        old = rate(audioop_crossfade(count))
+        for curve in ('linear', 'equal_power'):
+            new = rate(numpy_crossfade(count, curve))
+            print(f'{count} sources {curve:<11} audioop {old:>9,.0f}/s   numpy {new:>9,.0f}/s   {new / old:4.2f}x')
@@ -0,0 +1,154 @@
+"""The MIT License (MIT)
+
+Copyright (c) 2018 EvieePy
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+
+Benchmark for the shared AudioScheduler against a sleeping thread per voice connection, using fake voice clients.
+
+    python benchmarks/audio_scheduler.py [streams] [seconds]
+"""
+import audioop
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from eaudio.player import AudioMixer  # noqa: E402
+from eaudio.scheduler import AudioScheduler  # noqa: E402
+
+
+STREAMS = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+SECONDS = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+DELAY = AudioScheduler.DELAY
+FRAME = b'\x01\x00' * 1920
+
+
+class FakeSource:
+    """Endless PCM, paying the same per frame volume cost as YTDLSource."""
+
+    volume = 0.5
+    remaining = 3600
+
+    def read(self, volume=None):
+        return audioop.mul(FRAME, 2, volume or self.volume)
+
+    def is_opus(self):
+        return False
+
+
+class FakeVoiceClient:
+
+    def __init__(self):
+        self._connected = threading.Event()
+        self._connected.set()
+        self.sent = []
+
+    def send_audio_packet(self, data, *, encode=True):
+        self.sent.append(time.perf_counter())
+
+
+class ThreadedPlayer(threading.Thread):
+    """The previous model: one thread per connection, reading, sending and sleeping each frame."""
+
+    def __init__(self, source, client):
+        super().__init__(daemon=True)
+        self.source = source
+        self.client = client
+        self.done = threading.Event()
+
+    def run(self):
+        start = time.time()
+        loops = 0
+
+        while not self.done.is_set():
+            loops += 1
+            self.client.send_audio_packet(self.source.read(), encode=True)
+            next_time = start + DELAY * loops
+            time.sleep(max(0, DELAY + (next_time - time.time())))
+
+
+def run_threads(clients):
+    players = [ThreadedPlayer(FakeSource(), client) for client in clients]
+    for player in players:
+        player.start()
+
+    yield threading.active_count()
+
+    for player in players:
+        player.done.set()
+    for player in players:
+        player.join()
+
+
+def run_scheduler(clients):
+    scheduler = AudioScheduler()
+    mixers = []
+
+    for client in clients:
+        mixer = AudioMixer(client=client, after=lambda e, s: None, after_all=lambda e, s: None,
+                           next_call=lambda s: None, scheduler=scheduler)
+        mixer.queue.put(FakeSource())
+        mixer.do_start()
+        mixers.append(mixer)
+
+    yield threading.active_count()
+
+    for mixer in mixers:
+        mixer.stop()
+    print(f'  {scheduler!r}')
+
+
+def measure(name, runner):
+    clients = [FakeVoiceClient() for _ in range(STREAMS)]
+    baseline = threading.active_count()
+
+    cpu = time.process_time()
+    started = time.perf_counter()
+    steps = runner(clients)
+    threads = next(steps) - baseline
+
+    time.sleep(SECONDS)
+    elapsed = time.perf_counter() - started
+    cpu = time.process_time() - cpu
+    next(steps, None)
+
+    # Jitter is how far the gap between consecutive packets of a stream strays from 20ms.
+    jitter = []
+    frames = 0
+    for client in clients:
+        sent = client.sent
+        frames += len(sent)
+        jitter.extend(abs(b - a - DELAY) * 1000 for a, b in zip(sent, sent[1:]))
+
+    jitter.sort()
+    expected = STREAMS * elapsed / DELAY
+
+    print(f'{name:<10} threads {threads:>4}  cpu {cpu:6.2f}s ({cpu / elapsed:5.1%} of wall)  '
+          f'frames {frames / expected:6.1%} of expected  '
+          f'jitter median {statistics.median(jitter):6.2f}ms  p99 {jitter[int(len(jitter) * 0.99)]:7.2f}ms')
+
+
+if __name__ == '__main__':
+    print(f'{STREAMS} streams for {SECONDS:.0f}s')
+    measure('threads', run_threads)
+    measure('scheduler', run_scheduler)
@@ -0,0 +1,141 @@
+"""The MIT License (MIT)
+
+Copyright (c) 2018 EvieePy
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+
+Benchmark for the in process Equalizer on the EQS presets: accuracy, cost per stream and preset switches.
+
+    python benchmarks/equalizer.py
+"""
+import math
+import os
+import sys
+import time
+
+import numpy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from eaudio.controls import EQS  # noqa: E402
+from eaudio.equalizer import Equalizer, design, parse_filter, peaking  # noqa: E402
+
+
+RATE = 48000
+SAMPLES = 960
+FRAMES = 2000
+
+
+def reference(x, bands):
+    """The cascade one sample at a time, as FFmpeg runs it."""
+    for band in bands:
+        b0, b1, b2, a1, a2 = peaking(band)
+        s1 = s2 = 0.0
+        y = numpy.empty_like(x)
+
+        for i, value in enumerate(x):
+            y[i] = out = b0 * value + s1
+            s1 = b1 * value - a1 * out + s2
+            s2 = b2 * value - a2 * out
+        x = y
+    return x
+
+
+def check(bands):
+    noise = numpy.random.default_rng(0).standard_normal((SAMPLES * 4, 2)) * 3000
+    expected = numpy.stack([reference(noise[:, c], bands) for c in range(2)], axis=1)
+
+    block = design(bands)
+    state = numpy.zeros((block.order, 2))
+    frames = []
+    for index in range(4):
+        y, state = block.run(noise[index * SAMPLES:(index + 1) * SAMPLES], state)
+        frames.append(y)
+
+    return numpy.abs(numpy.vstack(frames) - expected).max()
+
+
+def response(bands, frequency):
+    """Measured gain in dB of a sine through the equalizer, once it has settled."""
+    eq = Equalizer(bands)
+    t = numpy.arange(SAMPLES * 150) / RATE
+    tone = numpy.repeat(numpy.sin(2 * math.pi * frequency * t) * 8000, 2).astype(numpy.int16)
+
+    frames = [eq.process(tone[i:i + SAMPLES * 2].tobytes()) for i in range(0, len(tone), SAMPLES * 2)]
+    out = numpy.frombuffer(b''.join(frames[-25:]), dtype=numpy.int16).astype(numpy.float64)
+
+    return 20 * math.log10(numpy.sqrt(numpy.mean(out ** 2)) / (8000 / math.sqrt(2)))
+
+
+def cost(bands):
+    eq = Equalizer(bands)
+    frame = (numpy.random.default_rng(1).standard_normal(SAMPLES * 2) * 3000).astype(numpy.int16).tobytes()
+
+    for _ in range(FRAMES):
+        eq.process(frame)
+    return eq
+
+
+def switch_jump(crossfade):
+    """The largest step between consecutive samples around a ROCK to BOOST switch, on a steady low tone."""
+    rock, boost = parse_filter(EQS.ROCK['filter']), parse_filter(EQS.BOOST['filter'])
+    eq = Equalizer(rock)
+    t = numpy.arange(SAMPLES * 100) / RATE
+    tone = numpy.repeat(numpy.sin(2 * math.pi * 110 * t) * 8000, 2).astype(numpy.int16)
+
+    out = []
+    for index, start in enumerate(range(0, len(tone), SAMPLES * 2)):
+        if index == 40:
+            if crossfade:
+                eq.switch(boost)
+            else:
+                eq = Equalizer(boost)
+        out.append(eq.process(tone[start:start + SAMPLES * 2].tobytes()))
+
+    left = numpy.frombuffer(b''.join(out), dtype=numpy.int16)[::2].astype(numpy.int64)
+    window = left[39 * SAMPLES:42 * SAMPLES]
+    steady = numpy.abs(numpy.diff(left[20 * SAMPLES:30 * SAMPLES])).max()
+    return numpy.abs(numpy.diff(window)).max(), steady
+
+
+if __name__ == '__main__':
+    for name in ('ROCK', 'BOOST', 'FLAT', 'NIGHTCORE'):
+        bands = parse_filter(getattr(EQS, name)['filter'])
+        if bands is None:
+            print(f'{name:<9} needs FFmpeg (tempo and rate filters), left to edit_source')
+            continue
+
+        eq = cost(bands)
+        print(f'{name:<9} {len(bands)} bands  max error vs per sample {check(bands):.1e}  '
+              f'{eq.cpu / eq.frames * 1e6:5.1f}us/frame  {eq.load:.2%} of a core per stream')
+
+    print('\nROCK band centres, nominal gain vs measured (neighbouring bands overlap):')
+    for band in parse_filter(EQS.ROCK['filter']):
+        print(f'  {band.frequency:>7.0f}Hz  {band.gain:+5.2f}dB  {response((band,), band.frequency):+5.2f}dB alone  '
+              f'{response(parse_filter(EQS.ROCK["filter"]), band.frequency):+5.2f}dB in preset')
+
+    started = time.perf_counter()
+    eq = Equalizer(parse_filter(EQS.ROCK['filter']))
+    eq.switch(parse_filter(EQS.BOOST['filter']))
+    eq.process(bytes(SAMPLES * 4))
+    print(f'\nswitch ROCK to BOOST: {(time.perf_counter() - started) * 1000:.2f}ms including design, no FFmpeg restart')
+
+    for crossfade in (False, True):
+        jump, steady = switch_jump(crossfade)
+        print(f'  {"crossfaded" if crossfade else "fresh filter"}  largest sample step {jump}, steady state {steady}')
@@ -0,0 +1,86 @@
+"""The MIT License (MIT)
+
+Copyright (c) 2018 EvieePy
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+
+Benchmark for batched fuzzy extraction against plain per-choice scoring.
+
+    python benchmarks/fuzzy_extract.py
+"""
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import fuzzy  # noqa: E402
+
+
+SIZES = (10_000, 100_000)
+QUERIES = ('music', 'play', 'Guild.members', 'favourites list', 'emoji', 'xqz')
+
+
+def make_choices(count, seed=0):
+    rng = random.Random(seed)
+    letters = string.ascii_lowercase + '_'
+
+    return [' '.join(''.join(rng.choice(letters) for _ in range(rng.randint(3, 10)))
+                     for _ in range(rng.randint(1, 3))) for _ in range(count)]
+
+
+def plain(query, choices, scorer, limit):
+    it = fuzzy._extraction_generator(query, choices, scorer, 0)
+    return fuzzy.heapq.nlargest(limit, it, key=lambda t: t[1])
+
+
+def timed(func, *args, **kwargs):
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def main():
+    scorers = (fuzzy.quick_ratio, fuzzy.ratio, fuzzy.partial_ratio, fuzzy.token_sort_ratio)
+
+    for size in SIZES:
+        choices = make_choices(size)
+        print(f'\n{size} choices\n{"=" * 60}')
+
+        for scorer in scorers:
+            slow = fast = 0
+
+            for query in QUERIES:
+                expected, elapsed = timed(plain, query, choices, scorer, 10)
+                slow += elapsed
+
+                result, elapsed = timed(fuzzy.extract, query, choices, scorer=scorer, limit=10)
+                fast += elapsed
+
+                assert result == expected, (scorer.__name__, query)
+
+            count = len(QUERIES)
+            print(f'{scorer.__name__:>18} | plain: {slow / count * 1000:9.2f}ms | '
+                  f'batch: {fast / count * 1000:9.2f}ms | {slow / fast:6.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,207 @@
+"""The MIT License (MIT)
+
+Copyright (c) 2018 EvieePy
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+
+Exercise NodePool against mock Lavalink websocket servers: load-aware placement, moving players off a node that
+goes away, and draining an overloaded node. Nothing here talks to Discord or a real Lavalink.
+
+    python benchmarks/lavalink_pool.py
+"""
+import asyncio
+import collections
+import os
+import sys
+
+import aiohttp
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.nodes import NodePool  # noqa: E402
+from utils.timers import TimerWheel  # noqa: E402
+
+
+PASSWORD = 'youshallnotpass'
+GUILDS = 90
+STATS_INTERVAL = 0.05
+
+
+class MockLavalink:
+    """A websocket server speaking enough of the Lavalink protocol to be placed on and played from."""
+
+    def __init__(self, name, port, load):
+        self.name = name
+        self.port = port
+        self.load = load
+        self.players = {}
+        self.sockets = set()
+        self.runner = None
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get('/', self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, '127.0.0.1', self.port).start()
+
+    async def stop(self):
+        for ws in list(self.sockets):
+            await ws.close()
+        await self.runner.cleanup()
+
+    async def handle(self, request):
+        if request.headers.get('Authorization') != PASSWORD:
+            return web.Response(status=401)
+
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.sockets.add(ws)
+        ticker = asyncio.ensure_future(self.tick(ws))
+
+        try:
+            async for message in ws:
+                data = message.json()
+                if data['op'] == 'play':
+                    self.players[data['guildId']] = [data.get('startTime', 0), asyncio.get_event_loop().time()]
+                elif data['op'] == 'destroy':
+                    self.players.pop(data['guildId'], None)
+        finally:
+            ticker.cancel()
+            self.sockets.discard(ws)
+        return ws
+
+    async def tick(self, ws):
+        while not ws.closed:
+            now = asyncio.get_event_loop().time()
+            await ws.send_json({'op': 'stats', 'players': len(self.players), 'playingPlayers': len(self.players),
+                                'cpu': {'cores': 4, 'systemLoad': self.load, 'lavalinkLoad': self.load / 2},
+                                'frameStats': {'sent': 3000, 'nulled': 0, 'deficit': 0}})
+
+            for guild_id, (start, began) in self.players.items():
+                await ws.send_json({'op': 'playerUpdate', 'guildId': guild_id,
+                                    'state': {'time': 0, 'position': int(start + (now - began) * 1000)}})
+            await asyncio.sleep(STATS_INTERVAL)
+
+
+class Stub:
+    pass
+
+
+def fake_bot(loop):
+    bot = Stub()
+    bot.loop = loop
+    bot.shard_count = 1
+    bot.user = Stub()
+    bot.user.id = 1
+    bot.timers = TimerWheel(loop)
+
+    async def wait_until_ready():
+        pass
+
+    bot.wait_until_ready = wait_until_ready
+    return bot
+
+
+def fake_client():
+    client = Stub()
+    client.ws = Stub()
+    client.ws._ws = None
+    client.stats = None
+    client.players = {}
+
+    async def dispatch_event(event):
+        pass
+
+    client.dispatch_event = dispatch_event
+    return client
+
+
+def show(title, pool):
+    print(f'\n{title}')
+    for node in pool.nodes.values():
+        if node is pool.primary:
+            continue
+        print(f'  {node.name:<8} {"up" if node.connected else "down":<5} load {node.stats.system_load:>4.0%}  '
+              f'penalty {node.penalty:>7.1f}  players {len(node.guilds)}')
+    print(f'  migrations {pool.migrations}')
+
+
+async def settle(pool, predicate, timeout=5.0):
+    loop = asyncio.get_event_loop()
+    deadline = loop.time() + timeout
+
+    while not predicate() and loop.time() < deadline:
+        await asyncio.sleep(STATS_INTERVAL)
+
+
+async def main():
+    loop = asyncio.get_event_loop()
+    servers = [MockLavalink('alpha', 20331, 0.10), MockLavalink('beta', 20332, 0.40),
+               MockLavalink('gamma', 20333, 0.70)]
+    for server in servers:
+        await server.start()
+
+    session = aiohttp.ClientSession()
+    pool = NodePool(fake_bot(loop), fake_client(), interval=0.5, overload=200, batch=5)
+    for server in servers:
+        pool.add_node(server.name, '127.0.0.1', password=PASSWORD, rest_port=server.port, ws_port=server.port)
+
+    await pool.start(session)
+    await settle(pool, lambda: all(n.connected for n in pool.nodes.values() if n is not pool.primary))
+    await asyncio.sleep(STATS_INTERVAL * 2)
+
+    # Place guilds one at a time, letting stats catch up so each placement sees the load the last one added.
+    for index in range(GUILDS):
+        guild_id = str(1000 + index)
+        await pool.send(op='voiceUpdate', guildId=guild_id, sessionId='session', event={'token': 't'})
+        await pool.send(op='play', guildId=guild_id, track=f'track-{index}')
+        await asyncio.sleep(STATS_INTERVAL / 2)
+
+    show(f'Placed {GUILDS} players by penalty:', pool)
+    await asyncio.sleep(1)
+
+    # alpha goes away; its players resume elsewhere from the position they had reached.
+    moving = set(pool.nodes['alpha'].guilds)
+    await servers[0].stop()
+    await settle(pool, lambda: not pool.nodes['alpha'].guilds)
+    await asyncio.sleep(STATS_INTERVAL * 2)
+
+    resumed = [p[0] for s in servers[1:] for g, p in s.players.items() if g in moving]
+    show('alpha stopped:', pool)
+    print(f'  {len(resumed)}/{len(moving)} moved players resumed, '
+          f'start positions {min(resumed, default=0)}-{max(resumed, default=0)}ms')
+
+    # beta becomes overloaded and is drained a batch per check, down to where it is no worse than gamma.
+    servers[1].load = 0.98
+    await asyncio.sleep(3)
+    show('beta overloaded:', pool)
+
+    counts = collections.Counter(state.node.name for state in pool.players.values())
+    assert sum(counts.values()) == GUILDS, counts
+
+    await pool.close()
+    await session.close()
+    for server in servers[1:]:
+        await server.stop()
+
+
+if __name__ == '__main__':
+    asyncio.get_event_loop().run_until_complete(main())
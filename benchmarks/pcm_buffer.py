@@ -0,0 +1,130 @@
+"""The MIT License (MIT)
+
+Copyright (c) 2018 EvieePy
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+
+Benchmark for the read-ahead PCMBuffer against reading frames straight from the pipe, with stalling producers.
+
+Each producer stands in for FFmpeg, decoding at twice real time but stalling for STALL seconds every few seconds.
+One consumer thread plays every stream at 20ms a frame, as the shared scheduler does.
+
+    python benchmarks/pcm_buffer.py [streams] [seconds]
+"""
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from eaudio.buffer import FRAME_SIZE, SILENCE, PCMBuffer  # noqa: E402
+
+
+STREAMS = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+SECONDS = float(sys.argv[2]) if len(sys.argv) > 2 else 8.0
+STALL = 0.6
+DELAY = 0.02
+
+
+def producer(fd, stop, seed):
+    rng = random.Random(seed)
+    frame = bytes(range(256)) * (FRAME_SIZE // 256)
+    stall_at = time.perf_counter() + rng.uniform(1, 3)
+
+    try:
+        while not stop.is_set():
+            if time.perf_counter() >= stall_at:
+                time.sleep(STALL)
+                stall_at = time.perf_counter() + rng.uniform(2, 4)
+
+            os.write(fd, frame)
+            time.sleep(DELAY / 2)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def open_streams():
+    stop = threading.Event()
+    pipes = []
+
+    for index in range(STREAMS):
+        read, write = os.pipe()
+        threading.Thread(target=producer, args=(write, stop, index), daemon=True).start()
+        pipes.append(os.fdopen(read, 'rb'))
+    return stop, pipes
+
+
+def play(read_frame, streams):
+    """Pace frames at 20ms, returning how late each tick finished and how many silent frames were played."""
+    lateness = []
+    silent = 0
+    started = time.perf_counter()
+
+    for tick in range(1, int(SECONDS / DELAY) + 1):
+        for stream in streams:
+            if read_frame(stream) is SILENCE:
+                silent += 1
+
+        lateness.append(max(0.0, time.perf_counter() - (started + tick * DELAY)))
+        delay = started + tick * DELAY - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+    return lateness, silent
+
+
+def report(name, lateness, silent, extra=''):
+    lateness.sort()
+    late = sum(1 for l in lateness if l > DELAY)
+    print(f'{name:<9} ticks over a frame late {late:>4}/{len(lateness)}  worst {lateness[-1] * 1000:7.1f}ms  '
+          f'p99 {lateness[int(len(lateness) * 0.99)] * 1000:7.1f}ms  silent frames {silent:>4}{extra}')
+
+
+def direct():
+    stop, pipes = open_streams()
+    lateness, silent = play(lambda pipe: pipe.read(FRAME_SIZE), pipes)
+    stop.set()
+    report('direct', lateness, silent)
+
+
+def buffered():
+    stop, pipes = open_streams()
+    buffers = [PCMBuffer(pipe, seconds=2.0) for pipe in pipes]
+
+    # Let the buffers fill before playback starts, as a track does while it is queued.
+    time.sleep(1.0)
+    lateness, silent = play(lambda buffer: buffer.read(), buffers)
+    stop.set()
+
+    underruns = sum(b.underruns for b in buffers)
+    low = min(b.low for b in buffers)
+    report('buffered', lateness, silent, f'  underruns {underruns}  lowest level {low} frames')
+
+    for buffer in buffers:
+        buffer.close()
+
+
+if __name__ == '__main__':
+    print(f'{STREAMS} streams for {SECONDS:.0f}s, producers stalling for {STALL * 1000:.0f}ms\n')
+    direct()
+    buffered()
@@ -0,0 +1,103 @@
+"""The MIT License (MIT)
+
+Copyright (c) 2018 EvieePy
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+
+Benchmark for the indexed track queue against the asyncio.Queue deque it replaced, at 10k tracks.
+
+    python benchmarks/queue_shuffle.py
+"""
+import collections
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.indexed import IndexedDeque  # noqa: E402
+
+
+COUNT = 10_000
+LOOKUPS = 1_000
+
+
+class Track:
+
+    __slots__ = ('key', 'title')
+
+    def __init__(self, key):
+        self.key = key
+        self.title = f'Track {key}'
+
+
+def timed(func, *args, **kwargs):
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def deque_dedupe(queue, keys):
+    return sum(any(t.key == k for t in queue) for k in keys)
+
+
+def indexed_dedupe(queue, keys):
+    return sum(queue.contains_key(k) for k in keys)
+
+
+def deque_remove(queue, indexes):
+    for index in indexes:
+        del queue[index]
+
+
+def indexed_remove(queue, indexes):
+    for index in indexes:
+        queue.pop(index)
+
+
+def main():
+    rng = random.Random(0)
+    tracks = [Track(f'id{i}') for i in range(COUNT)]
+    keys = [f'id{rng.randrange(COUNT * 2)}' for _ in range(LOOKUPS)]
+    removals = sorted(rng.sample(range(COUNT), LOOKUPS), reverse=True)
+
+    old = collections.deque(tracks)
+    new = IndexedDeque(tracks, key=lambda t: t.key)
+
+    print(f'{COUNT} tracks\n{"=" * 60}')
+
+    for name, slow, fast in (('shuffle', lambda: random.Random(1).shuffle(old), lambda: new.shuffle(random.Random(1))),
+                             (f'dedupe x{LOOKUPS}', lambda: deque_dedupe(old, keys), lambda: indexed_dedupe(new, keys)),
+                             (f'remove x{LOOKUPS}', lambda: deque_remove(old, removals),
+                              lambda: indexed_remove(new, removals))):
+        expected, slow_time = timed(slow)
+        result, fast_time = timed(fast)
+
+        assert result == expected, name
+        print(f'{name:>14} | deque: {slow_time * 1000:9.2f}ms | indexed: {fast_time * 1000:8.2f}ms | '
+              f'{slow_time / fast_time:7.1f}x')
+
+    remaining = set(new)
+    assert [t.key for t in old] == [t.key for t in new]
+    assert all(new.contains_key(t.key) == (t in remaining) for t in tracks)
+
+
+if __name__ == '__main__':
+    main()
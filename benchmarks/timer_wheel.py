@@ -0,0 +1,105 @@
+"""The MIT License (MIT)
+
+Copyright (c) 2018 EvieePy
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+
+Benchmark for the shared TimerWheel against a sleeping task per timer and plain loop.call_later.
+
+    python benchmarks/timer_wheel.py
+"""
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.timers import TimerWheel  # noqa: E402
+
+
+COUNT = 100_000
+SPAN = 3.0
+
+
+async def sleeper(delay, fired):
+    await asyncio.sleep(delay)
+    fired.append(delay)
+
+
+async def run_tasks(loop, delays, fired):
+    handles = [loop.create_task(sleeper(d, fired)) for d in delays]
+    return handles, lambda h: h.cancel()
+
+
+async def run_call_later(loop, delays, fired):
+    handles = [loop.call_later(d, fired.append, d) for d in delays]
+    return handles, lambda h: h.cancel()
+
+
+async def run_wheel(loop, delays, fired):
+    wheel = TimerWheel(loop)
+    handles = [wheel.call_later(d, fired.append, d) for d in delays]
+    return handles, lambda h: h.cancel()
+
+
+async def measure(name, runner, delays, cancel):
+    loop = asyncio.get_event_loop()
+    fired = []
+
+    started = time.perf_counter()
+    handles, canceller = await runner(loop, delays, fired)
+    scheduled = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for index in cancel:
+        canceller(handles[index])
+    cancelled = time.perf_counter() - started
+
+    # Sample how late a plain sleep wakes up while the timers drain, as a measure of loop pressure.
+    expected = len(delays) - len(cancel)
+    lag = 0
+    started = loop.time()
+    while len(fired) < expected and loop.time() < started + SPAN * 4:
+        before = loop.time()
+        await asyncio.sleep(0.05)
+        lag = max(lag, loop.time() - before - 0.05)
+    drained = loop.time() - started
+
+    assert len(fired) == expected, (name, len(fired))
+
+    print(f'{name:>12} | schedule: {scheduled * 1000:7.1f}ms | cancel {len(cancel)}: {cancelled * 1000:6.1f}ms | '
+          f'drained: {drained:5.2f}s | max loop lag: {lag * 1000:6.1f}ms')
+
+
+def main():
+    rng = random.Random(0)
+    delays = [rng.random() * SPAN for _ in range(COUNT)]
+    cancel = rng.sample(range(COUNT), COUNT // 2)
+
+    print(f'{COUNT} timers over {SPAN}s, half cancelled\n{"=" * 80}')
+
+    loop = asyncio.get_event_loop()
+    for name, runner in (('tasks', run_tasks), ('call_later', run_call_later), ('TimerWheel', run_wheel)):
+        loop.run_until_complete(measure(name, runner, delays, cancel))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,8 @@
 from .errors import *
+from .buffer import *
 from .downloader import YTDLSource
+from .equalizer import *
+from .mixing import *
 from .player import AudioMixer
+from .scheduler import *
 from .controls import *
\ No newline at end of file
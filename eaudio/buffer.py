@@ -0,0 +1,271 @@
+"""
+LICENSE:
+Copyright (c) 2018 MysterialPy, Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+from discord.opus import Encoder as OpusEncoder
+
+import os
+import selectors
+import threading
+import traceback
+
+
+__all__ = ('PCMBuffer', 'BufferReader', 'get_reader', 'SILENCE')
+
+
+FRAME_SIZE = OpusEncoder.FRAME_SIZE
+FRAMES_PER_SECOND = 1000 // OpusEncoder.FRAME_LENGTH
+SILENCE = bytes(FRAME_SIZE)
+
+
+class PCMBuffer:
+    """A read-ahead ring of decoded PCM from an FFmpeg pipe.
+
+    A shared BufferReader fills the ring straight from the pipe, so a stall in FFmpeg or on disk is absorbed by
+    the buffered seconds instead of blocking playback. There is one writer and one reader. The playback side gets
+    each frame as a memoryview into the ring, which stays valid until its next read.
+    """
+
+    def __init__(self, pipe, *, seconds=5.0, chunk=0.25, reader=None):
+        self.pipe = pipe
+        self.fd = pipe.fileno()
+        self.capacity = max(2, int(seconds * FRAMES_PER_SECOND)) * FRAME_SIZE
+        # The reader waits for at least this much room, so the pipe is read in large batches.
+        self.chunk = min(self.capacity // 2, max(1, int(chunk * FRAMES_PER_SECOND)) * FRAME_SIZE)
+
+        self._ring = bytearray(self.capacity)
+        self._view = memoryview(self._ring)
+        self._head = 0
+        self._tail = 0
+        self._held = 0
+
+        self.eof = False
+        self.closed = False
+        self.frames = 0
+        self.underruns = 0
+        self.reads = 0
+        self.low = None
+
+        self.reader = reader if reader is not None else get_reader()
+        self.reader.add(self)
+
+    def __repr__(self):
+        return f'<PCMBuffer level: {self.level}/{self.capacity // FRAME_SIZE} frames, underruns: {self.underruns}, ' \
+               f'eof: {self.eof}>'
+
+    @property
+    def level(self):
+        """Whole frames buffered and not yet played."""
+        return (self._head - self._tail - self._held) // FRAME_SIZE
+
+    @property
+    def fill(self):
+        return (self._head - self._tail) / self.capacity
+
+    @property
+    def seconds(self):
+        return self.level / FRAMES_PER_SECOND
+
+    def writable(self):
+        """The free, contiguous part of the ring after the head, or None while there is not a chunk of room."""
+        free = self.capacity - (self._head - self._tail)
+        if free < self.chunk:
+            return None
+
+        start = self._head % self.capacity
+        return self._view[start:start + min(free, self.capacity - start)]
+
+    def wrote(self, count):
+        if not count:
+            self.eof = True
+        self.reads += 1
+        self._head += count
+
+    def read(self):
+        """The next frame. SILENCE when the buffer has run dry, and an empty bytes once the stream has ended."""
+        # The frame handed out last time is done with, so its space can be reused.
+        self._tail += self._held
+        self._held = 0
+
+        available = self._head - self._tail
+        level = available // FRAME_SIZE
+
+        if self.frames and (self.low is None or level < self.low):
+            self.low = level
+
+        if available >= FRAME_SIZE:
+            size = FRAME_SIZE
+        elif self.eof and available:
+            size = available
+        elif self.eof:
+            return b''
+        else:
+            if self.frames:
+                self.underruns += 1
+            return SILENCE
+
+        # The ring is a whole number of frames and read a frame at a time, so frames never wrap.
+        start = self._tail % self.capacity
+        self._held = size
+        self.frames += 1
+
+        return self._view[start:start + size]
+
+    def close(self):
+        """Stop filling the buffer. Once this returns the reader has let go of the pipe, so it is safe to close."""
+        self.closed = True
+        self.reader.remove(self)
+
+
+class BufferReader(threading.Thread):
+    """Fills every PCMBuffer from one thread, waiting on all their pipes with a selector.
+
+    Removals are queued and acknowledged by this thread between selects, so a pipe is never read after its
+    buffer has been removed, even if its descriptor number is reused straight away.
+    """
+
+    def __init__(self, *, interval=0.01, timeout=1.0):
+        super().__init__(name='BufferReader', daemon=True)
+        self.interval = interval
+        self.timeout = timeout
+
+        self._buffers = set()
+        self._removals = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._selector = selectors.DefaultSelector()
+
+        # Written to on removal, so a select in progress returns without waiting out the interval.
+        self._waker, self._waker_w = os.pipe()
+        os.set_blocking(self._waker, False)
+        os.set_blocking(self._waker_w, False)
+        self._selector.register(self._waker, selectors.EVENT_READ, None)
+
+        self.bytes = 0
+
+    def __len__(self):
+        return len(self._buffers)
+
+    def add(self, buffer):
+        with self._lock:
+            self._buffers.add(buffer)
+
+            if not self.is_alive():
+                self.start()
+        self._wake.set()
+
+    def remove(self, buffer):
+        """Stop reading buffer, blocking until this thread has unregistered its pipe."""
+        done = threading.Event()
+
+        with self._lock:
+            self._buffers.discard(buffer)
+
+            if not self.is_alive() or threading.current_thread() is self:
+                return
+            self._removals.append((buffer, done))
+
+        self._wake.set()
+        try:
+            os.write(self._waker_w, b'\0')
+        except BlockingIOError:
+            pass
+
+        done.wait(self.timeout)
+
+    def run(self):
+        registered = {}
+
+        while True:
+            if not self._buffers and not self._removals:
+                self._wake.wait()
+                self._wake.clear()
+
+            with self._lock:
+                removals, self._removals = self._removals, []
+                wanted = {b.fd: b for b in self._buffers if not b.eof and not b.closed and b.writable() is not None}
+
+            for buffer, done in removals:
+                if registered.get(buffer.fd) is buffer:
+                    self._selector.unregister(buffer.fd)
+                    del registered[buffer.fd]
+                done.set()
+
+            # Compare buffers and not just descriptors, as a closed pipe's number can be reused by a new one.
+            for fd, buffer in registered.items():
+                if wanted.get(fd) is not buffer:
+                    self._selector.unregister(fd)
+            for fd, buffer in list(wanted.items()):
+                if registered.get(fd) is buffer:
+                    continue
+                try:
+                    self._selector.register(fd, selectors.EVENT_READ, buffer)
+                except (OSError, ValueError):
+                    del wanted[fd]
+                    buffer.eof = True
+            registered = wanted
+
+            if not registered:
+                self._wake.wait(self.interval)
+                self._wake.clear()
+                continue
+
+            for key, _ in self._selector.select(self.interval):
+                if key.data is None:
+                    self._drain()
+                else:
+                    self._fill(key.data)
+
+    def _drain(self):
+        try:
+            while os.read(self._waker, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _fill(self, buffer):
+        target = buffer.writable()
+        if target is None or buffer.closed:
+            return
+
+        try:
+            count = os.readv(buffer.fd, [target])
+        except OSError:
+            count = 0
+        except Exception:
+            traceback.print_exc()
+            count = 0
+
+        self.bytes += count
+        buffer.wrote(count)
+
+
+_reader = None
+_reader_lock = threading.Lock()
+
+
+def get_reader():
+    """The shared BufferReader, created on first use."""
+    global _reader
+
+    with _reader_lock:
+        if _reader is None:
+            _reader = BufferReader()
+        return _reader
@@ -1,25 +1,23 @@
 import discord
 
 import asyncio
-import audioop
 import json
 import math
-import subprocess
 import youtube_dl
 from functools import partial
 
 import eaudio
 import utils
+from eaudio.buffer import PCMBuffer, SILENCE
+from eaudio.equalizer import Equalizer, parse_filter
+from eaudio.mixing import scale
 
 
-def get_duration(url):
+async def get_duration(url):
     try:
-        cmd = f'ffprobe -v error -show_format -of json {url}'
-        process = subprocess.Popen(cmd.split(), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        output, error = process.communicate()
-        data = json.loads(output)
+        result = await utils.run_process('ffprobe', '-v', 'error', '-show_format', '-of', 'json', url, timeout=15)
+        data = json.loads(result.stdout)
         match = data['format']['duration']
-        process.kill()
     except Exception:
         # Fucking annoying
         return 0
@@ -50,6 +48,9 @@ class YTDLSource(discord.PCMVolumeTransformer):
 
     def __init__(self, source, *, data, requester, filename):
         super().__init__(source)
+        # FFmpeg is read ahead on the shared reader thread, never by the playback thread.
+        self.buffer = PCMBuffer(source._stdout)
+        self.equalizer = Equalizer()
         self.requester = requester
         self.filename = filename
         self.data = data
@@ -76,8 +77,29 @@ class YTDLSource(discord.PCMVolumeTransformer):
         return self.__getattribute__(item)
 
     def read(self, volume=None):
+        return scale(self.read_pcm(), self.volume if volume is None else volume)
+
+    def read_pcm(self):
+        """The next frame without volume applied, for mixing. It is only valid until the next read."""
+        data = self.buffer.read()
+        if data is SILENCE:
+            return data
+
         self.frames += 1
-        return audioop.mul(super().read(), 2, volume or self.volume)
+        return self.equalizer.process(data)
+
+    def set_equalizer(self, eq):
+        """Switch to an EQS preset in place. False when it needs FFmpeg, as nightcore's tempo change does."""
+        bands = parse_filter(eq['filter'])
+        if bands is None:
+            return False
+
+        self.equalizer.switch(bands)
+        return True
+
+    def cleanup(self):
+        self.buffer.close()
+        super().cleanup()
 
     @property
     def length(self):
@@ -95,46 +117,61 @@ class YTDLSource(discord.PCMVolumeTransformer):
     async def create_source(cls, ctx, search: str, *, loop, volume, download=True):
         loop = loop or asyncio.get_event_loop()
 
-        ytdlopts['outtmpl'] = f'downloads/{ctx.guild.id}/%(extractor)s-%(id)s-%(title)s.%(ext)s'
-        ytdl = youtube_dl.YoutubeDL(ytdlopts)
+        if download:
+            # Downloads are shared between guilds through the bot's audio cache.
+            entry = await ctx.bot.audio_cache.get(search)
+            data = dict(entry.info)
+            source = entry.path
+        else:
+            ytdl = youtube_dl.YoutubeDL(ytdlopts)
 
-        to_run = partial(ytdl.extract_info, url=search, download=download)
-        data = await utils.evieecutor(func=to_run, executor=None, loop=loop)
+            to_run = partial(ytdl.extract_info, url=search, download=False)
+            data = await utils.evieecutor(func=to_run, executor=None, loop=loop)
 
-        if 'entries' in data:
-            # take first item from a playlist
-            data = data['entries'][0]
+            if 'entries' in data:
+                # take first item from a playlist
+                data = data['entries'][0]
+            source = data['url']
 
-        data['duration'] = data.get('duration', get_duration(data['url']))
+        # Probe what we will play. A cached entry's stream URL is from download time and has likely expired.
+        if not data.get('duration'):
+            data['duration'] = await get_duration(source)
         data['channel'] = ctx.channel
         data['volume'] = volume
 
-        if download:
-            source = ytdl.prepare_filename(data)
-        else:
-            source = data['url']
-
         return cls(discord.FFmpegPCMAudio(source), data=data, requester=ctx.author, filename=source)
 
     @classmethod
     async def copy_source(cls, controller, source):
+        in_process = parse_filter(controller.eq['filter']) is not None
         opts = {'before_options': '-nostdin',
-                'options': f'{controller.eq["filter"]}"'}
+                'options': '-vn' if in_process else f'{controller.eq["filter"]}"'}
 
         source.data['volume'] = controller.volume
 
-        return cls(discord.FFmpegPCMAudio(source.filename, **opts), data=source.data, requester=source.requester,
+        copy = cls(discord.FFmpegPCMAudio(source.filename, **opts), data=source.data, requester=source.requester,
                    filename=source.filename)
+        if in_process:
+            copy.set_equalizer(controller.eq)
+        return copy
 
     @classmethod
     async def edit_source(cls, controller, source, _filter, skip=False):
+        """A new source from the old one's position, for the caller to swap in before cleaning up the old one.
+
+        To switch a plain EQS preset without restarting FFmpeg, call set_equalizer on the playing source instead.
+        """
+        in_process = parse_filter(_filter['filter']) is not None
         opts = {'before_options': f'-ss {source.progress} -nostdin',
-                'options': f'{_filter["filter"]}"'}
+                'options': '-vn' if in_process else f'{_filter["filter"]}"'}
 
         source.data['volume'] = controller.volume
 
-        return cls(discord.FFmpegPCMAudio(source.filename, **opts), data=source.data, requester=source.requester,
-                   filename=source.filename)
+        edited = cls(discord.FFmpegPCMAudio(source.filename, **opts), data=source.data, requester=source.requester,
+                     filename=source.filename)
+        if in_process:
+            edited.set_equalizer(_filter)
+        return edited
     """
     @classmethod
     async def regather_stream(cls, data, *, loop):
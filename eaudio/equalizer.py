@@ -0,0 +1,247 @@
+"""
+LICENSE:
+Copyright (c) 2018 MysterialPy, Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+from discord.opus import Encoder as OpusEncoder
+
+import collections
+import functools
+import math
+import threading
+import time
+
+import numpy
+
+
+__all__ = ('Equalizer', 'Band', 'parse_filter')
+
+
+SAMPLE_RATE = OpusEncoder.SAMPLING_RATE
+SAMPLES = OpusEncoder.SAMPLES_PER_FRAME
+CHANNELS = OpusEncoder.CHANNELS
+DELAY = OpusEncoder.FRAME_LENGTH / 1000.0
+
+Band = collections.namedtuple('Band', 'frequency width_type width gain')
+
+
+def parse_filter(chain):
+    """The bands of an EQS filter chain, or None when it uses filters other than equalizer, such as atempo."""
+    chain = chain.split('-af', 1)[-1].strip().strip('"')
+    bands = []
+
+    for part in filter(None, chain.split(',')):
+        name, _, args = part.partition('=')
+        if name != 'equalizer':
+            return None
+
+        opts = dict(arg.split('=', 1) for arg in args.split(':'))
+        bands.append(Band(float(opts['f']), opts.get('width_type', 'q'), float(opts.get('width', 1)),
+                          float(opts.get('g', 0))))
+
+    return tuple(bands)
+
+
+def peaking(band, rate=SAMPLE_RATE):
+    """Biquad coefficients (b0, b1, b2, a1, a2) of FFmpeg's equalizer filter for a band."""
+    w0 = 2 * math.pi * band.frequency / rate
+    gain = 10 ** (band.gain / 40)
+    width_type, width = band.width_type, band.width
+
+    if width_type == 'h':
+        alpha = math.sin(w0) / (2 * band.frequency / width)
+    elif width_type == 'k':
+        alpha = math.sin(w0) / (2 * band.frequency / (width * 1000))
+    elif width_type == 'o':
+        alpha = math.sin(w0) * math.sinh(math.log(2) / 2 * width * w0 / math.sin(w0))
+    elif width_type == 's':
+        alpha = math.sin(w0) / 2 * math.sqrt((gain + 1 / gain) * (1 / width - 1) + 2)
+    else:
+        alpha = math.sin(w0) / (2 * width)
+
+    a0 = 1 + alpha / gain
+    return ((1 + alpha * gain) / a0, -2 * math.cos(w0) / a0, (1 - alpha * gain) / a0,
+            -2 * math.cos(w0) / a0, (1 - alpha / gain) / a0)
+
+
+class Design:
+    """A cascade of biquads as one state space system, laid out to filter a frame in a few matrix products.
+
+    A frame is split into blocks. Each block's output is its own input through a Toeplitz matrix of the impulse
+    response, plus the response to the state it started in. The state at the start of every block is in turn a
+    single product over the frame's input, so nothing loops per sample or per block in Python.
+    """
+
+    def __init__(self, bands, *, samples=SAMPLES, block=64, rate=SAMPLE_RATE):
+        sections = [peaking(band, rate) for band in bands if band.frequency < rate / 2]
+        a, b, c, d = self.cascade(sections)
+
+        self.order = n = len(a)
+        self.block = block
+        self.blocks = k = samples // block
+
+        powers = [numpy.eye(n)]
+        for _ in range(block):
+            powers.append(a @ powers[-1])
+
+        impulse = [d] + [(c @ powers[i] @ b).item() for i in range(block - 1)]
+        self.toeplitz = numpy.array([[impulse[i - j] if i >= j else 0.0 for j in range(block)]
+                                     for i in range(block)])
+        self.observe = numpy.vstack([c @ powers[i] for i in range(block)])
+        self.inputs = numpy.hstack([powers[block - 1 - j] @ b for j in range(block)])
+        self.step = powers[block]
+
+        # State at the start of block i: step^i applied to the frame's first state, plus step^(i-1-j) applied to
+        # what each earlier block j put in.
+        step_powers = [numpy.eye(n)]
+        for _ in range(k):
+            step_powers.append(self.step @ step_powers[-1])
+
+        self.carry = numpy.zeros((k * n, k * n))
+        for i in range(k):
+            for j in range(i):
+                self.carry[i * n:(i + 1) * n, j * n:(j + 1) * n] = step_powers[i - 1 - j]
+        self.initial = numpy.vstack(step_powers[:k])
+
+    @staticmethod
+    def cascade(sections):
+        a = numpy.zeros((0, 0))
+        b = numpy.zeros((0, 1))
+        c = numpy.zeros((1, 0))
+        d = 1.0
+
+        for b0, b1, b2, a1, a2 in sections:
+            # Transposed direct form II of one biquad, fed by everything before it.
+            sa = numpy.array([[-a1, 1.0], [-a2, 0.0]])
+            sb = numpy.array([[b1 - a1 * b0], [b2 - a2 * b0]])
+            sc = numpy.array([[1.0, 0.0]])
+
+            n = len(a)
+            a = numpy.block([[a, numpy.zeros((n, 2))], [sb @ c, sa]])
+            b = numpy.vstack([b, sb * d])
+            c = numpy.hstack([b0 * c, sc])
+            d = b0 * d
+
+        return a, b, c, d
+
+    def run(self, x, state):
+        """Filter a frame of shape (samples, channels), returning the output and the state after it."""
+        k, n, channels = self.blocks, self.order, x.shape[1]
+        blocks = x.reshape(k, self.block, channels)
+
+        y = self.toeplitz @ blocks
+        if not n:
+            return y.reshape(x.shape), state
+
+        pushed = self.inputs @ blocks
+        starts = (self.carry @ pushed.reshape(k * n, channels) + self.initial @ state).reshape(k, n, channels)
+        y += self.observe @ starts
+
+        return y.reshape(x.shape), self.step @ starts[-1] + pushed[-1]
+
+
+@functools.lru_cache(maxsize=16)
+def design(bands):
+    return Design(bands)
+
+
+class Equalizer:
+    """Applies an EQS preset to frames of int16 PCM in process.
+
+    Switching presets happens between frames. For one frame both presets run and the output moves from the old to
+    the new across it, so there is no restart, seek or click. CPU time spent is kept per equalizer, which is one
+    per stream.
+    """
+
+    def __init__(self, bands=None, *, channels=CHANNELS):
+        self.channels = channels
+        self.frame_size = SAMPLES * channels * 2
+
+        self.design = None
+        self.state = None
+        self._previous = None
+        self._pending = None
+        self._lock = threading.Lock()
+        self._ramp = numpy.linspace(0, 1, SAMPLES, endpoint=False)[:, None]
+
+        self.cpu = 0.0
+        self.frames = 0
+        self.switches = 0
+
+        if bands:
+            self._apply(design(tuple(bands)))
+
+    def __repr__(self):
+        return f'<Equalizer bands: {self.design and self.design.order // 2}, frames: {self.frames}, ' \
+               f'cpu: {self.cpu:.3f}s, load: {self.load:.2%}>'
+
+    @property
+    def load(self):
+        """CPU time spent per second of audio processed."""
+        if not self.frames:
+            return 0.0
+        return self.cpu / (self.frames * DELAY)
+
+    def switch(self, bands):
+        """Switch preset from the next frame. Safe to call from any thread."""
+        with self._lock:
+            self._pending = (design(tuple(bands)) if bands else None,)
+
+    def _apply(self, pending):
+        if self.design is not None:
+            self._previous = (self.design, self.state)
+            self.switches += 1
+
+        self.design = pending
+        self.state = None if pending is None else numpy.zeros((pending.order, self.channels))
+
+    def process(self, data):
+        if self._pending is not None:
+            with self._lock:
+                pending, self._pending = self._pending, None
+            self._apply(*pending)
+
+        if self.design is None and self._previous is None:
+            return data
+
+        started = time.thread_time()
+        size = len(data)
+
+        if size < self.frame_size:
+            data = bytes(data) + bytes(self.frame_size - size)
+        x = numpy.frombuffer(data, dtype=numpy.int16).reshape(SAMPLES, self.channels).astype(numpy.float64)
+
+        if self.design is None:
+            y = x
+        else:
+            y, self.state = self.design.run(x, self.state)
+
+        if self._previous is not None:
+            previous, state = self._previous
+            old, _ = previous.run(x, state)
+            y = old + (y - old) * self._ramp
+            self._previous = None
+
+        numpy.clip(y, -32768, 32767, out=y)
+        out = y.astype(numpy.int16).tobytes()[:size]
+
+        self.cpu += time.thread_time() - started
+        self.frames += 1
+
+        return out
@@ -0,0 +1,145 @@
+"""
+LICENSE:
+Copyright (c) 2018 MysterialPy, Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+from discord.opus import Encoder as OpusEncoder
+
+import numpy
+
+
+__all__ = ('PCMMixer', 'Fade', 'CURVES', 'scale')
+
+
+SAMPLES = OpusEncoder.SAMPLES_PER_FRAME
+CHANNELS = OpusEncoder.CHANNELS
+HALF_PI = numpy.float32(numpy.pi / 2)
+
+
+def linear(gain_in, gain_out):
+    numpy.subtract(1, gain_in, out=gain_out)
+
+
+def equal_power(gain_in, gain_out):
+    """Keeps perceived loudness level through the fade, where linear dips in the middle."""
+    numpy.multiply(gain_in, HALF_PI, out=gain_in)
+    numpy.cos(gain_in, out=gain_out)
+    numpy.sin(gain_in, out=gain_in)
+
+
+# Curves turn fade progress, given in gain_in, into both gains in place, with the most their sum can reach.
+CURVES = {'linear': (linear, 1.0), 'equal_power': (equal_power, 2 ** 0.5)}
+
+
+def scale(data, volume):
+    """Apply volume to a frame of int16 PCM. Thread safe, and cheaper than audioop.mul for a frame."""
+    samples = numpy.frombuffer(data, dtype=numpy.int16) * numpy.float32(volume)
+
+    if volume > 1:
+        numpy.clip(samples, -32768, 32767, out=samples)
+    return samples.astype(numpy.int16).tobytes()
+
+
+class Fade:
+    """A pair of gain ramps, fading one source out and another in over a number of frames.
+
+    Gains are evaluated per sample from a running sample position, so the curve is continuous across frames
+    rather than stepping once a frame. They are interleaved to match the PCM they scale.
+    """
+
+    def __init__(self, frames, *, curve='equal_power', samples=SAMPLES, channels=CHANNELS):
+        self.curve, self.peak = CURVES[curve]
+        self.samples = samples
+        self.total = max(1, frames * samples)
+        self.position = 0
+
+        self._step = 1 / self.total
+        self._ramp = numpy.repeat(numpy.arange(samples, dtype=numpy.float32), channels) * numpy.float32(self._step)
+        self._in = numpy.empty_like(self._ramp)
+        self._out = numpy.empty_like(self._ramp)
+
+    @property
+    def done(self):
+        return self.position >= self.total
+
+    @property
+    def progress(self):
+        return min(1.0, self.position / self.total)
+
+    def gains(self):
+        """The fading out and fading in gains for the next frame. The arrays are reused by the next call."""
+        numpy.add(self._ramp, self.position * self._step, out=self._in)
+        if self.position + self.samples > self.total:
+            numpy.minimum(self._in, 1, out=self._in)
+        self.curve(self._in, self._out)
+
+        self.position += self.samples
+        return self._out, self._in
+
+
+class PCMMixer:
+    """Sums frames of int16 PCM from any number of sources, each with a scalar or per sample gain.
+
+    Work buffers are reused between frames, so a mixer must only be used from one thread at a time.
+    """
+
+    def __init__(self, *, samples=SAMPLES, channels=CHANNELS):
+        self.frame_size = samples * channels * 2
+
+        self._work = numpy.empty(samples * channels, dtype=numpy.float32)
+        self._scratch = numpy.empty(samples * channels, dtype=numpy.float32)
+
+    def frame(self, data):
+        """A frame as int16 samples, padding the short last frame of a stream with silence."""
+        if len(data) < self.frame_size:
+            data = bytes(data) + bytes(self.frame_size - len(data))
+        return numpy.frombuffer(data, dtype=numpy.int16)
+
+    def _render(self, clip):
+        if clip:
+            numpy.clip(self._work, -32768, 32767, out=self._work)
+        return self._work.astype(numpy.int16).tobytes()
+
+    def mix(self, frames, gains, *, volume=1.0):
+        """Mix any number of frames. Gains are scalars or interleaved per sample arrays, as Fade gives."""
+        work = self._work
+
+        for index, (data, gain) in enumerate(zip(frames, gains)):
+            if not index:
+                numpy.multiply(self.frame(data), gain, out=work)
+            else:
+                numpy.multiply(self.frame(data), gain, out=self._scratch)
+                work += self._scratch
+
+        if volume != 1:
+            work *= volume
+        return self._render(True)
+
+    def crossfade(self, outgoing, incoming, fade, *, volume=1.0):
+        """Advance a fade by one frame. Clipping is skipped when the curve and volume can not overflow."""
+        work = self._work
+        fade_out, fade_in = fade.gains()
+
+        numpy.multiply(self.frame(outgoing), fade_out, out=work)
+        numpy.multiply(self.frame(incoming), fade_in, out=self._scratch)
+        work += self._scratch
+
+        if volume != 1:
+            work *= volume
+        return self._render(fade.peak * volume > 1)
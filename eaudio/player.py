@@ -21,15 +21,16 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE."""
 from discord.opus import Encoder as OpusEncoder
 
-import audioop
-import math
-import numpy
 import queue
 import time
 import threading
 
+from .mixing import Fade, PCMMixer, scale
+from .scheduler import get_scheduler
 
-class AudioPlayer(threading.Thread):
+
+class AudioPlayer:
+    """Plays a queue of sources to a voice client, one frame per tick of a shared AudioScheduler."""
 
     DELAY = OpusEncoder.FRAME_LENGTH / 1000.0
     IDLE = 0
@@ -37,18 +38,16 @@ class AudioPlayer(threading.Thread):
     MIXING = 2
     DEAD = 666
 
-    def __init__(self, mixer, _queue, client, after):
-        super().__init__()
-        self.daemon = True
+    def __init__(self, mixer, _queue, client, after, scheduler=None):
         self.queue = _queue
         self.mixer = mixer
         self.client = client
+        self.scheduler = scheduler if scheduler is not None else get_scheduler()
 
         self.loops = 0
         self._start = None
         self.next_loops = 0
         self.next_start = None
-        self.next_vol = 0
 
         self._end = threading.Event()
         self._resumed = threading.Event()
@@ -63,60 +62,57 @@ class AudioPlayer(threading.Thread):
         self.previous = None
         self.next = None
 
-    def _do_run(self):
-        self.reset_tokens()
-        play_audio = self.client.send_audio_packet
+    def tick(self):
+        """Play a single frame. Paused, disconnected and idle players give up their tick without blocking."""
+        if self._end.is_set():
+            return False
 
-        while not self._end.is_set():
-            if not self.current:
+        if not self.current:
+            try:
+                self.current = self.queue.get(block=False)
+            except queue.Empty:
                 self.state = self.IDLE
-                self.current = self.queue.get(block=True)
-                self.previous = self.current
-                self.state = self.PLAYING
-                self.reset_tokens()
-            elif not self.next:
-                try:
-                    self.next = self.queue.get(block=False)
-                except queue.Empty:
-                    pass
-
-            if not self._resumed.is_set():
-                self._resumed.wait()
-                continue
-
-            if not self._connected.is_set():
-                self._connected.wait()
-                self.reset_tokens()
+                return True
+
+            self.previous = self.current
+            self.state = self.PLAYING
+            self.reset_tokens()
+        elif not self.next:
+            try:
+                self.next = self.queue.get(block=False)
+            except queue.Empty:
+                pass
 
-            self.loops += 1
-            data = self.mixer.reader()
-
-            if not data:
-                if self.next:
-                    self.current = self.next
-                    self.next = None
-                    self.reset_tokens()
-                else:
-                    self.after(self._current_error, self.current)
-                    self.current = None
+        if not self._resumed.is_set() or not self._connected.is_set():
+            return True
+
+        self.loops += 1
+        data = self.mixer.reader()
+
+        if not data:
+            if self.next:
+                self.current = self.next
+                self.next = None
+                self.reset_tokens()
             else:
-                play_audio(data, encode=not self.current.is_opus())
-                next_time = self._start + self.DELAY * self.loops
-                delay = max(0, self.DELAY + (next_time - time.time()))
-                time.sleep(delay)
+                self.after(self._current_error, self.current)
+                self.current = None
+        else:
+            self.client.send_audio_packet(data, encode=not self.current.is_opus())
+
+        return True
 
     def reset_tokens(self):
         self.loops = 0
-        self._start = time.time()
-
-    def run(self):
-        try:
-            self._do_run()
-        except Exception as e:
-            self._current_error = e
-            self._end.set()
-        finally:
-            pass
+        self._start = time.perf_counter()
+
+    def start(self):
+        self.reset_tokens()
+        self.scheduler.add(self)
+
+    def fail(self, error):
+        self._current_error = error
+        self._end.set()
 
     def pause(self):
         self._resumed.clear()
@@ -125,7 +121,7 @@ class AudioPlayer(threading.Thread):
         self.reset_tokens()
         if self.state == self.MIXING:
             self.next_loops = 0
-            self.next_start = time.time()
+            self.next_start = time.perf_counter()
         self._resumed.set()
 
     def is_playing(self):
@@ -137,20 +133,25 @@ class AudioPlayer(threading.Thread):
 
 class AudioMixer(AudioPlayer):
 
-    def __init__(self, *, client, after, after_all, next_call):
+    def __init__(self, *, client, after, after_all, next_call, scheduler=None, curve='equal_power'):
         self.__queue = queue.Queue()
-        super().__init__(self, self.__queue, client, after)
+        super().__init__(self, self.__queue, client, after, scheduler)
 
         self.state = self.IDLE
         self.after_all = after_all
         self._next_call = next_call
 
+        self.pcm = PCMMixer()
+        self.curve = curve
+        self.fade = None
+
     def do_start(self):
         self.start()
 
     def stop(self):
         self.state = self.DEAD
         self._end.set()
+        self.scheduler.remove(self)
 
         self.after_all(self._current_error, (self.current, self.next, self.previous))
 
@@ -158,43 +159,39 @@ class AudioMixer(AudioPlayer):
         if not self.state == self.MIXING:
             self.state = self.MIXING
 
-        if not self.next_start:
-            self.next_start = time.time()
-            self.next.volume = 0
-            self.next_vol = self.current.volume
+        if not self.fade:
+            # Fade over whatever is left of the current track, bringing the next one in at the same volume.
+            self.next_start = time.perf_counter()
+            self.fade = Fade(max(1, self.current.remaining) * 50, curve=self.curve)
 
         self.next_loops += 1
 
-        try:
-            self.current.volume = self.current.volume - (math.floor(12 / 50) / 100)
-            if self.next.volume < self.next_vol:
-                self.next.volume = self.next.volume + (self.next_vol / math.floor(12 * 50))
-
-            current = self.current.read(volume=self.current.volume)
-            next_ = self.next.read(volume=self.next.volume)
-            data = audioop.add(current, next_, 2)
-        except Exception as e:
-            self.current = self.next
-            self.current.volume = math.ceil(self.current.volume * 100) / 100
-            self.previous = self.current
-            # The next song will be grabbed on the next loop.
-            self.next = None
+        current = self.current.read_pcm()
+        next_ = self.next.read_pcm()
+        volume = self.current.volume
 
-            data = self.current.read()
+        if current:
+            return self.pcm.crossfade(current, next_, self.fade, volume=volume)
 
-            # Current tokens need to be overridden with our mixing state tokens.
-            self._start = self.next_start
-            self.loops = self.next_loops
-            # Reset our next tokens for our next mix
-            self.next_start = None
-            self.next_loops = 0
-            self.next_vol = 0
+        self.current = self.next
+        self.current.volume = volume
+        self.previous = self.current
+        # The next song will be grabbed on the next loop.
+        self.next = None
+        self.fade = None
 
-            # We can assume we have finished mixing now, since the first stream has likely exhausted.
-            self.state = self.PLAYING
-            self.after(self._current_error, self.previous)
+        # Current tokens need to be overridden with our mixing state tokens.
+        self._start = self.next_start
+        self.loops = self.next_loops
+        # Reset our next tokens for our next mix
+        self.next_start = None
+        self.next_loops = 0
 
-        return data
+        # The first stream has run out, so we have finished mixing.
+        self.state = self.PLAYING
+        self.after(self._current_error, self.previous)
+
+        return scale(next_, volume)
 
     def reader(self):
         data = None
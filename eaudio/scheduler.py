@@ -0,0 +1,142 @@
+"""
+LICENSE:
+Copyright (c) 2018 MysterialPy, Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE."""
+from discord.opus import Encoder as OpusEncoder
+
+import os
+import threading
+import time
+import traceback
+
+
+__all__ = ('AudioScheduler', 'get_scheduler')
+
+
+class AudioScheduler(threading.Thread):
+    """Plays every registered stream from one clock thread.
+
+    Frame deadlines are measured from a single perf_counter origin, so oversleeping never accumulates. A late
+    wakeup services the frames it owes back to back, and a wakeup more than MAX_CATCHUP frames late drops the
+    backlog instead of bursting it at Discord.
+
+    Streams need a tick() method, called once per frame, returning False once they are finished.
+    """
+
+    DELAY = OpusEncoder.FRAME_LENGTH / 1000.0
+    MAX_CATCHUP = 5
+
+    def __init__(self, *, name=None):
+        super().__init__(name=name or 'AudioScheduler', daemon=True)
+        self._streams = ()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+
+        self.ticks = 0
+        self.late = 0
+        self.skipped = 0
+        self.busy = 0.0
+
+    def __len__(self):
+        return len(self._streams)
+
+    def __repr__(self):
+        return f'<AudioScheduler streams: {len(self)}, ticks: {self.ticks}, late: {self.late}, ' \
+               f'skipped: {self.skipped}, load: {self.load:.1%}>'
+
+    @property
+    def load(self):
+        """Fraction of the frame budget spent servicing streams."""
+        if not self.ticks:
+            return 0.0
+        return self.busy / (self.ticks * self.DELAY)
+
+    def add(self, stream):
+        with self._lock:
+            if stream not in self._streams:
+                self._streams += (stream,)
+
+            if not self.is_alive():
+                self.start()
+        self._wake.set()
+
+    def remove(self, stream):
+        with self._lock:
+            self._streams = tuple(s for s in self._streams if s is not stream)
+
+    def run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+
+            origin = time.perf_counter()
+            frame = 0
+
+            while self._streams:
+                frame += 1
+                delay = origin + frame * self.DELAY - time.perf_counter()
+
+                if delay > 0:
+                    time.sleep(delay)
+                elif delay < -self.MAX_CATCHUP * self.DELAY:
+                    missed = int(-delay / self.DELAY)
+                    frame += missed
+                    self.skipped += missed
+                else:
+                    self.late += 1
+
+                started = time.perf_counter()
+                self._tick()
+                self.busy += time.perf_counter() - started
+                self.ticks += 1
+
+    def _tick(self):
+        # The tuple is replaced rather than mutated, so it can be walked without holding the lock.
+        for stream in self._streams:
+            try:
+                alive = stream.tick()
+            except Exception as e:
+                alive = False
+                try:
+                    stream.fail(e)
+                except Exception:
+                    traceback.print_exc()
+
+            if alive is False:
+                self.remove(stream)
+
+
+STREAMS_PER_THREAD = 256
+MAX_THREADS = os.cpu_count() or 1
+
+_schedulers = []
+_lock = threading.Lock()
+
+
+def get_scheduler():
+    """The least busy shared scheduler. Another thread is started only when every existing one is full."""
+    with _lock:
+        scheduler = min(_schedulers, key=len, default=None)
+
+        if scheduler is None or (len(scheduler) >= STREAMS_PER_THREAD and len(_schedulers) < MAX_THREADS):
+            scheduler = AudioScheduler(name=f'AudioScheduler-{len(_schedulers)}')
+            _schedulers.append(scheduler)
+
+        return scheduler
@@ -106,6 +106,10 @@ class Botto(commands.Bot):
         self.lru_blocks = utils.EvieeLRU(name='Blocks LRU', limit=500)
         self._wspings = deque(maxlen=60)
         self._rtts = deque(maxlen=60)
+        self.monitor = utils.LoopMonitor(loop=self.loop)
+        self.sources = utils.SourceIndex()
+        self.command_finder = None
+        self.command_names = None
 
         self._config = config
         self._abstract_commands = None
@@ -117,12 +121,23 @@ class Botto(commands.Bot):
         self.fkey = Fernet(config.get('ENCRYPTION', '_token').encode())
 
         super().__init__(command_prefix=get_prefix)
+        self.timers = utils.TimerWheel(self.loop)
+        self.reactions = utils.ReactionRouter(self)
         self.lavalink = lavalink.Client(bot=self,
                                         password=self._config.get("LL", "value"),
                                         rest_port=2333, ws_port=80,
                                         loop=self.loop,
                                         log_level=logging.WARN,
                                         host='51.158.68.132')
+        self.nodes = utils.NodePool(self, self.lavalink)
+        self.searches = utils.TrackSearchCache(self)
+        self.audio_cache = utils.AudioCache(loop=self.loop)
+
+        # Extra nodes as host:rest_port:ws_port, comma separated. They share the main node's password.
+        for entry in filter(None, self._config.get('LL', 'nodes', fallback='').split(',')):
+            host, rest_port, ws_port = entry.strip().split(':')
+            self.nodes.add_node(f'{host}:{ws_port}', host, password=self._config.get('LL', 'value'),
+                                rest_port=int(rest_port), ws_port=int(ws_port))
 
     def is_reconnecting(self):
         """Return the bots reconnection state."""
@@ -134,11 +149,19 @@ class Botto(commands.Bot):
         self.remove_command('help')
         self.pool = await asyncpg.create_pool(f'postgres://postgres:{config.get("DB", "_pass")}@localhost:5432/eviee')
         self.session = aiohttp.ClientSession(loop=self.loop)
+        await self.nodes.start(self.session)
+        await self.searches.prepare()
+
+        # Favourites are paged by id, which keeps them in the order they were added.
+        await self.pool.execute("""ALTER TABLE playlists ADD COLUMN IF NOT EXISTS id BIGSERIAL""")
+        await self.pool.execute("""CREATE INDEX IF NOT EXISTS playlists_uid_id ON playlists(uid, id)""")
 
         await self.load_cache()
         await self.load_modules()
         await self.load_abstractors()
+        await self.sources.update(self)
 
+        self.monitor.start()
         self.loop.create_task(self.wspings())
         self.loop.create_task(self.rttpings())
 
@@ -201,7 +224,7 @@ class Botto(commands.Bot):
 
         # A bit messy(but hey it works)
         modules = [f'{p.parent}.{p.stem}' for p in pathlib.Path('.').rglob('*.py')
-                   if not str(p.parent).startswith('venv') and not p.stem.startswith(('main', '__'))]
+                   if not str(p.parent).startswith(('venv', 'benchmarks')) and not p.stem.startswith(('main', '__'))]
         failed = []
 
         for extension in modules:
@@ -236,6 +259,18 @@ class Botto(commands.Bot):
                     raise utils.AbstractorException(f'Failed to add abstractor to group <{command.name}>.'
                                                     f' No abstractor named "{abstractor}" exists.')
 
+        self.build_command_index()
+
+    def build_command_index(self):
+        """Index visible command names for help, lookups and typo suggestions.
+
+        Called again whenever extensions change, so a miss never has to walk the commands."""
+        visible = [c for c in self.walk_commands() if not c.hidden]
+        self.command_finder = utils.FinderIndex(visible, key=lambda c: c.qualified_name)
+
+        self.command_names = utils.ChoiceSet({n: c for n, c in self.all_commands.items() if not c.hidden})
+        self.command_names.counts(None)
+
     async def process_commands(self, ctx):
         """Override process commands.
 
@@ -270,7 +305,7 @@ class Botto(commands.Bot):
     async def on_message(self, message):
         """Override on message.
 
-        Here we create a custom Context and ignore all CommandNotFound errors by default."""
+        Here we create a custom Context. CommandNotFound is left to the ErrorHandler for suggestions."""
         if message.author.bot:
             return
 
@@ -282,8 +317,6 @@ class Botto(commands.Bot):
         try:
             command = await self.process_commands(ctx)
         except Exception as e:
-            if isinstance(e, commands.CommandNotFound):
-                return
             return self.dispatch('command_error', ctx, e)
 
         if command:
@@ -419,6 +452,7 @@ bot = Botto()
 
 async def shutdown(*, reason=None):
     """Somewhat clean shutdown with basic debug info."""
+    bot.monitor.stop()
     await bot.logout()
 
     print(f'\n\nShutting down due to {type(reason).__name__}...\n{"="*30}\n')
@@ -2,31 +2,14 @@ import discord
 from discord.ext import commands
 
 import asyncio
-import importlib
-import inspect
-import itertools
+import functools
 import os
 import random
 import re
-import subprocess
-import textwrap
 
 import utils
 
 
-class DPYSource:
-
-    __slots__ = ('file', 'obj', 'parent', 'index', 'path', 'match')
-
-    def __init__(self, **attrs):
-        self.file = attrs.get('file')
-        self.obj = attrs.get('obj')
-        self.parent = attrs.get('parent')
-        self.index = attrs.get('index')
-        self.path = attrs.get('path')
-        self.match = attrs.get('match')
-
-
 class Colour(metaclass=utils.MetaCog, category='API', colour=random.randint(0, 16581375),
              thumbnail='https://i.imgur.com/g2LpJZb.png'):
     """Somewhere over the rainbow... An Eviee awaits!
@@ -140,20 +123,26 @@ class Source(metaclass=utils.MetaCog, category='API', thumbnail='https://i.imgur
 
     def __init__(self, bot):
         self.bot = bot
-        self.rtfs_anchors = None
+        self.rtfs = None
         self.rtfs_revision = None
 
         bot.loop.create_task(self._update_rtfs())
 
     async def get_rtfs_revision(self):
-        cmd = r'git ls-remote https://github.com/Rapptz/discord.py --tags rewrite HEAD~1..HEAD --format="%s (%cr)"'
-        if os.name == 'posix':
-            cmd = cmd.format(r'\`%h\`')
-        else:
-            cmd = cmd.format(r'`%h`')
-        revision = os.popen(cmd).read().strip()
+        args = ('git', 'ls-remote', 'https://github.com/Rapptz/discord.py', '--tags', 'rewrite', 'HEAD~1..HEAD',
+                '--format="%s (%cr)"')
 
-        return revision.split()[0]
+        try:
+            result = await utils.run_cached(*args, ttl=600, timeout=30)
+        except (utils.ProcessTimeout, OSError):
+            return 'unknown'
+
+        if not result.ok or not result.out:
+            # run_cached keeps any successful result, so drop an empty one rather than serve it for the next ttl.
+            utils.invalidate_process(*args)
+            return 'unknown'
+
+        return result.out.split()[0]
 
     def rtfs_embed(self, search, matches):
         if not matches:
@@ -187,10 +176,7 @@ class Source(metaclass=utils.MetaCog, category='API', thumbnail='https://i.imgur
 
             try:
                 cmd = 'python3.6 -m pip install -U git+https://github.com/Rapptz/discord.py.git@rewrite'
-                process = subprocess.Popen(cmd.split(), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-
-                output, error = process.communicate()
-                process.kill()
+                await utils.run_process(*cmd.split(), timeout=600)
             except Exception:
                 pass
 
@@ -199,67 +185,9 @@ class Source(metaclass=utils.MetaCog, category='API', thumbnail='https://i.imgur
     async def _rtfs_load(self):
         self.rtfs_revision = await self.get_rtfs_revision()
 
-        anchors = []
-        parent = None
-
-        pf = r'def (.*?[a-zA-Z0-9])\(.*\)'
-        pc = r'class (.*[a-zA-Z0-9])[\:\(]'
-
-        def pred(y):
-            if inspect.isbuiltin(y):
-                return
-
-            try:
-                return 'discord' in y.__name__
-            except AttributeError:
-                return False
-
-        importlib.reload(discord)
-
-        mods = inspect.getmembers(discord, pred) + inspect.getmembers(commands, pred)
-        for x in mods:
-            file = x[1].__name__.split('.')[-1]
-            path = '/'.join(x[1].__name__.split('.')[:-1])
-
-            try:
-                src = inspect.getsourcelines(x[1])
-            except TypeError:
-                continue
-
-            for index, line in enumerate(src[0]):
-                orig = line
-
-                if sum(1 for _ in itertools.takewhile(str.isspace, line)) > 4:
-                    continue
-                elif line == 0 or '__' in line:
-                    continue
-
-                line = line.lstrip(' ')
-                match = re.match(pf, line)
-
-                if match:
-                    if sum(1 for _ in itertools.takewhile(str.isspace, orig)) < 4:
-                        parent = None
-
-                elif not match:
-                    match = re.match(pc, line)
-                    if match:
-                        parent = match.group(1)
-
-                try:
-                    obj = match.group(1)
-                except AttributeError:
-                    continue
-
-                attrs = {'file': file, 'obj': obj, 'parent': parent if parent != obj else None, 'index': index,
-                         'path': path,
-                         'match': f'{file}.{parent if parent and parent != obj else ""}'
-                                  f'{"." if parent and parent != obj else ""}{obj}'}
-
-                anchor = DPYSource(**attrs)
-                anchors.append(anchor)
-
-        self.rtfs_anchors = anchors
+        root = os.path.dirname(os.path.dirname(discord.__file__))
+        to_do = functools.partial(utils.RTFSIndex.load, root)
+        self.rtfs = await utils.evieecutor(to_do, loop=self.bot.loop)
 
     @commands.command(name='rtfs', aliases=['dsauce', 'dsource', 'dpysauce', 'dpysource'], cls=utils.EvieeCommand)
     async def _rtfs(self, ctx, *, source: str=None):
@@ -287,32 +215,13 @@ class Source(metaclass=utils.MetaCog, category='API', thumbnail='https://i.imgur
         if source is None:
             return await ctx.send('https://github.com/Rapptz/discord.py/tree/rewrite/')
 
-        if source.endswith('.py'):
-            source = source.replace('.py', '').lower()
-
-            matches = utils.fuzzyfinder(source, [(a, a.file) for a in self.rtfs_anchors],
-                                        key=lambda t: t[1], lazy=False)[:5]
-
-            for f in matches:
-                to_return.append(f'[{f[0].file}.py]({surl}{f[0].path}/{f[0].file}.py)')
-
-        elif '.' in source:
-            matches = utils.fuzzyfinder(source, [(a, a.match) for a in self.rtfs_anchors], key=lambda t: t[1],
-                                        lazy=False)[:5]
-
-            if not matches:
-                matches = utils.fuzzyfinder(source, [(a, a.match.split('.', 1)[-1]) for a in self.rtfs_anchors],
-                                            key=lambda t: t[1], lazy=False)[:5]
+        if not self.rtfs:
+            return await ctx.send('The source index is still loading. Try again in a moment.')
 
-            for a in matches:
-                a = a[0]
-                to_return.append(f'[{a.match}]({surl}{a.path}/{a.file}.py#L{a.index + 1})')
-        else:
-            matches = utils.fuzzyfinder(source, [(a, a.obj) for a in self.rtfs_anchors], key=lambda t: t[1],
-                                        lazy=False)[:5]
-
-            for a in matches:
-                a = a[0]
+        for a in self.rtfs.search(source):
+            if source.endswith('.py'):
+                to_return.append(f'[{a.file}.py]({surl}{a.path}/{a.file}.py)')
+            else:
                 to_return.append(f'[{a.match}]({surl}{a.path}/{a.file}.py#L{a.index + 1})')
 
         to_return = set(to_return)
@@ -347,12 +256,15 @@ class Source(metaclass=utils.MetaCog, category='API', thumbnail='https://i.imgur
         ext = self.bot.get_ext(target)
 
         if cmd:
-            code = textwrap.dedent(inspect.getsource(cmd.callback))
+            entry = self.bot.sources.command(cmd)
         elif cog:
-            code = textwrap.dedent(inspect.getsource(cog.__class__))
+            entry = self.bot.sources.cog(cog)
         elif ext:
-            code = textwrap.dedent(inspect.getsource(ext))
+            entry = self.bot.sources.module(ext, target)
         else:
+            entry = None
+
+        if not entry:
             embed = discord.Embed(title=f'Source - <{target.strip()}>',
                                   description=f'Sorry no results were found for {target.strip()}\n\n'
                                               f'Make sure you specify a valid command or cog.',
@@ -360,7 +272,7 @@ class Source(metaclass=utils.MetaCog, category='API', thumbnail='https://i.imgur
             embed.add_field(name='EvieeBot', value='https://github.com/EvieePy/EvieeBot')
             return await ctx.send(embed=embed)
 
-        bin_ = await self.bot.create_bin(data=code)
+        bin_ = await self.bot.create_bin(data=entry.source)
         embed = discord.Embed(title=f'Source - <{target}>', description=f'{bin_}.py', colour=0x6dc9c9)
 
         return await ctx.send(embed=embed)
@@ -479,7 +479,7 @@ class Games(metaclass=utils.MetaCog, category='Fun', thumbnail='https://i.imgur.
             pass
 
         try:
-            user = await self.c4join_loop(ctx)
+            user = await self.c4join_loop(ctx, msg)
         except asyncio.TimeoutError:
             return await ctx.send(f'{ctx.author.mention}. No one joined within 5 minutes, please try again!',
                                   delete_after=30)
@@ -494,14 +494,14 @@ class Games(metaclass=utils.MetaCog, category='Fun', thumbnail='https://i.imgur.
 
         self.bot.loop.create_task(c4.play_loop(ctx, board))
 
-    async def c4join_loop(self, ctx: utils.EvieeContext):
+    async def c4join_loop(self, ctx: utils.EvieeContext, msg: discord.Message):
         def check(r, u):
             if u == ctx.me:
                 return False
             return str(r) == '☑'
 
-        while True:
-            react, user = await self.bot.wait_for('reaction_add', check=check, timeout=300)
+        with self.bot.reactions.listen(msg, check=check) as session:
+            react, user = await session.wait(timeout=300)
 
             return user
 
@@ -4,32 +4,14 @@ from discord.ext import commands
 import asyncio
 import bs4
 import datetime
-import functools
 import json
-import os
 import random
 import time
-import youtube_dl
 from collections import namedtuple
 from osuapi import OsuApi, AHConnector
 
 import utils
 
-ytdlopts = {
-    'format': 'bestaudio/best',
-    'restrictfilenames': True,
-    'noplaylist': True,
-    'nocheckcertificate': True,
-    'ignoreerrors': False,
-    'logtostderr': False,
-    'quiet': True,
-    'no_warnings': True,
-    'default_search': 'auto',
-    'source_address': '0.0.0.0'  # ipv6 addresses cause issues sometimes
-}
-
-ytdl = youtube_dl.YoutubeDL(ytdlopts)
-
 
 class Misc(metaclass=utils.MetaCog, category='Misc', colour=0xa5d8d8, thumbnail='https://i.imgur.com/WGjcdqg.png'):
     """Miscellaneous commands which don't really have a place in this life... What am I even doing with mine!?
@@ -47,7 +29,12 @@ class Misc(metaclass=utils.MetaCog, category='Misc', colour=0xa5d8d8, thumbnail=
         with open('./resources/MBTI.json') as f:
             self.questions = json.load(f)
 
-        bot.loop.create_task(self.temp_checker())
+        self._emoji_finder = None
+
+        self._temp_checker = bot.timers.every(120, self.temp_checker)
+
+    def __unload(self):
+        self._temp_checker.cancel()
 
     async def __error(self, ctx, error):
         if isinstance(error, commands.CommandOnCooldown):
@@ -91,6 +78,21 @@ class Misc(metaclass=utils.MetaCog, category='Misc', colour=0xa5d8d8, thumbnail=
             chan = await self.generate_channel(mem.guild, mem, name=str(mem))
             await mem.move_to(chan)
 
+    @property
+    def emoji_finder(self):
+        if self._emoji_finder is None:
+            self._emoji_finder = utils.FinderIndex(self.bot.emojis, key=lambda e: e.name)
+        return self._emoji_finder
+
+    async def on_guild_emojis_update(self, guild, before, after):
+        self._emoji_finder = None
+
+    async def on_guild_join(self, guild):
+        self._emoji_finder = None
+
+    async def on_guild_remove(self, guild):
+        self._emoji_finder = None
+
     @property
     def fb_chan(self):
         return self.bot.get_channel(352013640691351552)
@@ -120,15 +122,13 @@ class Misc(metaclass=utils.MetaCog, category='Misc', colour=0xa5d8d8, thumbnail=
             {ctx.prefix}emojis guild
         """
         if name:
-            emojis = [e for e in self.bot.emojis if name in e.name]
+            emojis = self.emoji_finder.search(name)
             if not emojis:
                 return await ctx.send(f'Could not find any emojis with search term: `{name}`')
-
-            chunks = [e async for e in utils.pager(sorted(emojis, key=lambda _: _.name), 8)]
         else:
-            chunks = [e async for e in utils.pager(sorted(self.bot.emojis, key=lambda _: _.name), 8)]
+            emojis = sorted(self.bot.emojis, key=lambda _: _.name)
 
-        pagey = utils.EmojiPaginator(title='Emojis', chunks=chunks)
+        pagey = utils.EmojiPaginator(title='Emojis', emojis=emojis)
         self.bot.loop.create_task(pagey.paginate(ctx))
 
     @emojis_.command(name='guild', aliases=['server'])
@@ -136,12 +136,12 @@ class Misc(metaclass=utils.MetaCog, category='Misc', colour=0xa5d8d8, thumbnail=
         if not guild:
             guild = ctx.guild
 
-        chunks = [e async for e in utils.pager(sorted(list(guild.emojis), key=lambda _: _.name), 8)]
+        emojis = sorted(guild.emojis, key=lambda _: _.name)
 
-        if not chunks:
+        if not emojis:
             return await ctx.send('This guild has no custom emojis.')
 
-        pagey = utils.EmojiPaginator(title=f'Emojis | {ctx.guild.name}', chunks=chunks)
+        pagey = utils.EmojiPaginator(title=f'Emojis | {ctx.guild.name}', emojis=emojis)
         self.bot.loop.create_task(pagey.paginate(ctx))
 
     @commands.command(name='emoji', cls=utils.EvieeCommand)
@@ -284,9 +284,10 @@ class Misc(metaclass=utils.MetaCog, category='Misc', colour=0xa5d8d8, thumbnail=
 
         return chan
 
-    @utils.backoff_loop()
     async def temp_checker(self):
-        await asyncio.sleep(120)
+        # Channels are not cached until ready, and would otherwise all look deleted.
+        if not self.bot.is_ready() or self.bot.is_reconnecting():
+            return
 
         async with self.bot.pool.acquire() as conn:
             temps = await conn.fetch("""SELECT * FROM tempchannels""")
@@ -410,21 +411,21 @@ class Misc(metaclass=utils.MetaCog, category='Misc', colour=0xa5d8d8, thumbnail=
 
     async def retrieve_song(self, ctx, search):
         async with ctx.typing():
-            to_do = functools.partial(ytdl.extract_info, url=search, download=True)
-            data = await utils.evieecutor(to_do, loop=self.bot.loop)
+            # The cache keeps the file for the next request and evicts it when space is needed.
+            entry = await self.bot.audio_cache.get(search)
 
-            if 'entries' in data:
-                data = data['entries'][0]
-
-            f = ytdl.prepare_filename(data)
+            try:
+                file = discord.File(entry.path, filename=f'{entry.title}.{entry.ext}')
+            except OSError:
+                # Evicted before we opened it. The cache has forgotten it, so this downloads it again.
+                entry = await self.bot.audio_cache.get(search)
+                file = discord.File(entry.path, filename=f'{entry.title}.{entry.ext}')
 
             try:
-                await ctx.send(content=None, file=discord.File(f, filename=f'{data["title"]}.{data["ext"]}'))
+                await ctx.send(content=None, file=file)
             except discord.HTTPException as e:
                 await ctx.send(f'There was an error processing your song.\n```css\n[{e}]\n```')
 
-            os.remove(f)
-
     @commands.command(name='quote', cls=utils.EvieeCommand)
     async def get_quote(self, ctx, *, mid: int):
         """Retrieve a message from your guild and quote it.
@@ -671,39 +672,40 @@ class MBTI:
                 return False
             return True
 
-        while not self.bot.is_closed():
-            count += 1
+        with self.bot.reactions.listen(self.base, check=check) as session:
+            while not self.bot.is_closed():
+                count += 1
 
-            try:
-                react, user = await self.bot.wait_for('reaction_add', check=check, timeout=180)
-            except asyncio.TimeoutError:
-                await self.base.delete()
-                return
+                try:
+                    react, user = await session.wait(timeout=180)
+                except asyncio.TimeoutError:
+                    await self.base.delete()
+                    return
 
-            try:
-                await self.base.remove_reaction(react, user)
-            except discord.HTTPException:
-                pass
+                try:
+                    await self.base.remove_reaction(react, user)
+                except discord.HTTPException:
+                    pass
 
-            answer = self.controls.get(str(react))
+                answer = self.controls.get(str(react))
 
-            if answer == 'C':
-                try:
-                    self.scores[str(count)][answer]
-                except KeyError:
-                    count -= 1
-                    continue
+                if answer == 'C':
+                    try:
+                        self.scores[str(count)][answer]
+                    except KeyError:
+                        count -= 1
+                        continue
 
-            result = self.scores[str(count)][answer]
+                result = self.scores[str(count)][answer]
 
-            self.results[result[0]] += result[1]
+                self.results[result[0]] += result[1]
 
-            try:
-                self.pages[count]
-            except IndexError:
-                break
-            else:
-                await self.base.edit(embed=self.pages[count])
+                try:
+                    self.pages[count]
+                except IndexError:
+                    break
+                else:
+                    await self.base.edit(embed=self.pages[count])
 
         if self.results['I'] >= self.results['E']:
             self.result.append('I')
@@ -759,46 +761,53 @@ class Vote:
         self.ups = 0
         self.downs = 0
 
-        self.killer = self.bot.loop.create_task(self.kill_vote())
+        self.killer = self.bot.timers.call_later(self.wait, self.kill_vote) if self.wait else None
 
-        while not self.bot.is_closed():
-            def check(r, u):
-                if str(r) not in self.vcontrols:
-                    return False
-                elif u.id == self.bot.user.id or r.message.id != self.poll.id:
-                    return False
-                elif u.id in voted and str(r) != '❎':
-                    return False
-                return True
+        def check(r, u):
+            if str(r) not in self.vcontrols:
+                return False
+            elif u.id == self.bot.user.id or r.message.id != self.poll.id:
+                return False
+            elif u.id in voted and str(r) != '❎':
+                return False
+            return True
 
-            try:
-                react, user = await self.bot.wait_for('reaction_add', check=check, timeout=3600)
-            except asyncio.TimeoutError:
-                break
+        with self.bot.reactions.listen(self.poll, check=check) as session:
+            while not self.bot.is_closed():
+                try:
+                    react, user = await session.wait(timeout=3600)
+                except asyncio.TimeoutError:
+                    break
 
-            voted.add(user.id)
+                # The check ran when the reaction was queued, so a second vote can arrive before the first is counted.
+                if user.id in voted and str(react) != '❎':
+                    try:
+                        await self.poll.remove_reaction(react, user)
+                    except discord.HTTPException:
+                        pass
+                    continue
 
-            if str(react) == '⬆':
-                self.ups += 1
-            elif str(react) == '⬇':
-                self.downs += 1
-            elif str(react) == '❎':
-                if user.id != self.ctx.author.id:
+                voted.add(user.id)
+
+                if str(react) == '⬆':
+                    self.ups += 1
+                elif str(react) == '⬇':
+                    self.downs += 1
+                elif str(react) == '❎':
+                    if user.id != self.ctx.author.id:
+                        continue
+                    await self.poll.delete()
+                    break
+                else:
                     continue
-                await self.poll.delete()
-                break
-            else:
-                continue
 
-            try:
-                await self.poll.remove_reaction(react, user)
-            except discord.HTTPException:
-                pass
+                try:
+                    await self.poll.remove_reaction(react, user)
+                except discord.HTTPException:
+                    pass
 
-        try:
+        if self.killer:
             self.killer.cancel()
-        except Exception:
-            pass
 
         embed = discord.Embed(title='Vote Results:', description=self.desc, colour=0xffb347)
         embed.add_field(name='Up Votes', value=str(self.ups))
@@ -806,10 +815,6 @@ class Vote:
         await self.ctx.send(embed=embed)
 
     async def kill_vote(self):
-        if self.wait == 0:
-            return
-
-        await asyncio.sleep(self.wait)
         await self.poll.delete()
         
         try:
@@ -1046,14 +1051,12 @@ class Google(metaclass=utils.MetaCog, colour=0xff3728,
 
             images.append(link)
 
-        extras = []
-        for index, link in enumerate(images):
+        def image_page(links, index):
             embed = discord.Embed(title=f'Image results for {query}... | Page {index + 1}/{len(images)}')
-            embed.set_image(url=link)
-
-            extras.append(embed)
+            embed.set_image(url=links[0])
+            return embed
 
-        await ctx.paginate(extras=extras, timeout=180)
+        await ctx.paginate(source=utils.ListPageSource(images, per_page=1, formatter=image_page), timeout=180)
 
     @google_.command(name='news', aliases=['nws'])
     @commands.cooldown(1, 5, commands.BucketType.user)
@@ -3,14 +3,12 @@ from discord.ext import commands
 
 import asyncio
 import asyncpg
-import async_timeout
 import base64
 import datetime
 import itertools
 import lavalink
 import logging
 import math
-import random
 import re
 import time
 
@@ -28,17 +26,27 @@ surl = re.compile('https:\/\/open.spotify.com?.+playlist\/([a-zA-Z0-9]+)')
 
 class Track:
 
-    __slots__ = ('ctx', 'id', 'requester', 'channel', 'message', 'query', 'title',
-                 'ytid', 'length', 'thumb', 'uri', 'is_stream', 'dead')
+    __slots__ = ('ctx', 'id', 'key', 'requester', 'channel', 'message', 'query', 'title',
+                 'ytid', 'length', 'thumb', 'uri', 'is_stream', 'resolving')
 
     def __init__(self, id_, info, ctx, query=None):
         self.ctx = ctx
-        self.id = id_
         self.requester = ctx.author
         self.channel = ctx.channel
         self.message = ctx.message
         self.query = query
+        self.resolving = None
+
+        # Stays the same once a name only track is resolved, so the queue can dedupe on it.
+        self.key = id_ or query
+
+        self.load(id_, info)
 
+    def __str__(self):
+        return self.title
+
+    def load(self, id_, info):
+        self.id = id_
         self.title = info.get('title')
         self.ytid = info.get('identifier')
         self.length = info.get('length')
@@ -46,22 +54,72 @@ class Track:
         self.uri = info.get('uri')
 
         self.is_stream = info.get('isStream')
-        self.dead = False
 
-    def __str__(self):
-        return self.title
 
-    @property
-    def is_dead(self):
-        return self.dead
+class TrackResolver:
+    """Resolves name only tracks, such as Spotify playlist items, to playable tracks ahead of time.
+
+    Every queue shares one resolver, so searches across all guilds are bounded by the same semaphore.
+    Each track resolves at most once; anything awaiting it shares the task stored on the track.
+    """
+
+    __slots__ = ('bot', 'semaphore', 'resolved', 'failed')
+
+    def __init__(self, bot, *, concurrency=4):
+        self.bot = bot
+        self.semaphore = asyncio.Semaphore(concurrency, loop=bot.loop)
 
+        self.resolved = 0
+        self.failed = 0
+
+    def prefetch(self, tracks):
+        for track in tracks:
+            if track.id is None and track.resolving is None:
+                track.resolving = self.bot.loop.create_task(self._resolve(track))
+
+    async def resolve(self, track):
+        """Resolve a track in place, returning whether it is now playable."""
+        if track.id is not None:
+            return True
 
-class MusicQueue(asyncio.Queue):
+        self.prefetch((track,))
+        return await asyncio.shield(track.resolving)
 
-    def __init__(self, ctx):
+    async def _resolve(self, track):
+        try:
+            async with self.semaphore:
+                songs = await self.bot.searches.get_tracks(f'ytsearch:{track.query}')
+        except Exception:
+            songs = None
+
+        if not songs or not songs['tracks']:
+            self.failed += 1
+            return False
+
+        song = songs['tracks'][0]
+        track.load(song['track'], song['info'])
+        self.resolved += 1
+
+        return True
+
+
+class MusicQueue:
+
+    # Controller refreshes requested within this many seconds are coalesced into one edit.
+    UPDATE_DELAY = 2.0
+    # Minimum seconds between controller edits, keeping well inside the per channel edit rate limit.
+    UPDATE_INTERVAL = 5.0
+    # How many upcoming tracks are resolved ahead of the play head.
+    PREFETCH = 5
+    # Seconds a queue may sit empty before it is swept and its player disconnected.
+    IDLE_TIMEOUT = 300
+
+    def __init__(self, ctx, resolver, on_idle):
         self.bot = ctx.bot
+        self.resolver = resolver
+        self.on_idle = on_idle
         self.guild_id = ctx.guild.id
-        super(MusicQueue, self).__init__()
+        self.entries = utils.IndexedQueue(loop=self.bot.loop, key=lambda t: t.key)
 
         self.next_event = asyncio.Event()
         self.controller_message = None
@@ -80,8 +138,9 @@ class MusicQueue(asyncio.Queue):
         self.dj = None
         self.last_seen = None
         self.updating = False
-        self.update = False
-        self.inactive = False
+        self.update_handle = None
+        self.last_update = 0
+        self.idle_handle = None
         self.playing = False
 
         self.pauses = set()
@@ -92,27 +151,58 @@ class MusicQueue(asyncio.Queue):
         self.repeats = set()
 
         self.player_task = self.bot.loop.create_task(self.player_loop())
-        self.updater_task = self.bot.loop.create_task(self.updater())
 
-    def popindex(self, index: int):
-        ls = list(self.entries)
-        item = ls[index]
+    def request_update(self, *, delay=None):
+        """Schedule a controller refresh, coalescing it with any refresh already waiting."""
+        delay = self.UPDATE_DELAY if delay is None else delay
+        delay = max(delay, self.last_update + self.UPDATE_INTERVAL - self.bot.loop.time())
+
+        handle = self.update_handle
+        if handle and handle.pending:
+            if handle.remaining() > delay:
+                self.bot.timers.reschedule(handle, delay)
+            return
 
-        del self.entries[index]
+        self.update_handle = self.bot.timers.call_later(delay, self.do_update)
 
-        return item
+    def mark_idle(self):
+        if self.idle_handle is None:
+            self.idle_handle = self.bot.timers.call_later(self.IDLE_TIMEOUT, self.on_idle, self)
 
-    @property
-    def entries(self):
-        return self._queue
+    def mark_active(self):
+        if self.idle_handle is not None:
+            self.idle_handle.cancel()
+            self.idle_handle = None
+
+    def is_queued(self, key):
+        """Whether a track with this key is playing or waiting in the queue."""
+        return self.entries.contains_key(key) or (self.current is not None and self.current.key == key)
+
+    async def get(self):
+        return await self.entries.get()
 
-    async def updater(self):
-        while not self.bot.is_closed():
-            if self.update and not self.updating:
-                self.update = False
-                await self.invoke_controller()
+    async def put(self, item):
+        self.put_nowait(item)
 
-            await asyncio.sleep(10)
+    def put_nowait(self, item):
+        self.entries.append(item)
+        self.request_update()
+
+        if len(self.entries) <= self.PREFETCH:
+            self.resolver.prefetch((item,))
+
+    def cancel_update(self):
+        if self.update_handle:
+            self.update_handle.cancel()
+            self.update_handle = None
+
+    async def do_update(self):
+        if not self.current:
+            return
+        elif self.updating:
+            return self.request_update()
+
+        await self.invoke_controller()
 
     async def player_loop(self):
         """Loop which handles track callback with events."""
@@ -125,39 +215,23 @@ class MusicQueue(asyncio.Queue):
 
             self.next_event.clear()
 
-            try:
-                with async_timeout.timeout(300):
-                    track = await self.get()
-            except asyncio.TimeoutError:
-                self.inactive = True
-                continue
+            if not self.entries:
+                self.mark_idle()
 
-            self.inactive = False
+            track = await self.get()
+            self.mark_active()
             logger.debug('Loop: Retrieved track')
 
-            if track.is_dead:  # Empty dead tracks
-                logger.debug('Loop: Track was dead, restarting cycle')
-                continue
-
-            if not track.id:
-                songs = await self.bot.lavalink.get_tracks(f'ytsearch:{track.query}')
-                
-                if not songs:
-                    continue
-                elif not songs['tracks']:
-                    continue
+            # Start on the next few tracks now, so they are ready by the time this one ends.
+            self.resolver.prefetch(itertools.islice(self.entries, 0, self.PREFETCH))
 
-                try:
-                    song = songs['tracks'][0]
-                    track = Track(id_=song['track'], info=song['info'], ctx=track.ctx)
-                except Exception as e:
-                    continue
+            if not await self.resolver.resolve(track):
+                continue
 
             self.current = track
 
-            if not self.update:
-                await self.invoke_controller()
-            logger.debug('Loop: Invoked controller')
+            self.request_update(delay=0)
+            logger.debug('Loop: Requested controller update')
 
             player = self.bot.lavalink.players.get(self.guild_id)
             while not player.is_connected:
@@ -191,18 +265,21 @@ class MusicQueue(asyncio.Queue):
             track = self.current
 
         self.updating = True
+        self.last_update = self.bot.loop.time()
 
         player = self.bot.lavalink.players.get(self.guild_id)
 
         embed = discord.Embed(title='Music Controller (Beta)', description=f'Now Playing:```\n{track.title}\n```',
                               colour=0x38fab3)
-        embed.set_thumbnail(url=track.thumb)
+        if track.ytid:
+            embed.set_thumbnail(url=track.thumb)
 
         if track.is_stream:
             embed.add_field(name='Duration', value='🔴`Streaming`')
-        else:
+        elif track.length:
             embed.add_field(name='Duration', value=str(datetime.timedelta(milliseconds=int(track.length))))
-        embed.add_field(name='Video URL', value=f'[Click Here!]({track.uri})')
+        if track.uri:
+            embed.add_field(name='Video URL', value=f'[Click Here!]({track.uri})')
         embed.add_field(name='Requested By', value=track.requester.mention)
         embed.add_field(name='Current DJ', value=self.dj.mention)
         embed.add_field(name='Queue Length', value=str(len(self.entries)))
@@ -212,7 +289,7 @@ class MusicQueue(asyncio.Queue):
 
         if len(self.entries) > 0:
             data = '\n'.join(f'**-** `{t.title[0:45]}{"..." if len(t.title) > 45 else ""}`\n{"-"*10}'
-                             for t in itertools.islice([e for e in self.entries if not e.is_dead], 0, 3, None))
+                             for t in itertools.islice(self.entries, 0, 3, None))
             embed.add_field(name='Coming Up:', value=data, inline=False)
 
         if not await self.is_current_fresh(track.channel) and self.controller_message:
@@ -258,47 +335,48 @@ class MusicQueue(asyncio.Queue):
                 return False
             return True
 
-        while self.controller_message:
-            print('Reaction Controller: Beginning Cycle')
-            if player.connected_channel is None:
-                print('Reaction Controller: Breaking Cycle')
-                return self.reaction_task.cancel()
+        with self.bot.reactions.listen(self.controller_message, check=check) as session:
+            while self.controller_message:
+                print('Reaction Controller: Beginning Cycle')
+                if player.connected_channel is None:
+                    print('Reaction Controller: Breaking Cycle')
+                    return self.reaction_task.cancel()
 
-            print('Reaction Controller: Waiting for Reaction')
-            react, user = await self.bot.wait_for('reaction_add', check=check)
-            print('Reaction Controller: Recognized Reaction')
-            control = self.controls.get(str(react))
+                print('Reaction Controller: Waiting for Reaction')
+                react, user = await session.wait()
+                print('Reaction Controller: Recognized Reaction')
+                control = self.controls.get(str(react))
 
-            if control == 'rp':
-                if player.paused:
-                    control = 'resume'
-                else:
-                    control = 'pause'
+                if control == 'rp':
+                    if player.paused:
+                        control = 'resume'
+                    else:
+                        control = 'pause'
 
-            print(f'CONTROL: {control}')
+                print(f'CONTROL: {control}')
 
-            try:
-                await self.controller_message.remove_reaction(react, user)
-            except discord.HTTPException:
-                pass
+                try:
+                    await self.controller_message.remove_reaction(react, user)
+                except discord.HTTPException:
+                    pass
 
-            """cmd = self.bot.get_command(f'{"dj " if user.id == self.dj.id else ""}{control}')\
-                or self.bot.get_command(control)"""
-            cmd = self.bot.get_command(control)
+                """cmd = self.bot.get_command(f'{"dj " if user.id == self.dj.id else ""}{control}')\
+                    or self.bot.get_command(control)"""
+                cmd = self.bot.get_command(control)
 
-            ctx = await self.bot.get_context(react.message, cls=utils.EvieeContext)
-            ctx.author = user
+                ctx = await self.bot.get_context(react.message, cls=utils.EvieeContext)
+                ctx.author = user
 
-            try:
-                if cmd.is_on_cooldown(ctx):
-                    pass
-                if not await self.invoke_react(cmd, ctx):
-                    pass
-                else:
-                    self.bot.loop.create_task(ctx.invoke(cmd))
-            except Exception as e:
-                ctx.command = self.bot.get_command('reactcontrol')
-                await cmd.dispatch_error(ctx=ctx, error=e)
+                try:
+                    if cmd.is_on_cooldown(ctx):
+                        pass
+                    if not await self.invoke_react(cmd, ctx):
+                        pass
+                    else:
+                        self.bot.loop.create_task(ctx.invoke(cmd))
+                except Exception as e:
+                    ctx.command = self.bot.get_command('reactcontrol')
+                    await cmd.dispatch_error(ctx=ctx, error=e)
 
         await self.destroy_controller()
 
@@ -343,10 +421,23 @@ class Music(metaclass=utils.MetaCog, thumbnail='https://i.imgur.com/8eJgtrh.png'
     def __init__(self, bot):
         self.bot = bot
         self.queues = {}
+        self.resolver = TrackResolver(bot)
+
+        self.idle = set()
+        self._sweep = None
 
         self.bot.lavalink.register_hook(self.track_hook)
-        self.bot.loop.create_task(self.inactivity_check())
-        self.bot.loop.create_task(self.refresh_token())
+        self._refresh_token = self.bot.timers.every(3500, self.refresh_token, delay=0)
+
+    def __unload(self):
+        self._refresh_token.cancel()
+
+        # The timer wheel belongs to the bot, so our handles would otherwise still fire after an unload.
+        if self._sweep is not None:
+            self._sweep.cancel()
+        for queue in self.queues.values():
+            queue.mark_active()
+            queue.cancel_update()
 
     async def track_hook(self, event):
         if isinstance(event, lavalink.TrackEndEvent) or isinstance(event, lavalink.TrackExceptionEvent):
@@ -368,40 +459,40 @@ class Music(metaclass=utils.MetaCog, thumbnail='https://i.imgur.com/8eJgtrh.png'
         hook = discord.Webhook.partial(id=wh_id, token=wh_token, adapter=discord.AsyncWebhookAdapter(self.bot.session))
         return hook
 
-    @utils.backoff_loop()
-    async def inactivity_check(self):
-        await self.bot.wait_until_ready()
+    def queue_idle(self, queue):
+        """Called by a queue's idle timer. Queues expiring close together are swept in one batch."""
+        self.idle.add(queue)
 
-        await asyncio.sleep(20)
+        if self._sweep is None or not self._sweep.pending:
+            self._sweep = self.bot.timers.call_later(1, self.sweep_idle)
 
-        inactive = []
-        for q in self.queues.values():
-            if q.inactive:
-                inactive.append(q)
+    async def sweep_idle(self):
+        expired = [q for q in self.idle if self.queues.get(q.guild_id) is q and q.idle_handle is not None]
+        self.idle.clear()
 
-        for q in inactive:
-            print(f'Inactivty Check: Inactive Queue {q.guild_id}')
-            await q.destroy_controller()
+        for q in expired:
+            logger.info(f'Inactivity Sweep: Inactive Queue {q.guild_id}')
 
-            try:
-                q.player_task.cancel()
-            except Exception:
-                pass
+        await asyncio.gather(*(self.teardown(q) for q in expired), return_exceptions=True)
 
-            try:
-                q.updater_task.cancel()
-            except Exception:
-                pass
+    async def teardown(self, queue):
+        """Stop a queue, its controller and its player, disconnecting from voice."""
+        if self.queues.get(queue.guild_id) is queue:
+            del self.queues[queue.guild_id]
 
-            player = self.bot.lavalink.players.get(q.guild_id)
+        queue.player_task.cancel()
+        queue.cancel_update()
+        queue.mark_active()
 
-            try:
-                await player.disconnect()
-            except AttributeError:
-                pass
+        player = self.bot.lavalink.players.get(queue.guild_id)
+        pending = [queue.destroy_controller()]
+        if player:
+            pending.append(player.disconnect())
+
+        await asyncio.gather(*pending, return_exceptions=True)
 
-            self.bot.lavalink.players.remove(q.guild_id)
-            self.queues.pop(q.guild_id)
+        self.bot.lavalink.players.remove(queue.guild_id)
+        await self.bot.nodes.forget(queue.guild_id)
 
     async def delete_message(self, ctx):
         queue = self.get_queue(ctx)
@@ -487,7 +578,7 @@ class Music(metaclass=utils.MetaCog, thumbnail='https://i.imgur.com/8eJgtrh.png'
         try:
             queue = self.queues[ctx.guild.id]
         except KeyError:
-            queue = MusicQueue(ctx)
+            queue = MusicQueue(ctx, self.resolver, self.queue_idle)
             self.queues[ctx.guild.id] = queue
 
         return queue
@@ -584,25 +675,62 @@ class Music(metaclass=utils.MetaCog, thumbnail='https://i.imgur.com/8eJgtrh.png'
         headers = {'Authorization': f'Basic {auth.decode()}',
                    'Content-Type': "application/x-www-form-urlencoded"}
 
-        while True:
-            async with self.bot.session.post('https://accounts.spotify.com/api/token', headers=headers,
-                                             data='grant_type=client_credentials') as resp:
-                value = await resp.json()
+        async with self.bot.session.post('https://accounts.spotify.com/api/token', headers=headers,
+                                         data='grant_type=client_credentials') as resp:
+            value = await resp.json()
+
+            self.bot._config.set('SPOTIFY', 'value', value['access_token'])
+            with open('config.ini', 'w') as configfile:
+                self.bot._config.write(configfile)
+
+    async def spotify_request(self, url, *, retries=5):
+        """GET a Spotify API url, waiting out 429 responses and refreshing an expired token once."""
+        refreshed = False
+
+        for _ in range(retries):
+            headers = {f'Accept': 'application/json', 'Content-Type': 'application/json',
+                       'Authorization': f'Bearer {self.bot._config.get("SPOTIFY", "value")}'}
+
+            async with self.bot.session.get(url, headers=headers) as resp:
+                if resp.status == 429:
+                    retry = int(resp.headers.get('Retry-After', 1))
+                elif resp.status == 401 and not refreshed:
+                    retry = None
+                elif resp.status >= 400:
+                    return None
+                else:
+                    return await resp.json()
 
-                self.bot._config.set('SPOTIFY', 'value', value['access_token'])
-                with open('config.ini', 'w') as configfile:
-                    self.bot._config.write(configfile)
+            if retry is None:
+                refreshed = True
+                await self.refresh_token()
+            else:
+                await asyncio.sleep(retry)
+
+        return None
 
-            await asyncio.sleep(3500)
+    async def spotify_playlist(self, id_, *, limit=1000):
+        """Yield the tracks of a Spotify playlist, following next links until it or limit runs out."""
+        url = f'https://api.spotify.com/v1/playlists/{id_}/tracks?limit=100'
+        count = 0
 
-    async def get_spotify(self, id_):
-        headers = {f'Accept': 'application/json', 'Content-Type': 'application/json',
-                   'Authorization': f'Bearer {self.bot._config.get("SPOTIFY", "value")}'}
+        while url and count < limit:
+            data = await self.spotify_request(url)
+            if not data:
+                return
+
+            for item in data['items']:
+                track = item.get('track')
+                if not track or track['type'] != 'track':
+                    continue
 
-        async with self.bot.session.get(f'https://api.spotify.com/v1/playlists/{id_}/tracks', headers=headers) as resp:
-            data = await resp.json()
+                yield track
 
-        return data
+                count += 1
+                if count >= limit:
+                    return
+
+            url = data.get('next')
 
     @commands.command(name='play', aliases=['sing'], cls=utils.EvieeCommand)
     @commands.cooldown(1, 2, commands.BucketType.user)
@@ -645,42 +773,34 @@ class Music(metaclass=utils.MetaCog, thumbnail='https://i.imgur.com/8eJgtrh.png'
         if not queue.dj:
             queue.dj = ctx.author
 
-        try:
-            match = re.match(surl, query)
-            spotify = match.group(1)
-            print(spotify)
-        except AttributeError:
-            sdata = None
-        else:
-            sdata = await self.get_spotify(spotify)
+        match = surl.match(query)
 
-        if sdata:
-            data = sdata['items']
-
-            for track in data:
-                if not track['track']['type'] == 'track':
-                    continue
-
-                query = f'{track["track"]["name"]} - {track["track"]["artists"][0]["name"]}'
+        if match:
+            added = 0
 
+            # Tracks are queued as each page arrives, so playback starts before the whole playlist is fetched.
+            async for track in self.spotify_playlist(match.group(1), limit=1000 - len(queue.entries)):
+                # Other commands can fill the queue while pages are being fetched.
                 if len(queue.entries) >= 1000:
                     break
 
+                query = f'{track["name"]} - {track["artists"][0]["name"]}'
                 await queue.put(Track(id_=None, info={'title': query}, ctx=ctx, query=query))
+                added += 1
 
-            if queue.controller_message and player.is_playing:
-                await queue.invoke_controller()
-            else:
-                queue.update = True
-
-            return await ctx.send('Successfully added your Spotify playlist to the queue.', delete_after=20)
+            if not added and len(queue.entries) >= 1000:
+                return await ctx.send('You have queued the maximum amount of songs!')
+            elif not added:
+                return await ctx.send('No tracks could be found in that Spotify playlist.', delete_after=20)
+            return await ctx.send(f'Successfully added {added} songs from your Spotify playlist to the queue.',
+                                  delete_after=20)
 
         if not rurl.match(query):
             query = f'ytsearch:{query}'
 
         print(f'Play: Query = {query}')
 
-        songs = await self.bot.lavalink.get_tracks(query)
+        songs = await self.bot.searches.get_tracks(query)
         print(f'Play: {songs}')
         if not songs or not songs['tracks']:
             return await ctx.send('No songs were found with that query. Try again.')
@@ -699,9 +819,6 @@ class Music(metaclass=utils.MetaCog, thumbnail='https://i.imgur.com/8eJgtrh.png'
             await ctx.send(f'```ini\nAdded {song["info"]["title"]} to the Queue\n```', delete_after=15)
             await queue.put(Track(id_=song['track'], info=song['info'], ctx=ctx))
 
-        if queue.controller_message and player.is_playing:
-            await queue.invoke_controller()
-
     @commands.command(name='now_playing', aliases=['np', 'current', 'currentsong'], cls=utils.EvieeCommand)
     @commands.cooldown(2, 15, commands.BucketType.user)
     async def now_playing(self, ctx):
@@ -849,24 +966,7 @@ class Music(metaclass=utils.MetaCog, thumbnail='https://i.imgur.com/8eJgtrh.png'
         await self.do_vote(ctx, queue, 'stop')
 
     async def do_stop(self, ctx):
-        queue = self.get_queue(ctx)
-        player = self.get_player(ctx.guild)
-
-        await queue.destroy_controller()
-
-        try:
-            queue.player_task.cancel()
-        except Exception:
-            pass
-
-        try:
-            queue.updater_task.cancel()
-        except Exception:
-            pass
-
-        self.queues.pop(ctx.guild.id)
-        await player.disconnect()
-        self.bot.lavalink.players.remove(ctx.guild.id)
+        await self.teardown(self.get_queue(ctx))
 
     @commands.command(name='volume', aliases=['vol'], cls=utils.EvieeCommand)
     @commands.cooldown(1, 2, commands.BucketType.guild)
@@ -906,8 +1006,7 @@ class Music(metaclass=utils.MetaCog, thumbnail='https://i.imgur.com/8eJgtrh.png'
         await player.set_volume(value)
         await ctx.send(f'Set the volume to **{value}**%', delete_after=7)
 
-        if not queue.updating and not queue.update:
-            await queue.invoke_controller()
+        queue.request_update()
 
     @commands.command(name='queue', aliases=['q', 'que'], cls=utils.EvieeCommand)
     @commands.cooldown(1, 10, commands.BucketType.user)
@@ -933,14 +1032,18 @@ class Music(metaclass=utils.MetaCog, thumbnail='https://i.imgur.com/8eJgtrh.png'
             return await ctx.send('I am not currently connected to voice!')
 
         queue = self.get_queue(ctx)
-
-        entries = [f'{i} - [{e.title}]({e.uri})' if not e.is_dead else f'**{i} -** ~~{e.title}~~'
-                   for i, e in enumerate(queue.entries, 1)]
+        entries = list(queue.entries)
 
         if not entries:
             return await ctx.send('```\nNo more songs in the Queue!\n```', delete_after=15)
 
-        await ctx.paginate(title=f'Upcoming({len(entries)} entries) Page', entries=entries)
+        def queue_page(chunk, index):
+            fmt = '\n'.join(f'{i} - [{e.title}]({e.uri})' for i, e in enumerate(chunk, index * 10 + 1))
+            return discord.Embed(title=f'Upcoming({len(entries)} entries) Page - {index + 1}/{source.page_count}',
+                                 description=fmt, colour=0xffd4d4)
+
+        source = utils.ListPageSource(entries, per_page=10, formatter=queue_page)
+        await ctx.paginate(source=source)
 
     @commands.command(name='remove_songs', aliases=['removesongs', 'kill', 'delete', 'del'], cls=utils.EvieeCommand)
     @commands.cooldown(1, 10, commands.BucketType.user)
@@ -956,16 +1059,12 @@ class Music(metaclass=utils.MetaCog, thumbnail='https://i.imgur.com/8eJgtrh.png'
         if not await self.has_perms(ctx, manage_guild=True):
             return await ctx.send('Only the DJ or an Admins may remove songs from the queue!')
 
-        success = []
+        indexes = {int(t) - 1 for t in tracks if t.isdigit() and 0 < int(t) <= len(queue.entries)}
 
-        for track in tracks:
-            try:
-                item = queue.entries[int(track) - 1]
-                item.dead = True
-            except IndexError:
-                pass
-            else:
-                success.append(item.title)
+        # Remove from the back first, so earlier removals do not shift the positions still to be removed.
+        success = [queue.entries.pop(index).title for index in sorted(indexes, reverse=True)][::-1]
+        if success:
+            queue.request_update()
 
         if not success:
             return await ctx.send('No songs were removed. Check you are removing valid tracks.')
@@ -1007,9 +1106,9 @@ class Music(metaclass=utils.MetaCog, thumbnail='https://i.imgur.com/8eJgtrh.png'
 
     async def do_shuffle(self, ctx):
         queue = self.get_queue(ctx)
-        random.shuffle(queue.entries)
+        queue.entries.shuffle()
 
-        queue.update = True
+        queue.request_update()
 
     @commands.command(name='repeat', cls=utils.EvieeCommand)
     async def repeat_(self, ctx):
@@ -1038,12 +1137,9 @@ class Music(metaclass=utils.MetaCog, thumbnail='https://i.imgur.com/8eJgtrh.png'
     async def do_repeat(self, ctx):
         queue = self.get_queue(ctx)
 
-        if not queue.entries:
-            await queue.put(queue.current)
-        else:
-            queue.entries.appendleft(queue.current)
+        queue.entries.appendleft(queue.current)
 
-        queue.update = True
+        queue.request_update()
 
     @commands.command(name='vol_up', hidden=True, cls=utils.EvieeCommand)
     async def volume_up(self, ctx):
@@ -1061,7 +1157,7 @@ class Music(metaclass=utils.MetaCog, thumbnail='https://i.imgur.com/8eJgtrh.png'
         await player.set_volume(vol)
 
         queue = self.get_queue(ctx)
-        queue.update = True
+        queue.request_update()
 
     @commands.command(name='vol_down', hidden=True, cls=utils.EvieeCommand)
     async def volume_down(self, ctx):
@@ -1079,7 +1175,7 @@ class Music(metaclass=utils.MetaCog, thumbnail='https://i.imgur.com/8eJgtrh.png'
         await player.set_volume(vol)
 
         queue = self.get_queue(ctx)
-        queue.update = True
+        queue.request_update()
 
     @commands.command(name='report', aliases=['bug'], cls=utils.EvieeCommand)
     @commands.cooldown(1, 180, commands.BucketType.user)
@@ -1143,6 +1239,7 @@ class Music(metaclass=utils.MetaCog, thumbnail='https://i.imgur.com/8eJgtrh.png'
             add
             import
             list
+            play
 
         Examples
         ----------
@@ -1151,6 +1248,7 @@ class Music(metaclass=utils.MetaCog, thumbnail='https://i.imgur.com/8eJgtrh.png'
             {ctx.prefix}faves add (Adds the current song)
             {ctx.prefix}faves add What is love?
             {ctx.prefix}faves import (A valid Youtube Playlist URL)
+            {ctx.prefix}faves play shuffle
         """
         await ctx.invoke(self.favourites_list)
 
@@ -1162,7 +1260,7 @@ class Music(metaclass=utils.MetaCog, thumbnail='https://i.imgur.com/8eJgtrh.png'
             if not rurl.match(query):
                 query = f'ytsearch:{query}'
 
-            songs = await self.bot.lavalink.get_tracks(query)
+            songs = await self.bot.searches.get_tracks(query)
             if not songs or not songs['tracks']:
                 return await ctx.send('No songs were found with that query. Please try again.')
 
@@ -1198,39 +1296,95 @@ class Music(metaclass=utils.MetaCog, thumbnail='https://i.imgur.com/8eJgtrh.png'
             if not rurl.match(query):
                 query = f'ytsearch:{query}'
 
-            songs = await self.bot.lavalink.get_tracks(query)
+            songs = await self.bot.searches.get_tracks(query)
             if not songs or not songs['tracks']:
                 return await ctx.send('No songs were found with that query. Please try again.')
 
             if not songs['playlistInfo']:
                 return await ctx.send('This is not a valid playlist. Please try again!')
 
-            results = []
+            records = [(i, t['track'], t['info']['title']) for i, t in enumerate(songs['tracks'])]
 
+            # Stage the whole playlist with COPY and insert it in one statement, rather than a round trip per song.
             async with self.bot.pool.acquire() as conn:
-                stmt = await conn.prepare(
-                    """INSERT INTO playlists(uid, song_id, song_name) VALUES($1, $2, $3)
-                        ON CONFLICT(uid, song_id) DO NOTHING RETURNING song_name""")
-
                 async with conn.transaction():
-                    for track in songs['tracks']:
-                        async for record in stmt.cursor(ctx.author.id, track['track'], track['info']['title']):
-                            results.append(record['song_name'])
+                    await conn.execute("""CREATE TEMPORARY TABLE favourites_import(
+                                              position INT, song_id TEXT, song_name TEXT) ON COMMIT DROP""")
+                    await conn.copy_records_to_table('favourites_import', records=records)
+
+                    results = await conn.fetch("""INSERT INTO playlists(uid, song_id, song_name)
+                                                  SELECT $1, song_id, song_name FROM favourites_import
+                                                  ORDER BY position
+                                                  ON CONFLICT(uid, song_id) DO NOTHING RETURNING song_name""",
+                                               ctx.author.id)
 
             if not results:
                 return await ctx.send('No songs could be added to your favourites. Perhaps they are already in there!',
                                       delete_after=30)
 
             await ctx.paginate(title=f'Added {len(results)} songs to your favourites | Page ',
-                               entries=[f'{i} - {e}' for i, e in enumerate(results, 1)])
+                               entries=[f'{i} - {e["song_name"]}' for i, e in enumerate(results, 1)])
+
+    @favourites_.command(name='play', aliases=['queue'])
+    async def favourites_play(self, ctx, *, mode: str = ''):
+        """Queue your favourites, shuffled if mode is shuffle. Songs already in the queue are skipped."""
+        await ctx.trigger_typing()
+        await ctx.invoke(self.connect_)
+
+        player = self.get_player(ctx.guild)
+
+        await asyncio.sleep(1)
+        if not player.is_connected:
+            return await ctx.send('Bot is not connected to voice. Please join a voice channel to play music.')
+
+        queue = self.get_queue(ctx)
+        if not queue.dj:
+            queue.dj = ctx.author
+
+        order = 'ORDER BY random()' if mode.lower() in ('shuffle', 'random', 'mix') else ''
+        added = skipped = 0
+
+        # Rows are streamed a page at a time, so the first songs are queued before the rest are read.
+        async with self.bot.pool.acquire() as conn:
+            async with conn.transaction():
+                cursor = await conn.cursor(f"""SELECT song_id, song_name FROM playlists WHERE uid = $1 {order}""",
+                                           ctx.author.id)
+
+                while len(queue.entries) < 1000:
+                    rows = await cursor.fetch(100)
+
+                    for row in rows:
+                        if len(queue.entries) >= 1000:
+                            break
+                        elif queue.is_queued(row['song_id']):
+                            skipped += 1
+                            continue
+
+                        await queue.put(Track(id_=row['song_id'], info={'title': row['song_name']}, ctx=ctx))
+                        added += 1
+
+                    if len(rows) < 100:
+                        break
+
+        if not added and not skipped:
+            return await ctx.send('You do not currently have any songs in your favourites.')
+
+        await ctx.send(f'```ini\nAdded {added} songs from your favourites to the queue.'
+                       f'{f" Skipped {skipped} already queued." if skipped else ""}\n```', delete_after=20)
 
     @favourites_.command(name='list', aliases=['show'])
     async def favourites_list(self, ctx):
-        async with self.bot.pool.acquire() as conn:
-            results = await conn.fetch("""SELECT song_name FROM playlists WHERE uid IN($1)""", ctx.author.id)
+        count = await self.bot.pool.fetchval("""SELECT count(*) FROM playlists WHERE uid = $1""", ctx.author.id)
 
-        if not results:
+        if not count:
             return await ctx.send('You do not currently have any songs in your favourites.')
 
-        await ctx.paginate(title=f"{ctx.author.display_name}'s Favourites | Page",
-                           entries=[f'{i} - {e["song_name"]}' for i, e in enumerate(results, 1)])
\ No newline at end of file
+        def favourites_page(rows, index):
+            fmt = '\n'.join(f'{i} - {r["song_name"]}' for i, r in enumerate(rows, index * 10 + 1))
+            title = f"{ctx.author.display_name}'s Favourites | Page - {index + 1}/{source.page_count}"
+            return discord.Embed(title=title, description=fmt, colour=0xffd4d4)
+
+        source = utils.KeysetPageSource(self.bot.pool, """SELECT id, song_name FROM playlists WHERE uid = $1""",
+                                        ctx.author.id, key='id', per_page=10, formatter=favourites_page,
+                                        count=count)
+        await ctx.paginate(source=source)
\ No newline at end of file
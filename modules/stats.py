@@ -6,24 +6,31 @@ import datetime
 import dbl
 import functools
 import humanize
-import inspect
 import itertools
 import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import psutil
 import numpy as np
-import os
-import pathlib
+import time
 from io import BytesIO
 from matplotlib.ticker import MultipleLocator
-from more_itertools import ilen, with_iter
 from PIL import Image, ImageSequence, ImageFont, ImageDraw, ImageColor
 from typing import Union
 
 import utils
 
 
+ABOUT_LINKS = '**Useful Links:**\n' \
+              '[Support Server](https://discord.gg/EVxmWHS)\n' \
+              '[Github Page](https://github.com/EvieePy/EvieeBot)\n' \
+              '[Mystbin](http://mystb.in)\n' \
+              '[Vote for Eviee](https://discordbots.org/bot/319047630048985099/vote)\n' \
+              'Created by Eviee#0666 with Python 3.6.5.\n\n'
+
+MEDALS = ('🥇', '🥈', '🥉')
+
+
 def format_delta(*, delta, brief=False):
     hours, remainder = divmod(int(delta.total_seconds()), 3600)
     minutes, seconds = divmod(remainder, 60)
@@ -53,8 +60,20 @@ class Stats(metaclass=utils.MetaCog, colour=0xffebba, thumbnail='https://i.imgur
 
         self.dbl = dbl.Client(self.bot, self.bot._config.get("DBL", "value"))
 
+        # Live counters, kept in step with the stats table by on_message and on_command_completion.
+        self.counters = {'messages': None, 'commands': None}
+
+        self._revisions = (None, None)
+        self._command_stats = None
+        self._command_stats_updated = 0
+        self._refreshing = None
+
         self.bot.loop.create_task(self.update_dbl())
-        self.bot.loop.create_task(self.expiry_check())
+        self._expiry_check = self.bot.timers.every(10300, self.expiry_check, delay=0)
+        self.bot.loop.create_task(self.get_revisions())
+
+    def __unload(self):
+        self._expiry_check.cancel()
 
     async def get_perms(self, ctx, target: Union[discord.Member, discord.Role], *, previous=None):
 
@@ -607,10 +626,11 @@ class Stats(metaclass=utils.MetaCog, colour=0xffebba, thumbnail='https://i.imgur
 
     async def on_message(self, msg):
         async with self.bot.pool.acquire() as conn:
-            await conn.execute("""INSERT INTO stats(item, value) VALUES('messages', 1)
-                                  ON CONFLICT(item)
-                                    DO UPDATE SET value = COALESCE(stats.value, 0)::int + 1
-                                    WHERE stats.item IN('messages')""")
+            self.counters['messages'] = await conn.fetchval("""INSERT INTO stats(item, value) VALUES('messages', 1)
+                                                               ON CONFLICT(item)
+                                                                 DO UPDATE SET value = COALESCE(stats.value, 0)::int + 1
+                                                                 WHERE stats.item IN('messages')
+                                                               RETURNING value""")
 
         if msg.author.bot or not msg.guild:
             return
@@ -634,74 +654,121 @@ class Stats(metaclass=utils.MetaCog, colour=0xffebba, thumbnail='https://i.imgur
 
     async def on_command_completion(self, ctx):
         async with self.bot.pool.acquire() as conn:
-            await conn.execute("""INSERT INTO stats(item, value) VALUES('commands', 1)
-                                  ON CONFLICT(item)
-                                    DO UPDATE SET value = COALESCE(stats.value, 0)::int + 1
-                                    WHERE stats.item IN('commands')""")
+            self.counters['commands'] = await conn.fetchval("""INSERT INTO stats(item, value) VALUES('commands', 1)
+                                                               ON CONFLICT(item)
+                                                                 DO UPDATE SET value = COALESCE(stats.value, 0)::int + 1
+                                                                 WHERE stats.item IN('commands')
+                                                               RETURNING value""")
 
-    @utils.backoff_loop()
     async def expiry_check(self):
         async with self.bot.pool.acquire() as conn:
             await conn.execute("""DELETE FROM messages WHERE now() >= messages.expiry""")
 
-        await asyncio.sleep(10300)
-
     @commands.command(name='linecount', cls=utils.EvieeCommand)
     async def lc(self, ctx, target=None):
         cmd = self.bot.get_command(target) if target else None
         cog = self.bot.get_cog(target)
         ext = self.bot.get_ext(target)
 
+        sources = self.bot.sources
+
         if cmd:
-            length = len(inspect.getsourcelines(cmd.callback)[0])
+            entry = sources.command(cmd)
         elif cog:
-            length = len(inspect.getsourcelines(cog.__class__)[0])
+            entry = sources.cog(cog)
         elif ext:
-            length = len(inspect.getsourcelines(ext)[0])
+            entry = sources.module(ext, target)
         else:
-            length = sum(ilen(with_iter(p.open(encoding='utf-8'))) for p in pathlib.Path('.').rglob('*.py')
-                         if not str(p.parent).startswith('venv'))
-            return await ctx.send(f'**Total Lines:** `{length}`')
+            return await ctx.send(f'**Total Lines:** `{sources.total}`')
 
+        length = entry.lines if entry else 0
         await ctx.send(f'**{target} Lines:** `{length}`')
 
-    @commands.command(name='about', cls=utils.EvieeCommand, aliases=['info'])
-    async def about_(self, ctx):
-        async with self.bot.pool.acquire() as conn:
-            coms = await conn.fetchval("""SELECT value FROM stats WHERE item IN('commands')""")
-            messages = await conn.fetchval("""SELECT value FROM stats WHERE item IN('messages')""")
+    async def get_revisions(self):
+        """Return the revisions embed, rebuilt only when HEAD moves."""
+        head, embed = self._revisions
+        if embed and head == utils.read_head():
+            return embed
 
-            command_count = await conn.fetch("""SELECT name, count(*) AS count FROM commands
-                                                GROUP BY 1 ORDER BY count DESC""")
+        try:
+            head, revisions = await utils.get_revisions(5)
+        except (OSError, ValueError, utils.ProcessTimeout):
+            revisions = None
+
+        if not revisions:
+            return discord.Embed(title='Latest Revisions:', description='Could not fetch revisions. Sorry.',
+                                 colour=0xff6961)
+
+        revision = '\n'.join(f'[`{r.short}`](https://github.com/EvieePy/EvieeBot/commit/{r.sha}) {r.subject} '
+                              f'({r.committed:%d %b %Y})' for r in revisions)
+        embed = discord.Embed(title='Latest Revisions:', description=revision, colour=0xff6961)
+
+        self._revisions = (head, embed)
+        return embed
+
+    def podium(self, rows, key, name):
+        lines = []
+
+        for medal, row in zip(MEDALS, rows):
+            lines.append(f'{medal} {name(row[key])} ({row["count"]})')
 
+        return '\n'.join(lines) or 'N/A'
+
+    async def refresh_command_stats(self):
+        async with self.bot.pool.acquire() as conn:
+            command_count = await conn.fetch("""SELECT name, count(*) AS count FROM commands
+                                                GROUP BY 1 ORDER BY count DESC LIMIT 3""")
             ucount = await conn.fetch("""SELECT uid, count(*) AS count FROM commands GROUP BY uid
-                                          ORDER BY count DESC""")
+                                          ORDER BY count DESC LIMIT 3""")
             gcount = await conn.fetch("""SELECT gid,count(*) AS count FROM commands GROUP BY gid
-                                          ORDER BY count DESC""")
+                                          ORDER BY count DESC LIMIT 3""")
+
+        def user(uid):
+            return str(self.bot.get_user(uid) or 'N/A')
+
+        def guild(gid):
+            g = self.bot.get_guild(gid)
+            return g.name if g else 'N/A'
+
+        cembed = discord.Embed(title='Command Stats', colour=0xff6961)
+        cembed.add_field(name='Top commands', value=self.podium(command_count, 'name', str))
+        cembed.add_field(name='Top command users (Users)', value=self.podium(ucount, 'uid', user), inline=False)
+        cembed.add_field(name='Top command users (Guilds)', value=self.podium(gcount, 'gid', guild))
+
+        self._command_stats = cembed
+        self._command_stats_updated = time.monotonic()
+
+    async def get_command_stats(self):
+        """Return the command stats embed. A stale embed is served while a fresh one is built in the background."""
+        stale = time.monotonic() - self._command_stats_updated > 600
+
+        if stale and (self._refreshing is None or self._refreshing.done()):
+            self._refreshing = self.bot.loop.create_task(self.refresh_command_stats())
 
-        uc1 = self.bot.get_user(ucount[0]['uid']) if self.bot.get_user(ucount[0]['uid']) else "N/A"
-        uc2 = self.bot.get_user(ucount[1]['uid']) if self.bot.get_user(ucount[1]['uid']) else "N/A"
-        uc3 = self.bot.get_user(ucount[2]['uid']) if self.bot.get_user(ucount[2]['uid']) else "N/A"
+        if self._command_stats is None:
+            await asyncio.shield(self._refreshing)
 
-        gc1 = self.bot.get_guild(gcount[0]['gid']).name if self.bot.get_guild(gcount[0]['gid']) else "N/A"
-        gc2 = self.bot.get_guild(gcount[1]['gid']).name if self.bot.get_guild(gcount[1]['gid']) else "N/A"
-        gc3 = self.bot.get_guild(gcount[2]['gid']).name if self.bot.get_guild(gcount[2]['gid']) else "N/A"
+        return self._command_stats
+
+    @commands.command(name='about', cls=utils.EvieeCommand, aliases=['info'])
+    async def about_(self, ctx):
+        if None in self.counters.values():
+            async with self.bot.pool.acquire() as conn:
+                for item, value in self.counters.items():
+                    if value is None:
+                        value = await conn.fetchval("""SELECT value FROM stats WHERE item IN($1)""", item)
+                        self.counters[item] = self.counters[item] or value or 0
 
         uptime = format_delta(delta=datetime.datetime.utcnow() - self.bot.starttime, brief=False)
-        memory = self.bot.proc.memory_full_info().uss / 1024 ** 2
+        memory = self.bot.proc.memory_info().rss / 1024 ** 2
         cpu = self.bot.proc.cpu_percent() / psutil.cpu_count()
-        ping = np.average(list(self.bot._wspings))
+        ping = np.average(self.bot._wspings)
 
         embed = discord.Embed(colour=0xff6961,
-                              description=f'**Useful Links:**\n'
-                                          f'[Support Server](https://discord.gg/EVxmWHS)\n'
-                                          f'[Github Page](https://github.com/EvieePy/EvieeBot)\n'
-                                          f'[Mystbin](http://mystb.in)\n'
-                                          f'[Vote for Eviee](https://discordbots.org/bot/319047630048985099/vote)\n'
-                                          f'Created by Eviee#0666 with Python 3.6.5.\n\n'
-                                          f'{humanize.intcomma(int(messages))} messages read'
-                                          f' with {humanize.intcomma(int(coms))} commands invoked in'
-                                          f' {len(self.bot.guilds)} servers.\n\n'
+                              description=f'{ABOUT_LINKS}'
+                                          f'{humanize.intcomma(int(self.counters["messages"]))} messages read'
+                                          f' with {humanize.intcomma(int(self.counters["commands"]))} commands invoked'
+                                          f' in {len(self.bot.guilds)} servers.\n\n'
                                           f'Currently up for {uptime}\n\n'
                                           f'Memory Usage   :  {memory:.2f} MiB\n'
                                           f'CPU Usage          :  {cpu:.2f} %\n'
@@ -709,34 +776,7 @@ class Stats(metaclass=utils.MetaCog, colour=0xffebba, thumbnail='https://i.imgur
         embed.set_thumbnail(url=self.bot.user.avatar_url)
         embed.set_footer(text=f'Use {ctx.prefix}feedback to report bugs or leave feedback. <3')
 
-        cmd = r'git show -s HEAD~5..HEAD --format="[{}](https://github.com/EvieePy/EvieeBot/commit/%H) %s (%cr)"'
-        if os.name == 'posix':
-            cmd = cmd.format(r'\`%h\`')
-        else:
-            cmd = cmd.format(r'`%h`')
-
-        try:
-            revision = os.popen(cmd).read().strip()
-        except OSError:
-            revision = 'Could not fetch due to memory error. Sorry.'
-
-        gembed = discord.Embed(title='Latest Revisions:', description=revision, colour=0xff6961)
-
-        cembed = discord.Embed(title='Command Stats', colour=0xff6961)
-        cembed.add_field(name='Top commands', value=f'🥇 {command_count[0]["name"]} ({command_count[1]["count"]})\n'
-                                                    f'🥈 {command_count[1]["name"]} ({command_count[1]["count"]})\n'
-                                                    f'🥉 {command_count[2]["name"]} ({command_count[2]["count"]})\n')
-        cembed.add_field(name='Top command users (Users)',
-                         value=f'🥇 {str(uc1)} ({ucount[0]["count"]})\n'
-                               f'🥈 {str(uc2)} ({ucount[1]["count"]})\n'
-                               f'🥉 {str(uc3)} ({ucount[2]["count"]})\n',
-                         inline=False)
-        cembed.add_field(name='Top command users (Guilds)',
-                         value=f'🥇 {gc1} ({gcount[0]["count"]})\n'
-                               f'🥈 {gc2} ({gcount[1]["count"]})\n'
-                               f'🥉 {gc3} ({gcount[2]["count"]})\n')
-
-        await ctx.paginate(extras=[embed, gembed, cembed])
+        await ctx.paginate(extras=[embed, await self.get_revisions(), await self.get_command_stats()])
 
     def make_pie(self):
 
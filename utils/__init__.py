@@ -3,4 +3,15 @@ from .core import *
 from .errors import *
 from .paginators import *
 from .time import UserFriendlyTime
-from .fuzzy import finder as fuzzyfinder
+from .fuzzy import finder as fuzzyfinder, ChoiceSet, FinderIndex
+from .monitor import LoopMonitor
+from .process import *
+from .revision import *
+from .source import *
+from .rtfs import *
+from .timers import *
+from .indexed import *
+from .search import *
+from .nodes import *
+from .audiocache import *
+from .reactions import *
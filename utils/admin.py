@@ -1,7 +1,6 @@
 import discord
 from discord.ext import commands
 
-import asyncio
 import copy
 import datetime
 import inspect
@@ -26,12 +25,12 @@ class Admin(metaclass=utils.MetaCog, private=True):
         self.bot = bot
 
         bot.add_check(self.block_check)
-        bot.loop.create_task(self.block_task())
+        self._block_task = bot.timers.every(30, self.block_task)
 
-    @utils.backoff_loop()
-    async def block_task(self):
-        await asyncio.sleep(30)
+    def __unload(self):
+        self._block_task.cancel()
 
+    async def block_task(self):
         ret = await self.bot.pool.fetch("""SELECT id FROM blocks WHERE now() >= blocks.ends""")
 
         if ret:
@@ -71,6 +70,8 @@ class Admin(metaclass=utils.MetaCog, private=True):
             await ctx.send(f'**`ERROR:`** {type(e).__name__} - {e}')
         else:
             await ctx.send('**`SUCCESS`**')
+            self.bot.build_command_index()
+            await self.bot.sources.update(self.bot)
 
     @commands.command(name='unload', cls=utils.EvieeCommand)
     async def cog_unload(self, ctx, *, cog: str):
@@ -82,6 +83,8 @@ class Admin(metaclass=utils.MetaCog, private=True):
             await ctx.send(f'**`ERROR:`** {type(e).__name__} - {e}')
         else:
             await ctx.send('**`SUCCESS`**')
+            self.bot.build_command_index()
+            await self.bot.sources.update(self.bot)
 
     @commands.command(name='reload', cls=utils.EvieeCommand)
     async def cog_reload(self, ctx, *, cog: str):
@@ -94,6 +97,8 @@ class Admin(metaclass=utils.MetaCog, private=True):
             await ctx.send(f'**`ERROR:`** {type(e).__name__} - {e}')
         else:
             await ctx.send('**`SUCCESS`**')
+            self.bot.build_command_index()
+            await self.bot.sources.update(self.bot)
 
     @commands.command(name='block', aliases=['blocc'], cls=utils.AbstractorGroup, abstractors=['add', 'remove', 'list'],
                       invoke_without_command=True)
@@ -223,17 +228,18 @@ class Admin(metaclass=utils.MetaCog, private=True):
 
     @commands.command(name='sp', cls=utils.EvieeCommand)
     async def make_subprocess_call(self, ctx, cmd: str):
-        pipe = asyncio.subprocess.PIPE
-        proc = await asyncio.create_subprocess_shell(cmd, stdout=pipe, stderr=pipe, loop=asyncio.get_event_loop())
-
-        out, err = await proc.communicate()
+        try:
+            result = await utils.run_process(cmd, shell=True, timeout=120)
+        except utils.ProcessTimeout as e:
+            await ctx.message.add_reaction('heleblob2:337142426340950016')
+            return await ctx.send(f'```\n{e}\n```')
 
-        if err:
+        if result.stderr:
             await ctx.message.add_reaction('heleblob2:337142426340950016')
-            data = '\n'.join(err.decode().split('\n'))
+            data = result.stderr.decode()
         else:
             await ctx.message.add_reaction('lordheleapproves:397289205228896266')
-            data = '\n'.join(out.decode().split('\n'))
+            data = result.stdout.decode()
 
         if len(data) > 1000:
             bin_ = await self.bot.create_bin(data)
@@ -262,6 +268,81 @@ class Admin(metaclass=utils.MetaCog, private=True):
 
         await ctx.send(f'```ini\nTimeit Results ({number}x):\n\n[Statement]\n{statement}\n\n[Result]\n{result}\n```')
 
+    @commands.command(name='lag', aliases=['loopstats'], cls=utils.EvieeCommandGroup)
+    async def loop_lag(self, ctx):
+        """Event loop lag histogram and recently detected slow callbacks."""
+        monitor = self.bot.monitor
+
+        slow = '\n'.join(f'[{i}] {s.started:%H:%M:%S} {s}' for i, s in enumerate(reversed(monitor.slow))) or 'None'
+        fmt = f'```ini\n[Samples]   {monitor.total}\n' \
+              f'[Interval]  {monitor.interval * 1000:.0f}ms\n' \
+              f'[Threshold] {monitor.threshold * 1000:.0f}ms\n' \
+              f'[Stalls]    {monitor.stalls}\n\n' \
+              f'p50: {monitor.percentile(50):.2f}ms | p95: {monitor.percentile(95):.2f}ms | ' \
+              f'p99: {monitor.percentile(99):.2f}ms | max: {max(monitor.samples, default=0):.2f}ms\n\n' \
+              f'{monitor.format_histogram()}\n```\n```ini\n[Slow Callbacks]\n{slow}\n```'
+
+        if len(fmt) > 2000:
+            return await ctx.send(await self.bot.create_bin(fmt))
+        await ctx.send(fmt)
+
+    @loop_lag.command(name='slow')
+    async def loop_lag_slow(self, ctx, index: int=0):
+        """Show the stack recorded for a slow callback. Index 0 is the most recent."""
+        try:
+            slow = list(reversed(self.bot.monitor.slow))[index]
+        except IndexError:
+            return await ctx.send(f'No slow callback exists at index {index}.')
+
+        fmt = f'Slow Callback: {slow}\nDetected: {slow.started}\n\n{slow.stack}'
+        if len(fmt) > 1900:
+            return await ctx.send(await self.bot.create_bin(fmt))
+        await ctx.send(f'```py\n{fmt}\n```')
+
+    @loop_lag.command(name='reset')
+    async def loop_lag_reset(self, ctx):
+        self.bot.monitor.reset()
+        await ctx.send('**`SUCCESS`**')
+
+    @commands.command(name='searches', cls=utils.EvieeCommand)
+    async def search_stats(self, ctx):
+        """Track search cache hit rate and the Lavalink time it saved."""
+        cache = self.bot.searches
+
+        await ctx.send(f'```ini\n[Entries]   {len(cache)}/{cache.limit}\n'
+                       f'[Lookups]   {cache.lookups}\n'
+                       f'[Hits]      {cache.hits} memory | {cache.persisted} database | {cache.coalesced} coalesced\n'
+                       f'[Misses]    {cache.misses} | average {cache.average_fetch * 1000:.0f}ms\n'
+                       f'[Hit Rate]  {cache.hit_rate:.1%}\n'
+                       f'[Saved]     ~{cache.saved:.1f}s\n```')
+
+    @commands.command(name='audiocache', cls=utils.EvieeCommand)
+    async def audio_cache_stats(self, ctx):
+        """Shared audio download cache size, hit rate and evictions."""
+        cache = self.bot.audio_cache
+        mb = 1024 ** 2
+
+        await ctx.send(f'```ini\n[Entries]   {len(cache)} | {cache.size / mb:.0f}/{cache.max_bytes / mb:.0f}MB\n'
+                       f'[Lookups]   {cache.lookups}\n'
+                       f'[Hits]      {cache.hits} direct | {cache.resolved} resolved | {cache.coalesced} coalesced\n'
+                       f'[Downloads] {cache.misses} | {cache.download_time:.1f}s\n'
+                       f'[Evictions] {cache.evictions}\n'
+                       f'[Hit Rate]  {cache.hit_rate:.1%}\n```')
+
+    @commands.command(name='nodes', cls=utils.EvieeCommand)
+    async def lavalink_nodes(self, ctx):
+        """Lavalink nodes, their load and the players placed on each."""
+        pool = self.bot.nodes
+        rows = []
+
+        for node in pool.nodes.values():
+            stats = node.stats
+            state = 'UP' if node.connected else 'DOWN'
+            rows.append(f'[{node.name}] {state} | {len(node.guilds)} players | {stats.playing} playing | '
+                        f'load {stats.system_load:.0%} | penalty {node.penalty:.0f}')
+
+        await ctx.send('```ini\n' + '\n'.join(rows) + f'\n\n[Migrations] {pool.migrations}\n```')
+
     @commands.command(name='players', cls=utils.EvieeCommand)
     @commands.is_owner()
     async def get_players(self, ctx):
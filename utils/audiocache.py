@@ -0,0 +1,330 @@
+"""The MIT License (MIT)
+
+Copyright (c) 2018 EvieePy
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+import asyncio
+import concurrent.futures
+import functools
+import json
+import os
+import re
+import shutil
+import time
+import uuid
+from collections import OrderedDict
+
+import youtube_dl
+
+
+__all__ = ('AudioCache', 'CachedAudio')
+
+
+YOUTUBE_ID = re.compile(r'(?:youtube\.com/(?:watch\?(?:.*&)?v=|embed/|v/)|youtu\.be/)([\w-]{11})')
+UNSAFE = re.compile(r'[^\w.-]')
+
+INFO_KEYS = ('id', 'extractor', 'extractor_key', 'title', 'duration', 'ext', 'webpage_url', 'thumbnail', 'uploader',
+             'url')
+
+YTDL_OPTIONS = {
+    'format': 'bestaudio/best',
+    'restrictfilenames': True,
+    'noplaylist': True,
+    'nocheckcertificate': True,
+    'ignoreerrors': False,
+    'logtostderr': False,
+    'quiet': True,
+    'no_warnings': True,
+    'default_search': 'auto',
+    'source_address': '0.0.0.0'
+}
+
+
+class CachedAudio:
+
+    __slots__ = ('key', 'path', 'size', 'used', 'info')
+
+    def __init__(self, key, path, size, used, info):
+        self.key = key
+        self.path = path
+        self.size = size
+        self.used = used
+        self.info = info
+
+    def __repr__(self):
+        return f'<CachedAudio {self.key} size: {self.size}>'
+
+    @property
+    def title(self):
+        return self.info.get('title')
+
+    @property
+    def ext(self):
+        return self.info.get('ext')
+
+
+class AudioCache:
+    """Shared, size bounded cache of downloaded audio, keyed by extractor and ID.
+
+    A song is downloaded once no matter how many guilds ask for it. YouTube URLs map straight to their key and
+    searches are remembered as aliases of the key they resolved to, so repeat requests skip youtube-dl and the
+    network entirely. Downloads land in a temporary file that is renamed into place, concurrent requests for the
+    same song share one download, and the least recently used files are evicted past max_bytes.
+    """
+
+    def __init__(self, root='downloads/cache', *, max_bytes=4 * 1024 ** 3, aliases=8192, downloads=4, loop=None):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.alias_limit = aliases
+        self.loop = loop or asyncio.get_event_loop()
+
+        self._entries = OrderedDict()
+        self._aliases = OrderedDict()
+        self._inflight = {}
+        self._downloads = {}
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=downloads)
+
+        self.size = 0
+        self.hits = 0
+        self.resolved = 0
+        self.coalesced = 0
+        self.misses = 0
+        self.evictions = 0
+        self.download_time = 0.0
+
+        self._load()
+
+    def __repr__(self):
+        return f'<AudioCache entries: {len(self)}, size: {self.size}/{self.max_bytes}, hit rate: {self.hit_rate:.1%}>'
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @property
+    def lookups(self):
+        return self.hits + self.resolved + self.coalesced + self.misses
+
+    @property
+    def hit_rate(self):
+        return (self.lookups - self.misses) / self.lookups if self.lookups else 0.0
+
+    @property
+    def index_path(self):
+        return os.path.join(self.root, 'index.json')
+
+    @staticmethod
+    def normalize(query):
+        """Searches are case and whitespace insensitive, URLs are kept as they are."""
+        query = query.strip()
+        if '://' in query:
+            return query
+        return ' '.join(query.split()).casefold()
+
+    @staticmethod
+    def key_for(info):
+        return f'{info["extractor_key"].lower()}-{info["id"]}'
+
+    def known_key(self, query):
+        """The key a request is already known to map to, without asking youtube-dl."""
+        match = YOUTUBE_ID.search(query)
+        if match:
+            return f'youtube-{match.group(1)}'
+        return self._aliases.get(self.normalize(query))
+
+    def _path(self, key, ext):
+        extractor, _, id_ = key.partition('-')
+        return os.path.join(self.root, UNSAFE.sub('_', extractor), f'{UNSAFE.sub("_", id_)}.{ext}')
+
+    def _load(self):
+        os.makedirs(self.root, exist_ok=True)
+        # Anything left in tmp is from a download that never finished.
+        shutil.rmtree(os.path.join(self.root, 'tmp'), ignore_errors=True)
+
+        try:
+            with open(self.index_path) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        for key, path, used, info in sorted(index.get('entries', ()), key=lambda e: e[2]):
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                continue
+
+            self._entries[key] = CachedAudio(key, path, size, used, info)
+            self.size += size
+
+        for query, key in index.get('aliases', ()):
+            if key in self._entries:
+                self._aliases[query] = key
+
+    def _dump(self):
+        return json.dumps({'entries': [(e.key, e.path, e.used, e.info) for e in self._entries.values()],
+                           'aliases': list(self._aliases.items())})
+
+    @staticmethod
+    def _write(path, data):
+        temp = f'{path}.{uuid.uuid4().hex}.tmp'
+        with open(temp, 'w') as f:
+            f.write(data)
+        os.replace(temp, path)
+
+    async def save(self):
+        await self.loop.run_in_executor(self._executor, self._write, self.index_path, self._dump())
+
+    def _alias(self, query, key):
+        if '://' in query and YOUTUBE_ID.search(query):
+            return
+
+        self._aliases[self.normalize(query)] = key
+        self._aliases.move_to_end(self.normalize(query))
+        while len(self._aliases) > self.alias_limit:
+            self._aliases.popitem(last=False)
+
+    def _hit(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        if not os.path.exists(entry.path):
+            self._forget(key)
+            return None
+
+        entry.used = time.time()
+        self._entries.move_to_end(key)
+        return entry
+
+    def _forget(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry.size
+        for query in [q for q, k in self._aliases.items() if k == key]:
+            del self._aliases[query]
+        return entry
+
+    def _evict(self, keep):
+        removed = []
+
+        while self.size > self.max_bytes and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            if key == keep:
+                self._entries.move_to_end(key)
+                continue
+
+            removed.append(self._forget(key).path)
+            self.evictions += 1
+
+        # A file being played stays readable through its open descriptor after it is unlinked.
+        for path in removed:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    async def get(self, query):
+        """The cached audio for a URL or search, downloading it first if needed."""
+        key = self.known_key(query)
+        entry = key and self._hit(key)
+
+        if entry:
+            self.hits += 1
+            return entry
+
+        token = key or self.normalize(query)
+        try:
+            future = self._inflight[token]
+        except KeyError:
+            pass
+        else:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        future = self.loop.create_task(self._fetch(query))
+        self._inflight[token] = future
+        future.add_done_callback(lambda f: self._inflight.pop(token, None))
+
+        return await asyncio.shield(future)
+
+    async def _fetch(self, query):
+        ytdl = youtube_dl.YoutubeDL(YTDL_OPTIONS)
+        to_run = functools.partial(ytdl.extract_info, query, download=False)
+        info = await self.loop.run_in_executor(self._executor, to_run)
+
+        if 'entries' in info:
+            # take first item from a playlist or search
+            info = info['entries'][0]
+
+        key = self.key_for(info)
+        self._alias(query, key)
+
+        # Another request may have found the same song by a different search.
+        entry = self._hit(key)
+        if entry:
+            self.resolved += 1
+            await self.save()
+            return entry
+
+        future = self._downloads.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        future = self.loop.create_task(self._download(key, info))
+        self._downloads[key] = future
+        future.add_done_callback(lambda f: self._downloads.pop(key, None))
+
+        return await asyncio.shield(future)
+
+    async def _download(self, key, info):
+        self.misses += 1
+        started = time.perf_counter()
+
+        tmp = os.path.join(self.root, 'tmp')
+        os.makedirs(tmp, exist_ok=True)
+        temp = os.path.join(tmp, uuid.uuid4().hex)
+
+        ytdl = youtube_dl.YoutubeDL({**YTDL_OPTIONS, 'outtmpl': f'{temp}.%(ext)s'})
+        try:
+            await self.loop.run_in_executor(self._executor, ytdl.process_info, dict(info))
+            downloaded = ytdl.prepare_filename(info)
+
+            path = self._path(key, info['ext'])
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(downloaded, path)
+        except Exception:
+            for name in os.listdir(tmp):
+                if name.startswith(os.path.basename(temp)):
+                    os.remove(os.path.join(tmp, name))
+            raise
+
+        self.download_time += time.perf_counter() - started
+
+        entry = CachedAudio(key, path, os.path.getsize(path), time.time(), {k: info.get(k) for k in INFO_KEYS})
+        self._entries[key] = entry
+        self.size += entry.size
+
+        self._evict(key)
+        await self.save()
+
+        return entry
@@ -381,8 +381,17 @@ class AbstractorCommands:
         entry = entry.lower()
 
         command = ctx.bot.get_command(entry)
+        if command is None and ctx.bot.command_finder:
+            command = next(iter(ctx.bot.command_finder.search(entry, limit=1)), None)
+
+            # Say it is a suggestion, so a typo is not mistaken for help on the command that was asked for.
+            if command is not None:
+                await ctx.send(f'Could not find the command `{entry}`. '
+                               f'Showing help for `{command.qualified_name}`.', delete_after=20)
+
         if command is None:
             return
+        entry = command.qualified_name
 
         docs = inspect.cleandoc(command.help)
         docs = docs.split('[S]')
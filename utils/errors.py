@@ -8,7 +8,7 @@ import utils
 
 
 __all__ = ('EvieeBaseException', 'InvalidCacheLimit', 'InvalidCommand', 'MissingCommand', 'AbstractorException',
-           'ImportFailure', 'StartupFailure', 'GloballyBlocked', 'MissingInstance')
+           'ImportFailure', 'StartupFailure', 'GloballyBlocked', 'MissingInstance', 'ProcessTimeout')
 
 
 class EvieeBaseException(Exception):
@@ -47,6 +47,10 @@ class MissingInstance(EvieeBaseException):
     pass
 
 
+class ProcessTimeout(EvieeBaseException):
+    pass
+
+
 class ErrorHandler(metaclass=utils.MetaCog, private=True):
     """Error Handler Cog."""
     __slots__ = ('bot', 'debug', 'lru_errors', 'spam', 'counter_cmdf')
@@ -56,6 +60,7 @@ class ErrorHandler(metaclass=utils.MetaCog, private=True):
         self.debug = False
         self.lru_errors = utils.EvieeLRU(name='Errors', limit=10)
         self.spam = commands.CooldownMapping(commands.Cooldown(3, 60, commands.BucketType.user))
+        self.suggestions = commands.CooldownMapping(commands.Cooldown(3, 60, commands.BucketType.user))
 
         self.counter_cmdf = 0
 
@@ -73,9 +78,26 @@ class ErrorHandler(metaclass=utils.MetaCog, private=True):
         hook = discord.Webhook.partial(id=wh_id, token=wh_token, adapter=discord.AsyncWebhookAdapter(self.bot.session))
         return hook
 
+    async def suggest_command(self, ctx):
+        """Suggest the closest command for a mistyped one, at most 3 times a minute per user."""
+        if ctx.command or not ctx.invoked_with or not self.bot.command_names:
+            return
+
+        match = utils.fuzzy.extract_one(ctx.invoked_with.lower(), self.bot.command_names, scorer=utils.fuzzy.ratio,
+                                        score_cutoff=75)
+        if not match:
+            return
+
+        bucket = self.suggestions.get_bucket(ctx.message)
+        if bucket.update_rate_limit():
+            return
+
+        await ctx.send(f'Could not find the command `{ctx.invoked_with}`. '
+                       f'Did you mean `{ctx.prefix}{match[2].qualified_name}`?', delete_after=20)
+
     async def on_command_error(self, ctx, error):
         if isinstance(error, commands.CommandNotFound):
-            return
+            return await self.suggest_command(ctx)
 
         if isinstance(error, commands.NotOwner):
             bucket = self.spam.get_bucket(ctx.message)
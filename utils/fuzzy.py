@@ -28,9 +28,19 @@ DEALINGS IN THE SOFTWARE.
 # Thanks to Danno(Rapptz) for the Fuzzy... Much Love <3
 
 import re
+import bisect
 import heapq
+from collections import Counter
 from difflib import SequenceMatcher
 
+import numpy as np
+
+
+# Below this many choices plain scoring is cheaper than setting up a batch.
+BATCH_THRESHOLD = 128
+# Collections with at most this many string x character cells get a dense count matrix.
+DENSE_LIMIT = 1 << 20
+
 
 def ratio(a, b):
     m = SequenceMatcher(None, a, b)
@@ -88,6 +98,285 @@ def partial_token_sort_ratio(a, b):
     return partial_ratio(a, b)
 
 
+class CharCounts:
+    """Character counts for a list of strings, used to compute quick_ratio against all of them at once.
+
+    Every character is stored once in a flat array sorted by codepoint, so counting one character across
+    all strings is a slice and a bincount. Small collections also keep a dense strings by alphabet matrix,
+    which answers a whole query in one vectorized minimum.
+    """
+
+    __slots__ = ('size', 'lengths', 'codes', 'owners', 'alphabet', 'dense')
+
+    def __init__(self, strings):
+        self.size = len(strings)
+        self.lengths = np.fromiter(map(len, strings), dtype=np.int64, count=self.size)
+
+        codes = np.frombuffer(''.join(strings).encode('utf-32-le'), dtype=np.uint32)
+        owners = np.repeat(np.arange(self.size), self.lengths)
+        order = np.argsort(codes, kind='stable')
+
+        self.codes = codes[order]
+        self.owners = owners[order]
+
+        self.alphabet, columns = np.unique(self.codes, return_inverse=True)
+        if self.size * len(self.alphabet) <= DENSE_LIMIT:
+            width = len(self.alphabet)
+            cells = np.bincount(self.owners * width + columns, minlength=self.size * width)
+            self.dense = cells.reshape(self.size, width)
+        else:
+            self.dense = None
+
+    def matches(self, query):
+        """The number of characters each string shares with query, counting duplicates."""
+        counted = Counter(query)
+
+        if self.dense is not None:
+            codes = np.fromiter(map(ord, counted), dtype=np.uint32, count=len(counted))
+            columns = np.searchsorted(self.alphabet, codes)
+            found = (columns < len(self.alphabet))
+            found[found] = self.alphabet[columns[found]] == codes[found]
+
+            if not found.any():
+                return np.zeros(self.size, dtype=np.int64)
+
+            wanted = np.fromiter(counted.values(), dtype=np.int64, count=len(counted))[found]
+            return np.minimum(self.dense[:, columns[found]], wanted).sum(axis=1)
+
+        total = np.zeros(self.size, dtype=np.int64)
+
+        for char, count in counted.items():
+            code = ord(char)
+            lo, hi = np.searchsorted(self.codes, (code, code + 1))
+            if lo == hi:
+                continue
+
+            found = np.bincount(self.owners[lo:hi], minlength=self.size)
+            total += np.minimum(found, count)
+
+        return total
+
+
+def _quick_scores(matches, length, lengths):
+    total = lengths + length
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = np.where(total > 0, 2.0 * matches / total, 1.0)
+
+    # np.rint rounds half to even, the same as round().
+    return np.rint(100 * r).astype(np.int64)
+
+
+def _partial_bounds(matches, length, lengths):
+    # Any window of the longer string shares at most M characters with the shorter string, and a window
+    # sharing M characters is at least M long, which bounds its ratio at 2M / (len(short) + M).
+    short = np.minimum(lengths, length)
+    total = short + matches
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = np.where(total > 0, 2.0 * matches / total, 1.0)
+
+    return np.where(100 * r > 99, 100, np.rint(100 * r)).astype(np.int64)
+
+
+# scorer: (preprocessor, base scorer)
+_BATCHABLE = {
+    quick_ratio: (None, quick_ratio),
+    ratio: (None, ratio),
+    partial_ratio: (None, partial_ratio),
+    token_sort_ratio: (_sort_tokens, ratio),
+    quick_token_sort_ratio: (_sort_tokens, quick_ratio),
+    partial_token_sort_ratio: (_sort_tokens, partial_ratio),
+}
+
+
+def batch_extract(query, choices, *, scorer=quick_ratio, score_cutoff=0, limit=None, counts=None):
+    """Score query against a list of strings in one call.
+
+    Returns a list of (index, score) ordered by score, then index, exactly as scoring each choice with scorer
+    would. quick_ratio is computed for every choice at once, and doubles as an upper bound for ratio and
+    partial_ratio, so only choices which could still make the cut are scored exactly.
+    """
+    try:
+        prepare, base = _BATCHABLE[scorer]
+    except KeyError:
+        raise ValueError(f'{scorer.__name__} can not be batched.') from None
+
+    if limit is not None and limit <= 0:
+        return []
+
+    if prepare:
+        query = prepare(query)
+        choices = [prepare(c) for c in choices]
+
+    if counts is None:
+        counts = CharCounts(choices)
+
+    matches = counts.matches(query)
+
+    if base is quick_ratio:
+        scores = _quick_scores(matches, len(query), counts.lengths)
+        found = np.flatnonzero(scores >= score_cutoff)
+        found = found[np.argsort(-scores[found], kind='stable')][:limit]
+
+        return [(int(i), int(scores[i])) for i in found]
+
+    if base is ratio:
+        bounds = _quick_scores(matches, len(query), counts.lengths)
+    else:
+        bounds = _partial_bounds(matches, len(query), counts.lengths)
+
+    candidates = np.flatnonzero(bounds >= score_cutoff)
+    candidates = candidates[np.argsort(-bounds[candidates], kind='stable')]
+
+    best = []
+    for i, bound in zip(candidates.tolist(), bounds[candidates].tolist()):
+        if limit and len(best) == limit and bound < best[0][0]:
+            break
+
+        score = base(query, choices[i])
+        if score < score_cutoff:
+            continue
+
+        item = (score, -i)
+        if not limit:
+            best.append(item)
+        elif len(best) < limit:
+            heapq.heappush(best, item)
+        elif item > best[0]:
+            heapq.heapreplace(best, item)
+
+    return [(-i, score) for score, i in sorted(best, reverse=True)]
+
+
+def _batch_generator(query, choices, scorer=quick_ratio, score_cutoff=0, limit=None):
+    try:
+        keys = list(choices.keys())
+    except AttributeError:
+        keys = choices if isinstance(choices, list) else list(choices)
+
+        for i, score in batch_extract(query, keys, scorer=scorer, score_cutoff=score_cutoff, limit=limit):
+            yield (keys[i], score)
+    else:
+        values = list(choices.values())
+
+        for i, score in batch_extract(query, keys, scorer=scorer, score_cutoff=score_cutoff, limit=limit):
+            yield (keys[i], score, values[i])
+
+
+class ChoiceSet:
+    """A reusable collection of choices for extract, extract_one, extract_or_exact and extract_matches.
+
+    Token normalisation and character counts are computed once per collection and reused across queries.
+    Choices can be a list of strings or a mapping of string keys to values. Changes in length or identity
+    of the collection are picked up automatically; call invalidate() after changing a collection in place.
+    """
+
+    __slots__ = ('choices', '_signature', '_keys', '_values', '_tokens', '_counts')
+
+    def __init__(self, choices=()):
+        self.choices = choices
+        self._signature = None
+
+    def __repr__(self):
+        return f'<ChoiceSet choices: {len(self)}, mapping: {self.is_mapping}>'
+
+    def __len__(self):
+        return len(self.choices)
+
+    def __iter__(self):
+        return iter(self.keys)
+
+    @property
+    def is_mapping(self):
+        return hasattr(self.choices, 'items')
+
+    def update(self, choices):
+        self.choices = choices
+        self.invalidate()
+
+    def invalidate(self):
+        self._signature = None
+
+    def _check(self):
+        signature = (id(self.choices), len(self.choices))
+        if signature == self._signature:
+            return
+
+        if self.is_mapping:
+            self._keys = list(self.choices.keys())
+            self._values = list(self.choices.values())
+        else:
+            self._keys = list(self.choices)
+            self._values = None
+
+        self._tokens = None
+        self._counts = {}
+        self._signature = signature
+
+    @property
+    def keys(self):
+        self._check()
+        return self._keys
+
+    @property
+    def values(self):
+        self._check()
+        return self._values
+
+    @property
+    def tokens(self):
+        self._check()
+        if self._tokens is None:
+            self._tokens = [_sort_tokens(k) for k in self._keys]
+        return self._tokens
+
+    def strings(self, prepare):
+        return self.tokens if prepare else self.keys
+
+    def counts(self, prepare):
+        self._check()
+        try:
+            return self._counts[prepare]
+        except KeyError:
+            counts = self._counts[prepare] = CharCounts(self.strings(prepare))
+            return counts
+
+    def scored(self, query, scorer=quick_ratio, score_cutoff=0, limit=None):
+        """Return [(index, score)] ordered by score, then index."""
+        try:
+            prepare, base = _BATCHABLE[scorer]
+        except KeyError:
+            prepare, base = None, scorer
+
+        strings = self.strings(prepare)
+        if prepare:
+            query = prepare(query)
+
+        if base in _BATCHABLE and len(strings) >= BATCH_THRESHOLD:
+            return batch_extract(query, strings, scorer=base, score_cutoff=score_cutoff, limit=limit,
+                                 counts=self.counts(prepare))
+
+        it = ((i, score) for i, score in enumerate(base(query, s) for s in strings) if score >= score_cutoff)
+        if limit is not None:
+            return heapq.nlargest(limit, it, key=lambda t: t[1])
+        return sorted(it, key=lambda t: t[1], reverse=True)
+
+    def extract(self, query, scorer=quick_ratio, score_cutoff=0, limit=None):
+        keys, values = self.keys, self.values
+
+        for i, score in self.scored(query, scorer, score_cutoff, limit):
+            if values is None:
+                yield (keys[i], score)
+            else:
+                yield (keys[i], score, values[i])
+
+
+def _batchable(choices, scorer):
+    try:
+        return scorer in _BATCHABLE and len(choices) >= BATCH_THRESHOLD
+    except TypeError:
+        return False
+
+
 def _extraction_generator(query, choices, scorer=quick_ratio, score_cutoff=0):
     try:
         for key, value in choices.items():
@@ -102,6 +391,11 @@ def _extraction_generator(query, choices, scorer=quick_ratio, score_cutoff=0):
 
 
 def extract(query, choices, *, scorer=quick_ratio, score_cutoff=0, limit=10):
+    if isinstance(choices, ChoiceSet):
+        return list(choices.extract(query, scorer, score_cutoff, limit))
+    elif _batchable(choices, scorer):
+        return list(_batch_generator(query, choices, scorer, score_cutoff, limit))
+
     it = _extraction_generator(query, choices, scorer, score_cutoff)
     key = lambda t: t[1]
     if limit is not None:
@@ -110,6 +404,11 @@ def extract(query, choices, *, scorer=quick_ratio, score_cutoff=0, limit=10):
 
 
 def extract_one(query, choices, *, scorer=quick_ratio, score_cutoff=0):
+    if isinstance(choices, ChoiceSet):
+        return next(choices.extract(query, scorer, score_cutoff, 1), None)
+    elif _batchable(choices, scorer):
+        return next(_batch_generator(query, choices, scorer, score_cutoff, 1), None)
+
     it = _extraction_generator(query, choices, scorer, score_cutoff)
     key = lambda t: t[1]
     try:
@@ -160,26 +459,130 @@ def extract_matches(query, choices, *, scorer=quick_ratio, score_cutoff=0):
     return to_return
 
 
+def _fold(text):
+    folded = text.lower()
+    if len(folded) == len(text):
+        return folded
+
+    # Some characters lower to more than one, which would shift every position after them.
+    return ''.join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+
+def _drain(heap):
+    while heap:
+        yield heapq.heappop(heap)[-1]
+
+
+class FinderIndex:
+    """A subsequence matching index, returning results in the same order as finder.
+
+    Each key keeps a sorted position list per character, so a match is a handful of bisects rather than a
+    backtracking regex. Like the regex, a match starts at the first occurrence of the first character and
+    takes the earliest position of each following character; results are ordered by match length, start
+    and key. Character postings prune keys which can not match before any positions are looked at.
+    """
+
+    __slots__ = ('keys', 'items', 'positions', 'postings', 'prefixes')
+
+    def __init__(self, collection, *, key=None):
+        self.items = list(collection)
+        self.keys = [key(i) if key else i for i in self.items]
+
+        folded = [_fold(k) for k in self.keys]
+        self.prefixes = sorted((k, i) for i, k in enumerate(folded))
+        self.positions = []
+        self.postings = {}
+
+        for i, k in enumerate(folded):
+            positions = {}
+            for index, char in enumerate(k):
+                positions.setdefault(char, []).append(index)
+
+            self.positions.append(positions)
+            for char in positions:
+                self.postings.setdefault(char, set()).add(i)
+
+    def __repr__(self):
+        return f'<FinderIndex keys: {len(self.keys)}>'
+
+    def __len__(self):
+        return len(self.keys)
+
+    def span(self, i, text):
+        """Return (length, start) of the match of folded text in key i, or None."""
+        positions = self.positions[i]
+
+        try:
+            start = index = positions[text[0]][0]
+            for char in text[1:]:
+                found = positions[char]
+                index = found[bisect.bisect_right(found, index)]
+        except (KeyError, IndexError):
+            return None
+
+        return index - start + 1, start
+
+    def candidates(self, text):
+        try:
+            postings = sorted((self.postings[c] for c in set(text)), key=len)
+        except KeyError:
+            return set()
+
+        return postings[0].intersection(*postings[1:])
+
+    def search(self, text, *, limit=None, lazy=False):
+        """Return matching items best first.
+
+        With a limit only the top items are selected with a heap. With lazy=True a generator is returned which
+        pops results off a heap as they are consumed, so taking the first few never sorts the rest.
+        """
+        text = _fold(str(text))
+
+        if not text:
+            scored = [(self.keys[i], i) for i in range(len(self.keys))]
+        elif limit is not None:
+            # Keys starting with text have the best possible match, so enough of them ends the search early.
+            lo = bisect.bisect_left(self.prefixes, (text,))
+            hi = bisect.bisect_left(self.prefixes, (text + '\U0010ffff',))
+
+            if hi - lo >= limit:
+                scored = [(self.keys[i], i) for _, i in self.prefixes[lo:hi]]
+            else:
+                scored = [(*r, self.keys[i], i) for i in self.candidates(text) for r in (self.span(i, text),) if r]
+        else:
+            scored = [(*r, self.keys[i], i) for i in self.candidates(text) for r in (self.span(i, text),) if r]
+
+        if limit is not None:
+            scored = heapq.nsmallest(limit, scored)
+        elif lazy:
+            heapq.heapify(scored)
+            return (self.items[i] for i in _drain(scored))
+        else:
+            scored.sort()
+
+        results = [self.items[t[-1]] for t in scored]
+        return iter(results) if lazy else results
+
+
 def finder(text, collection, *, key=None, lazy=True):
+    if isinstance(collection, FinderIndex):
+        return collection.search(text, lazy=lazy)
+
     suggestions = []
     text = str(text)
     pat = '.*?'.join(map(re.escape, text))
     regex = re.compile(pat, flags=re.IGNORECASE)
-    for item in collection:
+    for index, item in enumerate(collection):
         to_search = key(item) if key else item
         r = regex.search(to_search)
         if r:
-            suggestions.append((len(r.group()), r.start(), item))
-
-    def sort_key(tup):
-        if key:
-            return tup[0], tup[1], key(tup[2])
-        return tup
+            suggestions.append((len(r.group()), r.start(), to_search, index, item))
 
     if lazy:
-        return (z for _, _, z in sorted(suggestions, key=sort_key))
-    else:
-        return [z for _, _, z in sorted(suggestions, key=sort_key)]
+        heapq.heapify(suggestions)
+        return _drain(suggestions)
+
+    return [z[-1] for z in sorted(suggestions)]
 
 
 def find(text, collection, *, key=None):
@@ -0,0 +1,343 @@
+"""The MIT License (MIT)
+
+Copyright (c) 2018 EvieePy
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+import asyncio
+import collections
+import itertools
+import random
+
+
+__all__ = ('IndexedDeque', 'IndexedQueue')
+
+
+class IndexedDeque:
+    """A sequence stored as a list of short blocks, with a Fenwick tree over the block lengths.
+
+    Appending and popping at either end are O(1), while indexing, inserting, deleting and moving anywhere are
+    O(log n) to find the block plus a shift within a block of at most 2 * load items. Blocks are split and merged
+    as they grow and shrink, and the tree is rebuilt lazily after the block layout changes.
+
+    When key is given, a count of each item's key is kept as items come and go, so contains_key is O(1).
+    Keys must not change while their item is stored.
+    """
+
+    __slots__ = ('load', 'key', '_keys', '_blocks', '_tree', '_length')
+
+    def __init__(self, iterable=(), *, load=256, key=None):
+        self.load = load
+        self.key = key
+        self._keys = collections.Counter()
+        self._blocks = []
+        self._tree = None
+        self._length = 0
+
+        self.extend(iterable)
+
+    def __repr__(self):
+        return f'<IndexedDeque entries: {self._length}, blocks: {len(self._blocks)}>'
+
+    def __len__(self):
+        return self._length
+
+    def __bool__(self):
+        return self._length > 0
+
+    def __iter__(self):
+        return itertools.chain.from_iterable(self._blocks)
+
+    def __reversed__(self):
+        for block in reversed(self._blocks):
+            yield from reversed(block)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step != 1:
+                return list(self)[index]
+            return self._slice(start, stop)
+
+        block, offset = self._locate(index)
+        return self._blocks[block][offset]
+
+    def __setitem__(self, index, value):
+        block, offset = self._locate(index)
+        self._forget(self._blocks[block][offset])
+        self._blocks[block][offset] = value
+        self._remember(value)
+
+    def __delitem__(self, index):
+        self.pop(index)
+
+    def _slice(self, start, stop):
+        if start >= stop:
+            return []
+
+        block, offset = self._locate(start)
+        result = []
+
+        while len(result) < stop - start:
+            chunk = self._blocks[block][offset:offset + stop - start - len(result)]
+            result.extend(chunk)
+            block += 1
+            offset = 0
+
+        return result
+
+    def _remember(self, item):
+        if self.key:
+            self._keys[self.key(item)] += 1
+
+    def _forget(self, item):
+        if self.key:
+            key = self.key(item)
+            self._keys[key] -= 1
+            if not self._keys[key]:
+                del self._keys[key]
+
+    def contains_key(self, key):
+        return key in self._keys
+
+    def _build(self):
+        tree = [0] * (len(self._blocks) + 1)
+
+        for index, block in enumerate(self._blocks, 1):
+            tree[index] += len(block)
+            parent = index + (index & -index)
+            if parent < len(tree):
+                tree[parent] += tree[index]
+
+        self._tree = tree
+
+    def _update(self, block, delta):
+        tree = self._tree
+        if tree is None:
+            return
+
+        index = block + 1
+        while index < len(tree):
+            tree[index] += delta
+            index += index & -index
+
+    def _locate(self, index):
+        """Return (block, offset) for a position, walking the Fenwick tree."""
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('IndexedDeque index out of range')
+
+        # The ends are the common case, and need no tree at all.
+        if index < len(self._blocks[0]):
+            return 0, index
+        last = len(self._blocks) - 1
+        if index >= self._length - len(self._blocks[last]):
+            return last, index - (self._length - len(self._blocks[last]))
+
+        if self._tree is None:
+            self._build()
+
+        tree = self._tree
+        position = 0
+        step = 1 << (len(tree) - 1).bit_length()
+
+        while step:
+            upper = position + step
+            if upper < len(tree) and tree[upper] <= index:
+                position = upper
+                index -= tree[upper]
+            step >>= 1
+
+        return position, index
+
+    def _split(self, block):
+        items = self._blocks[block]
+        half = len(items) // 2
+
+        self._blocks[block:block + 1] = [items[:half], items[half:]]
+        self._tree = None
+
+    def _shrink(self, block):
+        items = self._blocks[block]
+
+        if not items:
+            del self._blocks[block]
+            self._tree = None
+        elif len(items) < self.load // 4 and len(self._blocks) > 1:
+            # Merge into a neighbour, splitting again if that makes it too large.
+            neighbour = block - 1 if block else block + 1
+            first, second = sorted((block, neighbour))
+
+            self._blocks[first:second + 1] = [self._blocks[first] + self._blocks[second]]
+            self._tree = None
+
+            if len(self._blocks[first]) > self.load * 2:
+                self._split(first)
+
+    def append(self, item):
+        if not self._blocks or len(self._blocks[-1]) >= self.load:
+            self._blocks.append([])
+            self._tree = None
+
+        self._blocks[-1].append(item)
+        self._update(len(self._blocks) - 1, 1)
+        self._length += 1
+        self._remember(item)
+
+    def appendleft(self, item):
+        if not self._blocks or len(self._blocks[0]) >= self.load:
+            self._blocks.insert(0, [])
+            self._tree = None
+
+        self._blocks[0].insert(0, item)
+        self._update(0, 1)
+        self._length += 1
+        self._remember(item)
+
+    def extend(self, iterable):
+        for item in iterable:
+            self.append(item)
+
+    def insert(self, index, item):
+        if index < 0:
+            index = max(0, index + self._length)
+
+        if index >= self._length:
+            return self.append(item)
+        elif index == 0:
+            return self.appendleft(item)
+
+        block, offset = self._locate(index)
+        self._blocks[block].insert(offset, item)
+        self._update(block, 1)
+        self._length += 1
+        self._remember(item)
+
+        if len(self._blocks[block]) > self.load * 2:
+            self._split(block)
+
+    def pop(self, index=-1):
+        block, offset = self._locate(index)
+        item = self._blocks[block].pop(offset)
+        self._update(block, -1)
+        self._length -= 1
+        self._forget(item)
+
+        self._shrink(block)
+        return item
+
+    def popleft(self):
+        if not self._length:
+            raise IndexError('pop from an empty IndexedDeque')
+        return self.pop(0)
+
+    def move(self, source, destination):
+        """Move the item at source so it ends up at destination, returning it."""
+        item = self.pop(source)
+        self.insert(destination, item)
+        return item
+
+    def index(self, item):
+        for index, value in enumerate(self):
+            if value is item or value == item:
+                return index
+        raise ValueError(f'{item!r} is not in IndexedDeque')
+
+    def remove(self, item):
+        del self[self.index(item)]
+
+    def shuffle(self, rng=random):
+        """Shuffle in place with one Fisher-Yates pass over the item references; items themselves are not copied."""
+        items = list(self)
+        rng.shuffle(items)
+        self._rebuild(items, keys=False)
+
+    def clear(self):
+        self._rebuild(())
+
+    def _rebuild(self, items, *, keys=True):
+        items = list(items)
+        self._blocks = [items[i:i + self.load] for i in range(0, len(items), self.load)]
+        self._tree = None
+        self._length = len(items)
+
+        if keys and self.key:
+            self._keys = collections.Counter(map(self.key, items))
+
+
+class IndexedQueue(IndexedDeque):
+    """An IndexedDeque with an awaitable get, which waits for an item to be added."""
+
+    __slots__ = ('loop', '_getters')
+
+    def __init__(self, iterable=(), *, load=256, key=None, loop=None):
+        self.loop = loop or asyncio.get_event_loop()
+        self._getters = collections.deque()
+
+        super().__init__(iterable, load=load, key=key)
+
+    def __repr__(self):
+        return f'<IndexedQueue entries: {len(self)}, waiting: {len(self._getters)}>'
+
+    def _wakeup(self):
+        while self._getters:
+            waiter = self._getters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                break
+
+    def append(self, item):
+        super().append(item)
+        self._wakeup()
+
+    def appendleft(self, item):
+        super().appendleft(item)
+        self._wakeup()
+
+    def insert(self, index, item):
+        super().insert(index, item)
+        self._wakeup()
+
+    def _rebuild(self, items, *, keys=True):
+        super()._rebuild(items, keys=keys)
+        if self:
+            self._wakeup()
+
+    async def get(self):
+        """Remove and return the first item, waiting until one is available."""
+        while not self:
+            waiter = self.loop.create_future()
+            self._getters.append(waiter)
+
+            try:
+                await waiter
+            except BaseException:
+                waiter.cancel()
+                try:
+                    self._getters.remove(waiter)
+                except ValueError:
+                    pass
+
+                # We may have been woken just before being cancelled, so pass the wake up along.
+                if self and not waiter.cancelled():
+                    self._wakeup()
+                raise
+
+        return self.popleft()
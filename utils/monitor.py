@@ -0,0 +1,196 @@
+"""The MIT License (MIT)
+
+Copyright (c) 2018 EvieePy
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+import asyncio
+import bisect
+import datetime
+import inspect
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+
+__all__ = ('LoopMonitor', 'SlowCallback')
+
+
+class SlowCallback:
+
+    __slots__ = ('started', 'duration', 'coroutine', 'stack')
+
+    def __init__(self, started, coroutine, stack):
+        self.started = started
+        self.duration = None
+        self.coroutine = coroutine
+        self.stack = stack
+
+    def __str__(self):
+        duration = 'still blocking' if self.duration is None else f'{self.duration:.2f}ms'
+        return f'{self.coroutine} ({duration})'
+
+
+class LoopMonitor:
+    """Event loop lag sampler and slow callback detector.
+
+    A sampler task sleeps for a fixed interval and records how late it woke up into a histogram.
+    Each wake up also beats a heartbeat, which a watchdog thread checks. When the heartbeat goes stale for
+    longer than the threshold, the loop is blocked and the watchdog records the stack of the loop thread.
+
+    This works regardless of loop implementation, since nothing in the loop itself is patched.
+    """
+
+    BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+    __slots__ = ('loop', 'interval', 'threshold', 'histogram', 'samples', 'slow', 'total', 'stalls',
+                 '_heartbeat', '_thread_id', '_current', '_task', '_watchdog', '_closed', '_created')
+
+    def __init__(self, loop=None, *, interval=0.25, threshold=0.1, limit=25):
+        self.loop = loop or asyncio.get_event_loop()
+        self.interval = interval
+        self.threshold = threshold
+
+        self.histogram = [0] * (len(self.BUCKETS) + 1)
+        self.samples = deque(maxlen=240)
+        self.slow = deque(maxlen=limit)
+        self.total = 0
+        self.stalls = 0
+
+        self._heartbeat = time.perf_counter()
+        self._thread_id = None
+        self._current = None
+        self._task = None
+        self._watchdog = None
+        self._closed = threading.Event()
+        self._created = datetime.datetime.utcnow()
+
+    def __repr__(self):
+        return f'<LoopMonitor samples: {self.total}, stalls: {self.stalls}, created: {self._created}>'
+
+    def start(self):
+        if self._task:
+            return
+
+        self._closed.clear()
+        # A beat left over from construction or a previous run would read as a stall straight away.
+        self._heartbeat = time.perf_counter()
+        self._task = self.loop.create_task(self.sampler())
+
+        self._watchdog = threading.Thread(target=self.watchdog, name='LoopMonitor', daemon=True)
+        self._watchdog.start()
+
+    def stop(self):
+        self._closed.set()
+
+        try:
+            self._task.cancel()
+        except AttributeError:
+            pass
+
+        self._task = None
+        self._watchdog = None
+
+    def reset(self):
+        self.histogram = [0] * (len(self.BUCKETS) + 1)
+        self.samples.clear()
+        self.slow.clear()
+        self.total = 0
+        self.stalls = 0
+
+    def record(self, lag):
+        """Record a lag sample in milliseconds."""
+        self.histogram[bisect.bisect_left(self.BUCKETS, lag)] += 1
+        self.samples.append(lag)
+        self.total += 1
+
+    async def sampler(self):
+        self._thread_id = threading.get_ident()
+
+        while not self._closed.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+
+            now = time.perf_counter()
+            self._heartbeat = now
+            lag = max(0.0, (now - started - self.interval) * 1000)
+
+            current = self._current
+            if current is not None:
+                current.duration = lag
+                self._current = None
+
+            self.record(lag)
+
+    def watchdog(self):
+        check = self.threshold / 2
+
+        while not self._closed.wait(check):
+            beat = self._heartbeat
+            stale = time.perf_counter() - beat - self.interval
+
+            if stale < self.threshold or self._current is not None:
+                continue
+
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+
+            # Re-check, the loop may have woken up while we grabbed the frame.
+            if beat != self._heartbeat:
+                continue
+
+            self._current = SlowCallback(datetime.datetime.utcnow(), self.get_coroutine(frame),
+                                         ''.join(traceback.format_stack(frame)))
+            self.slow.append(self._current)
+            self.stalls += 1
+
+    @staticmethod
+    def get_coroutine(frame):
+        """Walk the frame chain and return the outermost coroutine, which will be the blocking task."""
+        name = None
+
+        while frame is not None:
+            code = frame.f_code
+            if code.co_flags & inspect.CO_COROUTINE:
+                name = getattr(code, 'co_qualname', code.co_name)
+            frame = frame.f_back
+
+        return name or '<callback>'
+
+    def percentile(self, value):
+        if not self.samples:
+            return 0.0
+
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * value / 100))]
+
+    def format_histogram(self, width=20):
+        peak = max(self.histogram) or 1
+        lines = []
+
+        lower = 0
+        for bound, count in zip((*self.BUCKETS, None), self.histogram):
+            label = f'{lower}-{bound}ms' if bound else f'{lower}ms+'
+            lines.append(f'{label:>12} | {"#" * round(width * count / peak):<{width}} {count}')
+            lower = bound
+
+        return '\n'.join(lines)
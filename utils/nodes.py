@@ -0,0 +1,511 @@
+"""The MIT License (MIT)
+
+Copyright (c) 2018 EvieePy
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+import asyncio
+import json
+import traceback
+
+import aiohttp
+import lavalink
+from discord.backoff import ExponentialBackoff
+
+
+__all__ = ('NodePool', 'NodeStats', 'ClientNode', 'RemoteNode')
+
+
+class NodeStats:
+    """Load reported by a Lavalink node, and the penalty players are placed by. Lower is better."""
+
+    __slots__ = ('players', 'playing', 'cores', 'system_load', 'lavalink_load', 'frames_sent', 'frames_nulled',
+                 'frames_deficit')
+
+    def __init__(self, players=0, playing=0, cores=1, system_load=0.0, lavalink_load=0.0, frames_sent=-1,
+                 frames_nulled=-1, frames_deficit=-1):
+        self.players = players
+        self.playing = playing
+        self.cores = cores
+        self.system_load = system_load
+        self.lavalink_load = lavalink_load
+        self.frames_sent = frames_sent
+        self.frames_nulled = frames_nulled
+        self.frames_deficit = frames_deficit
+
+    @classmethod
+    def from_payload(cls, data):
+        cpu = data.get('cpu', {})
+        frames = data.get('frameStats') or {}
+
+        return cls(data.get('players', 0), data.get('playingPlayers', 0), cpu.get('cores', 1),
+                   cpu.get('systemLoad', 0.0), cpu.get('lavalinkLoad', 0.0), frames.get('sent', -1),
+                   frames.get('nulled', -1), frames.get('deficit', -1))
+
+    @classmethod
+    def from_client(cls, stats):
+        """Read the stats lavalink.Client keeps for its own node."""
+        get = lambda *names, default: next((getattr(stats, n) for n in names if hasattr(stats, n)), default)
+
+        return cls(get('players', default=0), get('playing_players', default=0), get('cpu_cores', default=1),
+                   get('system_load', default=0.0), get('lavalink_load', default=0.0),
+                   get('frames_sent', default=-1), get('frames_nulled', default=-1), get('frames_deficit', default=-1))
+
+    @property
+    def penalty(self):
+        # The usual Lavalink load balancing weights: playing players count once each, CPU load and dropped or
+        # late frames grow exponentially, so a struggling node is avoided long before it is full.
+        penalty = self.playing + 1.05 ** (100 * self.system_load) * 10 - 10
+
+        if self.frames_nulled != -1:
+            penalty += ((1.03 ** (500 * (self.frames_nulled / 3000))) * 300 - 300) * 2
+        if self.frames_deficit != -1:
+            penalty += (1.03 ** (500 * (self.frames_deficit / 3000))) * 600 - 600
+
+        return penalty
+
+
+class PlayerState:
+    """What a node needs to be told to take over a guild's player."""
+
+    __slots__ = ('guild_id', 'node', 'voice', 'track', 'playing', 'paused', 'volume', 'position', 'updated')
+
+    def __init__(self, guild_id, node):
+        self.guild_id = guild_id
+        self.node = node
+        self.voice = None
+        self.track = None
+        self.playing = False
+        self.paused = False
+        self.volume = None
+        self.position = 0
+        self.updated = 0.0
+
+    def estimate(self, now):
+        """Position in milliseconds, counting time played since the node last reported it."""
+        if not self.playing or self.paused:
+            return self.position
+        return self.position + (now - self.updated) * 1000
+
+    def record(self, data, now):
+        op = data.get('op')
+
+        if op == 'voiceUpdate':
+            self.voice = data
+        elif op == 'play':
+            self.track = data['track']
+            self.playing = True
+            self.paused = False
+            self.position = data.get('startTime', 0)
+            self.updated = now
+        elif op == 'pause':
+            self.position = self.estimate(now)
+            self.updated = now
+            self.paused = data.get('pause', False)
+        elif op == 'seek':
+            self.position = data.get('position', 0)
+            self.updated = now
+        elif op == 'stop':
+            self.playing = False
+        elif op == 'volume':
+            self.volume = data.get('volume')
+
+
+class Node:
+
+    def __init__(self, pool, name):
+        self.pool = pool
+        self.name = name
+        self.guilds = set()
+
+    def __repr__(self):
+        return f'<{type(self).__name__} {self.name} connected: {self.connected}, guilds: {len(self.guilds)}>'
+
+    @property
+    def connected(self):
+        raise NotImplementedError
+
+    @property
+    def stats(self):
+        raise NotImplementedError
+
+    @property
+    def penalty(self):
+        return self.stats.penalty
+
+    async def send(self, **data):
+        raise NotImplementedError
+
+    async def get_tracks(self, query):
+        raise NotImplementedError
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+class ClientNode(Node):
+    """The node lavalink.Client itself is connected to. Its events keep flowing through lavalink as they always have."""
+
+    def __init__(self, pool, name, client, ws):
+        super().__init__(pool, name)
+        self.client = client
+        self.ws = ws
+
+    @property
+    def connected(self):
+        inner = getattr(self.ws, '_ws', None)
+        if inner is None:
+            return False
+        return getattr(inner, 'open', not getattr(inner, 'closed', True))
+
+    @property
+    def stats(self):
+        return NodeStats.from_client(getattr(self.client, 'stats', None))
+
+    async def send(self, **data):
+        await self.ws.send(**data)
+
+    async def get_tracks(self, query):
+        return await self.client.get_tracks(query)
+
+
+class RemoteNode(Node):
+    """An additional node we hold our own websocket to, translating its events for lavalink.Client."""
+
+    def __init__(self, pool, name, host, *, password, rest_port=2333, ws_port=80):
+        super().__init__(pool, name)
+        self.host = host
+        self.password = password
+        self.rest_uri = f'http://{host}:{rest_port}/loadtracks'
+        self.ws_uri = f'ws://{host}:{ws_port}'
+
+        self._stats = NodeStats()
+        self._ws = None
+        self._task = None
+
+    @property
+    def connected(self):
+        return self._ws is not None and not self._ws.closed
+
+    @property
+    def stats(self):
+        return self._stats
+
+    async def start(self):
+        if self._task is None:
+            self._task = self.pool.loop.create_task(self.run())
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        if self._ws:
+            await self._ws.close()
+
+    async def run(self):
+        await self.pool.ready()
+        backoff = ExponentialBackoff()
+
+        while True:
+            headers = {'Authorization': self.password, 'Num-Shards': str(self.pool.shards),
+                       'User-Id': str(self.pool.user_id)}
+
+            try:
+                self._ws = await self.pool.session.ws_connect(self.ws_uri, headers=headers, heartbeat=60)
+            except (aiohttp.ClientError, OSError, asyncio.TimeoutError):
+                await asyncio.sleep(backoff.delay())
+                continue
+
+            backoff = ExponentialBackoff()
+            await self.pool.node_connected(self)
+
+            async for message in self._ws:
+                if message.type != aiohttp.WSMsgType.TEXT:
+                    continue
+
+                data = json.loads(message.data)
+                if data.get('op') == 'stats':
+                    self._stats = NodeStats.from_payload(data)
+                else:
+                    await self.pool.dispatch(self, data)
+
+            self._ws = None
+            await self.pool.node_lost(self)
+
+    async def send(self, **data):
+        if not self.connected:
+            raise ConnectionError(f'Lavalink node {self.name} is not connected.')
+        await self._ws.send_json(data)
+
+    async def get_tracks(self, query):
+        async with self.pool.session.get(self.rest_uri, params={'identifier': query},
+                                         headers={'Authorization': self.password}) as resp:
+            return await resp.json(content_type=None)
+
+
+class NodePool:
+    """Places guild players across several Lavalink nodes by load, and moves them when a node fails or struggles.
+
+    The pool stands in for lavalink.Client's websocket, so every op the client or a player sends is routed to the
+    node holding that guild. A guild is placed on the node with the lowest penalty the first time it sends an op.
+    The last voice update, track, position, pause state and volume of each guild are remembered, so a player can
+    be replayed on another node from where it was.
+    """
+
+    def __init__(self, bot, client, *, interval=10, overload=500, batch=5):
+        self.bot = bot
+        self.client = client
+        self.loop = bot.loop
+        self.interval = interval
+        self.overload = overload
+        self.batch = batch
+
+        self.session = None
+        self.nodes = {}
+        self.players = {}
+        self.migrations = 0
+        self._handle = None
+
+        # Take over the client's websocket and event dispatch, keeping the originals for its own node.
+        self.primary = ClientNode(self, 'primary', client, client.ws)
+        self.nodes[self.primary.name] = self.primary
+        self._dispatch_event = client.dispatch_event
+
+        client.ws = self
+        client.dispatch_event = self.dispatch_event
+
+    def __repr__(self):
+        return f'<NodePool nodes: {len(self.nodes)}, players: {len(self.players)}, migrations: {self.migrations}>'
+
+    @property
+    def shards(self):
+        return self.bot.shard_count or 1
+
+    @property
+    def user_id(self):
+        return self.bot.user.id
+
+    async def ready(self):
+        await self.bot.wait_until_ready()
+
+    def add_node(self, name, host, *, password, rest_port=2333, ws_port=80):
+        if name in self.nodes:
+            raise ValueError(f'A Lavalink node named {name} already exists.')
+
+        node = RemoteNode(self, name, host, password=password, rest_port=rest_port, ws_port=ws_port)
+        self.nodes[name] = node
+
+        if self.session:
+            self.loop.create_task(node.start())
+        return node
+
+    async def start(self, session):
+        self.session = session
+
+        for node in self.nodes.values():
+            await node.start()
+
+        if self._handle is None:
+            self._handle = self.bot.timers.every(self.interval, self.rebalance)
+
+    async def close(self):
+        if self._handle:
+            self._handle.cancel()
+            self._handle = None
+
+        for node in self.nodes.values():
+            await node.close()
+
+    def best(self, *, exclude=None):
+        """The connected node with the lowest penalty, falling back to the client's own node."""
+        nodes = [n for n in self.nodes.values() if n is not exclude and n.connected]
+        if not nodes:
+            return self.primary if exclude is not self.primary else None
+
+        return min(nodes, key=lambda n: n.penalty)
+
+    def place(self, guild_id, node):
+        state = self.players.get(guild_id)
+
+        if state is None:
+            state = self.players[guild_id] = PlayerState(guild_id, node)
+        else:
+            state.node.guilds.discard(guild_id)
+            state.node = node
+
+        node.guilds.add(guild_id)
+        return state
+
+    async def send(self, **data):
+        guild_id = data.get('guildId')
+        if guild_id is None:
+            return await self.primary.send(**data)
+
+        state = self.players.get(guild_id)
+        if state is None:
+            state = self.place(guild_id, self.best())
+        elif not state.node.connected and state.node is not self.primary:
+            await self.migrate(state)
+
+        state.record(data, self.loop.time())
+
+        if data.get('op') == 'destroy':
+            state.node.guilds.discard(guild_id)
+            del self.players[guild_id]
+
+        await state.node.send(**data)
+
+    async def forget(self, guild_id):
+        """Drop a guild once its player is gone, destroying it on a remote node lavalink.Client does not know of."""
+        state = self.players.pop(str(guild_id), None)
+        if state is None:
+            return
+
+        state.node.guilds.discard(state.guild_id)
+        if state.node is not self.primary and state.node.connected:
+            try:
+                await state.node.send(op='destroy', guildId=state.guild_id)
+            except ConnectionError:
+                pass
+
+    async def get_tracks(self, query):
+        """Search on the least loaded node, so searches are spread along with players."""
+        node = self.best() or self.primary
+
+        try:
+            return await node.get_tracks(query)
+        except (aiohttp.ClientError, OSError, asyncio.TimeoutError, ValueError):
+            if node is self.primary:
+                raise
+            return await self.primary.get_tracks(query)
+
+    async def dispatch_event(self, event):
+        """Events lavalink.Client raises from its own node. Track events for players we moved elsewhere are stale."""
+        if isinstance(event, (lavalink.TrackEndEvent, lavalink.TrackExceptionEvent, lavalink.TrackStuckEvent)):
+            state = self.players.get(str(getattr(event.player, 'guild_id', '')))
+            if state is not None and state.node is not self.primary:
+                return
+
+        await self._dispatch_event(event)
+
+    async def dispatch(self, node, data):
+        """Messages from a remote node, translated into what lavalink.Client would do for its own node."""
+        guild_id = data.get('guildId')
+        state = self.players.get(guild_id)
+
+        if state is None or state.node is not node:
+            return
+
+        player = self.client.players.get(int(guild_id))
+        op = data.get('op')
+
+        if op == 'playerUpdate':
+            state.position = data.get('state', {}).get('position', state.position)
+            state.updated = self.loop.time()
+
+            if player:
+                player.position = state.position
+        elif op == 'event':
+            kind = data.get('type')
+
+            if kind == 'TrackEndEvent':
+                state.playing = False
+                event = lavalink.TrackEndEvent(player, data.get('track'), data.get('reason'))
+            elif kind == 'TrackExceptionEvent':
+                event = lavalink.TrackExceptionEvent(player, data.get('track'), data.get('error'))
+            elif kind == 'TrackStuckEvent':
+                event = lavalink.TrackStuckEvent(player, data.get('track'), data.get('thresholdMs'))
+            else:
+                return
+
+            await self._dispatch_event(event)
+
+    async def migrate(self, state, node=None):
+        """Move a guild's player to another node, resuming its track where it was."""
+        old = state.node
+        node = node or self.best(exclude=old)
+
+        if node is None or node is old:
+            return False
+
+        now = self.loop.time()
+        position = state.estimate(now)
+        self.place(state.guild_id, node)
+
+        if old.connected:
+            try:
+                await old.send(op='destroy', guildId=state.guild_id)
+            except Exception:
+                pass
+
+        try:
+            if state.voice:
+                await node.send(**state.voice)
+            if state.track and state.playing:
+                await node.send(op='play', guildId=state.guild_id, track=state.track, startTime=int(position))
+                if state.paused:
+                    await node.send(op='pause', guildId=state.guild_id, pause=True)
+            if state.volume is not None:
+                await node.send(op='volume', guildId=state.guild_id, volume=state.volume)
+        except Exception:
+            traceback.print_exc()
+            return False
+
+        state.position = position
+        state.updated = now
+        self.migrations += 1
+
+        return True
+
+    async def node_connected(self, node):
+        print(f'Lavalink Node: {node.name} connected.')
+
+    async def node_lost(self, node):
+        print(f'Lavalink Node: {node.name} disconnected, moving {len(node.guilds)} players.')
+        await self.evacuate(node)
+
+    async def evacuate(self, node, limit=None):
+        moved = 0
+
+        for guild_id in list(node.guilds)[:limit]:
+            state = self.players.get(guild_id)
+            if state is not None and await self.migrate(state):
+                moved += 1
+        return moved
+
+    async def rebalance(self):
+        """Move players off nodes that have gone away or are overloaded, a batch at a time."""
+        for node in list(self.nodes.values()):
+            if not node.guilds:
+                continue
+
+            if not node.connected:
+                await self.evacuate(node)
+                continue
+
+            best = self.best(exclude=node)
+            if best is None:
+                continue
+
+            # Only move when the difference is large, so players do not bounce between similar nodes.
+            if node.penalty > self.overload and best.penalty * 2 < node.penalty:
+                await self.evacuate(node, self.batch)
@@ -24,6 +24,7 @@ import discord
 
 import asyncio
 import inspect
+import math
 from typing import Union
 
 import utils
@@ -34,6 +35,140 @@ async def pager(entries, chunk: int):
         yield entries[x:x + chunk]
 
 
+class PageSource:
+    """Base class for paginator page sources.
+
+    Sources render a page only when get_page is called for it, so showing the first page never depends on how
+    many results exist. page_count may be None while the number of pages is unknown, in which case
+    get_page_count should work it out. get_page raises IndexError past the last page.
+    """
+
+    page_count = None
+
+    async def get_page(self, index):
+        raise NotImplementedError
+
+    async def get_page_count(self):
+        return self.page_count
+
+    async def close(self):
+        pass
+
+
+class ListPageSource(PageSource):
+    """A page source over a sequence, rendering per_page entries at a time with formatter(entries, index)."""
+
+    __slots__ = ('entries', 'per_page', 'formatter', 'page_count')
+
+    def __init__(self, entries, *, per_page=10, formatter=None):
+        self.entries = entries
+        self.per_page = per_page
+        self.formatter = formatter or (lambda entries, index: entries)
+        self.page_count = math.ceil(len(entries) / per_page)
+
+    async def get_page(self, index):
+        if not 0 <= index < self.page_count:
+            raise IndexError(index)
+
+        start = index * self.per_page
+        return self.formatter(self.entries[start:start + self.per_page], index)
+
+
+class AsyncIteratorPageSource(PageSource):
+    """A page source over an iterator or async iterator, such as a generator or a database cursor.
+
+    Entries are only pulled from the iterator as far as the requested page. Pulled entries are kept so earlier
+    pages can be shown again.
+    """
+
+    __slots__ = ('iterator', 'per_page', 'formatter', 'entries', 'page_count', 'exhausted')
+
+    def __init__(self, iterator, *, per_page=10, formatter=None):
+        self.iterator = iterator
+        self.per_page = per_page
+        self.formatter = formatter or (lambda entries, index: entries)
+        self.entries = []
+        self.page_count = None
+        self.exhausted = False
+
+    async def _next(self):
+        try:
+            return await self.iterator.__anext__()
+        except AttributeError:
+            try:
+                return next(self.iterator)
+            except StopIteration:
+                raise StopAsyncIteration from None
+
+    async def fill(self, size):
+        while not self.exhausted and len(self.entries) < size:
+            try:
+                self.entries.append(await self._next())
+            except StopAsyncIteration:
+                self.exhausted = True
+                self.page_count = math.ceil(len(self.entries) / self.per_page)
+
+    async def get_page(self, index):
+        start = index * self.per_page
+        await self.fill(start + self.per_page)
+
+        if index < 0 or start >= len(self.entries):
+            raise IndexError(index)
+
+        return self.formatter(self.entries[start:start + self.per_page], index)
+
+    async def get_page_count(self):
+        await self.fill(float('inf'))
+        return self.page_count
+
+
+class KeysetPageSource(AsyncIteratorPageSource):
+    """A page source reading rows in key order, fetching only the rows a page needs per round trip.
+
+    Each fetch is a short keyset query continuing after the last key seen, so no connection or transaction is held
+    while a paginator sits open. query must select key and end in its WHERE clause. Passing count up front gives
+    the paginator its page count without reading every row.
+    """
+
+    __slots__ = ('pool', 'query', 'args', 'key', 'last')
+
+    # Rows fetched per round trip when reading to the end, such as for the last page.
+    CHUNK = 500
+
+    def __init__(self, pool, query, *args, key, per_page=10, formatter=None, count=None):
+        super().__init__(None, per_page=per_page, formatter=formatter)
+        self.pool = pool
+        self.query = query
+        self.args = args
+        self.key = key
+        self.last = None
+
+        if count is not None:
+            self.page_count = math.ceil(count / per_page)
+
+    async def _fetch(self, limit):
+        index = len(self.args)
+
+        if self.last is None:
+            return await self.pool.fetch(f'{self.query} ORDER BY {self.key} LIMIT ${index + 1}', *self.args, limit)
+
+        return await self.pool.fetch(f'{self.query} AND {self.key} > ${index + 1} ORDER BY {self.key} '
+                                     f'LIMIT ${index + 2}', *self.args, self.last, limit)
+
+    async def fill(self, size):
+        while not self.exhausted and len(self.entries) < size:
+            wanted = self.CHUNK if size == float('inf') else size - len(self.entries)
+            rows = await self._fetch(wanted)
+
+            self.entries.extend(rows)
+            if rows:
+                self.last = rows[-1][self.key]
+
+            if len(rows) < wanted:
+                self.exhausted = True
+                self.page_count = math.ceil(len(self.entries) / self.per_page)
+
+
 class Paginator:
 
 
@@ -116,13 +251,15 @@ class Paginator:
 
 class SimplePaginator:
 
-    __slots__ = ('entries', 'extras', 'title', 'description', 'colour', 'footer', 'length', 'prepend', 'append',
-                 'fmt', 'timeout', 'ordered', 'controls', 'controller', 'pages', 'current', 'previous', 'eof', 'base',
-                 'names')
+    __slots__ = ('entries', 'extras', 'source', 'cache', 'title', 'description', 'colour', 'footer', 'length',
+                 'prepend', 'append', 'fmt', 'timeout', 'ordered', 'controls', 'controller', 'pages', 'current',
+                 'previous', 'eof', 'base', 'names')
 
     def __init__(self, **kwargs):
         self.entries = kwargs.get('entries', None)
         self.extras = kwargs.get('extras', None)
+        self.source = kwargs.get('source', None)
+        self.cache = utils.EvieeLRU(name='Pages', limit=kwargs.get('cache', 5))
 
         self.title = kwargs.get('title', None)
         self.description = kwargs.get('description', None)
@@ -152,6 +289,9 @@ class SimplePaginator:
         if ctrl == 'stop':
             ctx.bot.loop.create_task(self.stop_controller(self.base))
 
+        elif ctrl == 'end':
+            await self.set_eof()
+            self.current = int(self.eof)
         elif isinstance(ctrl, int):
             self.current += ctrl
             if self.current > self.eof or self.current < 0:
@@ -159,53 +299,93 @@ class SimplePaginator:
         else:
             self.current = int(ctrl)
 
-    async def reaction_controller(self, ctx):
-        bot = ctx.bot
-        author = ctx.author
+    async def set_eof(self):
+        count = len(self.pages)
 
-        self.base = await ctx.send(embed=self.pages[0])
+        if self.source:
+            pages = await self.source.get_page_count()
+            if pages is None:
+                self.eof = float('inf')
+                self.controls['⏭'] = 'end'
+                return
+            count += pages
 
-        if len(self.pages) == 1:
-            await self.base.add_reaction('⏹')
-        else:
-            for reaction in self.controls:
-                try:
-                    await self.base.add_reaction(reaction)
-                except discord.HTTPException:
-                    return
-
-        def check(r, u):
-            if str(r) not in self.controls.keys():
-                return False
-            elif u.id == bot.user.id or r.message.id != self.base.id:
-                return False
-            elif u.id != author.id:
-                return False
-            return True
+        self.eof = float(count - 1)
+        self.controls['⏭'] = self.eof
 
-        while True:
-            try:
-                react, user = await bot.wait_for('reaction_add', check=check, timeout=self.timeout)
-            except asyncio.TimeoutError:
-                return ctx.bot.loop.create_task(self.stop_controller(self.base))
+    async def get_page(self, index):
+        """Return the page at index, rendering it from the source if it is not one of our built pages."""
+        if index < len(self.pages) or not self.source:
+            return self.pages[index]
 
-            control = self.controls.get(str(react))
+        try:
+            return self.cache[index]
+        except KeyError:
+            pass
 
-            try:
-                await self.base.remove_reaction(react, user)
-            except discord.HTTPException:
-                pass
+        page = self.cache[index] = await self.source.get_page(index - len(self.pages))
+        return page
 
-            self.previous = self.current
-            await self.indexer(ctx, control)
+    async def reaction_controller(self, ctx):
+        bot = ctx.bot
+        author = ctx.author
 
-            if self.previous == self.current:
-                continue
+        try:
+            self.base = await ctx.send(embed=await self.get_page(0))
 
-            try:
-                await self.base.edit(embed=self.pages[self.current])
-            except KeyError:
-                pass
+            if self.eof == 0:
+                await self.base.add_reaction('⏹')
+            else:
+                for reaction in self.controls:
+                    try:
+                        await self.base.add_reaction(reaction)
+                    except discord.HTTPException:
+                        return
+
+            def check(r, u):
+                if str(r) not in self.controls.keys():
+                    return False
+                elif u.id == bot.user.id or r.message.id != self.base.id:
+                    return False
+                elif u.id != author.id:
+                    return False
+                return True
+
+            with bot.reactions.listen(self.base, check=check) as session:
+                while True:
+                    try:
+                        react, user = await session.wait(timeout=self.timeout)
+                    except asyncio.TimeoutError:
+                        return ctx.bot.loop.create_task(self.stop_controller(self.base))
+
+                    control = self.controls.get(str(react))
+
+                    try:
+                        await self.base.remove_reaction(react, user)
+                    except discord.HTTPException:
+                        pass
+
+                    self.previous = self.current
+                    await self.indexer(ctx, control)
+
+                    if self.previous == self.current:
+                        continue
+
+                    try:
+                        page = await self.get_page(self.current)
+                    except IndexError:
+                        # An unknown length source ran out, so we now know where the end is.
+                        self.current = self.previous
+                        await self.set_eof()
+                        continue
+
+                    try:
+                        await self.base.edit(embed=page)
+                    except (KeyError, discord.HTTPException):
+                        pass
+        finally:
+            if self.source:
+                await self.source.close()
 
     async def stop_controller(self, message):
         try:
@@ -213,6 +393,9 @@ class SimplePaginator:
         except discord.HTTPException:
             pass
 
+        if self.source:
+            await self.source.close()
+
         try:
             self.controller.cancel()
         except Exception:
@@ -221,26 +404,34 @@ class SimplePaginator:
     def formmater(self, chunk):
         return '\n'.join(f'{self.prepend}{self.fmt}{value}{self.fmt[::-1]}{self.append}' for value in chunk)
 
+    def entry_page(self, chunk, index):
+        page = discord.Embed(title=f'{self.title} - {index + 1}/{self.source.page_count}', color=self.colour)
+        page.description = self.formmater(chunk)
+
+        if self.footer:
+            page.set_footer(text=self.footer)
+        return page
+
     async def paginate(self, ctx):
         if self.extras:
             self.pages = [p for p in self.extras if isinstance(p, discord.Embed)]
 
-        if self.entries:
-            chunks = [c async for c in pager(self.entries, self.length)]
-
-            for index, chunk in enumerate(chunks):
-                page = discord.Embed(title=f'{self.title} - {index + 1}/{len(chunks)}', color=self.colour)
-                page.description = self.formmater(chunk)
+        if self.entries and not self.source:
+            self.source = ListPageSource(self.entries, per_page=self.length, formatter=self.entry_page)
 
-                if self.footer:
-                    page.set_footer(text=self.footer)
-                self.pages.append(page)
-
-        if not self.pages:
+        try:
+            await self.get_page(0)
+        except IndexError:
+            if self.source:
+                await self.source.close()
             raise utils.EvieeBaseException('There must be enough data to create at least 1 page for pagination.')
 
-        self.eof = float(len(self.pages) - 1)
-        self.controls['⏭'] = self.eof
+        if self.source and self.source.page_count is None:
+            self.eof = float('inf')
+            self.controls['⏭'] = 'end'
+        else:
+            await self.set_eof()
+
         self.controller = ctx.bot.loop.create_task(self.reaction_controller(ctx))
 
 
@@ -451,27 +642,18 @@ class ProfilePaginator(SimplePaginator):
 
 class EmojiPaginator(SimplePaginator):
 
-    __slots__ = ('chunks', )
+    __slots__ = ()
 
     def __init__(self, **kwargs):
-        self.chunks = kwargs.get('chunks')
         super().__init__(**kwargs)
+        self.source = ListPageSource(kwargs.get('emojis'), per_page=16, formatter=self.emoji_page)
 
-    async def paginate(self, ctx):
-        for index, chunk in enumerate(self.chunks):
-            if index % 2 == 0:
-                page = discord.Embed(color=self.colour)
-                page.add_field(name='\u200b', value='\n'.join(f'{e} | [{e.name}]({e.url})' for e in chunk))
-                self.pages.append(page)
-            else:
-                page.add_field(name='\u200b', value='\n'.join(f'{e} | [{e.name}]({e.url})' for e in chunk))
-
-        for index, page in enumerate(self.pages, 1):
-            page.title = f'{self.title} - {index}/{len(self.pages)}'
+    def emoji_page(self, emojis, index):
+        page = discord.Embed(title=f'{self.title} - {index + 1}/{self.source.page_count}', color=self.colour)
 
-        self.eof = float(len(self.pages) - 1)
-        self.controls['⏭'] = self.eof
-        self.controller = ctx.bot.loop.create_task(self.reaction_controller(ctx))
+        for x in range(0, len(emojis), 8):
+            page.add_field(name='\u200b', value='\n'.join(f'{e} | [{e.name}]({e.url})' for e in emojis[x:x + 8]))
+        return page
 
 
 class SpotifyPaginator(SimplePaginator):
@@ -0,0 +1,173 @@
+"""The MIT License (MIT)
+
+Copyright (c) 2018 EvieePy
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+import asyncio
+import time
+
+import utils
+
+
+__all__ = ('ProcessResult', 'run_process', 'run_cached', 'invalidate_process')
+
+
+MAX_CONCURRENT = 4
+OUTPUT_LIMIT = 512 * 1024
+
+_semaphore = None
+_cache = {}
+_pending = {}
+
+
+class ProcessResult:
+
+    __slots__ = ('args', 'returncode', 'stdout', 'stderr', 'truncated', 'elapsed')
+
+    def __init__(self, args, returncode, stdout, stderr, truncated, elapsed):
+        self.args = args
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.truncated = truncated
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        return f'<ProcessResult args: {self.args}, returncode: {self.returncode}, elapsed: {self.elapsed:.3f}s>'
+
+    @property
+    def ok(self):
+        return self.returncode == 0
+
+    @property
+    def out(self):
+        return self.stdout.decode(errors='replace').strip()
+
+    @property
+    def err(self):
+        return self.stderr.decode(errors='replace').strip()
+
+
+async def _read(stream, limit):
+    data = bytearray()
+    truncated = False
+
+    while True:
+        chunk = await stream.read(65536)
+        if not chunk:
+            break
+
+        remaining = limit - len(data)
+        if len(chunk) > remaining:
+            truncated = True
+        # Keep draining past the limit, otherwise a chatty process blocks on a full pipe.
+        if remaining > 0:
+            data.extend(chunk[:remaining])
+
+    return bytes(data), truncated
+
+
+async def run_process(*args, shell=False, timeout=30, limit=OUTPUT_LIMIT, cwd=None, env=None):
+    """Run a child process without blocking the event loop.
+
+    At most MAX_CONCURRENT processes run at once, output is capped at limit bytes per stream and the process
+    is killed once timeout seconds pass, raising ProcessTimeout.
+    """
+    global _semaphore
+
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(MAX_CONCURRENT)
+
+    pipe = asyncio.subprocess.PIPE
+
+    async with _semaphore:
+        started = time.perf_counter()
+
+        if shell:
+            proc = await asyncio.create_subprocess_shell(args[0], stdout=pipe, stderr=pipe, cwd=cwd, env=env)
+        else:
+            proc = await asyncio.create_subprocess_exec(*args, stdout=pipe, stderr=pipe, cwd=cwd, env=env)
+
+        try:
+            (out, otrunc), (err, etrunc), _ = await asyncio.wait_for(
+                asyncio.gather(_read(proc.stdout, limit), _read(proc.stderr, limit), proc.wait()), timeout=timeout)
+        except asyncio.TimeoutError:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+
+            await proc.wait()
+            raise utils.ProcessTimeout(f'Process <{" ".join(args)}> timed out after {timeout} seconds.')
+        except asyncio.CancelledError:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+
+            # Shielded, so the child is still reaped if we are cancelled again while waiting.
+            await asyncio.shield(proc.wait())
+            raise
+
+    return ProcessResult(args, proc.returncode, out, err, otrunc or etrunc, time.perf_counter() - started)
+
+
+async def run_cached(*args, ttl=3600, **kwargs):
+    """Run an idempotent process, caching its result for ttl seconds.
+
+    Concurrent calls with the same arguments share a single child process.
+    Failed processes are never cached.
+    """
+    key = (args, kwargs.get('cwd'))
+
+    try:
+        expires, result = _cache[key]
+    except KeyError:
+        pass
+    else:
+        if time.monotonic() < expires:
+            return result
+        del _cache[key]
+
+    try:
+        return await asyncio.shield(_pending[key])
+    except KeyError:
+        pass
+
+    future = asyncio.ensure_future(run_process(*args, **kwargs))
+    _pending[key] = future
+
+    try:
+        result = await asyncio.shield(future)
+    finally:
+        _pending.pop(key, None)
+
+    if result.ok:
+        _cache[key] = (time.monotonic() + ttl, result)
+
+    return result
+
+
+def invalidate_process(*args, cwd=None):
+    """Drop a cached process result. Calling with no arguments clears the whole cache."""
+    if not args:
+        return _cache.clear()
+
+    _cache.pop((args, cwd), None)
@@ -0,0 +1,155 @@
+"""The MIT License (MIT)
+
+Copyright (c) 2018 EvieePy
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+import asyncio
+
+
+__all__ = ('ReactionRouter', 'ReactionSession')
+
+
+_TIMEOUT = object()
+_CLOSED = object()
+
+
+class ReactionSession:
+    """Reactions routed to a single message. Created with ReactionRouter.listen."""
+
+    __slots__ = ('router', 'message_id', 'check', 'queue', 'closed', '_timer')
+
+    def __init__(self, router, message_id, check):
+        self.router = router
+        self.message_id = message_id
+        self.check = check
+        self.queue = asyncio.Queue()
+        self.closed = False
+        self._timer = None
+
+    def __repr__(self):
+        return f'<ReactionSession message_id: {self.message_id}, pending: {self.queue.qsize()}>'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    async def wait(self, *, timeout=None):
+        """Wait for the next reaction passing our check. Returns (reaction, user).
+
+        Raises asyncio.TimeoutError if none arrives within timeout seconds, or the session is closed.
+        """
+        if self.closed:
+            raise asyncio.TimeoutError
+
+        # Each wait gets its own token, so a timeout queued after a reaction is ignored by later waits.
+        token = object()
+        if timeout is not None:
+            self._timer = self.router.bot.timers.call_later(timeout, self._expire, token)
+
+        try:
+            while True:
+                item = await self.queue.get()
+
+                if item is _CLOSED:
+                    raise asyncio.TimeoutError
+                elif item[0] is not _TIMEOUT:
+                    return item
+                elif item[1] is token:
+                    self.router.timeouts += 1
+                    raise asyncio.TimeoutError
+        finally:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+
+    def _expire(self, token):
+        self._timer = None
+        self.queue.put_nowait((_TIMEOUT, token))
+
+    def close(self):
+        if self.closed:
+            return
+
+        self.closed = True
+        self.router.remove(self)
+        self.queue.put_nowait(_CLOSED)
+
+
+class ReactionRouter:
+    """Routes reaction_add events to the one session listening on that message.
+
+    Each reaction is a single dict lookup, instead of running the check of every wait_for('reaction_add') waiter.
+    """
+
+    __slots__ = ('bot', 'sessions', 'opened', 'dispatched', 'ignored', 'rejected', 'timeouts')
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.sessions = {}
+
+        self.opened = 0
+        self.dispatched = 0
+        self.ignored = 0
+        self.rejected = 0
+        self.timeouts = 0
+
+        bot.add_listener(self.on_reaction_add)
+
+    def __repr__(self):
+        return f'<ReactionRouter active: {self.active}, dispatched: {self.dispatched}, timeouts: {self.timeouts}>'
+
+    @property
+    def active(self):
+        return len(self.sessions)
+
+    def listen(self, message, *, check=None):
+        """Start routing reactions on message to a new session, replacing any previous session on it.
+
+        check(reaction, user) filters reactions, and reactions from the bot itself are always ignored.
+        """
+        previous = self.sessions.get(message.id)
+        if previous:
+            previous.close()
+
+        session = ReactionSession(self, message.id, check)
+        self.sessions[message.id] = session
+        self.opened += 1
+
+        return session
+
+    def remove(self, session):
+        if self.sessions.get(session.message_id) is session:
+            del self.sessions[session.message_id]
+
+    async def on_reaction_add(self, reaction, user):
+        session = self.sessions.get(reaction.message.id)
+
+        if session is None:
+            self.ignored += 1
+            return
+
+        if user.id == self.bot.user.id or (session.check and not session.check(reaction, user)):
+            self.rejected += 1
+            return
+
+        self.dispatched += 1
+        session.queue.put_nowait((reaction, user))
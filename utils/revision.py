@@ -0,0 +1,142 @@
+"""The MIT License (MIT)
+
+Copyright (c) 2018 EvieePy
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+import datetime
+import os
+import zlib
+
+import utils
+
+
+__all__ = ('Revision', 'read_head', 'read_revisions', 'get_revisions')
+
+
+class Revision:
+
+    __slots__ = ('sha', 'subject', 'timestamp')
+
+    def __init__(self, sha, subject, timestamp):
+        self.sha = sha
+        self.subject = subject
+        self.timestamp = timestamp
+
+    def __str__(self):
+        return f'{self.short} {self.subject}'
+
+    @property
+    def short(self):
+        return self.sha[:7]
+
+    @property
+    def committed(self):
+        return datetime.datetime.utcfromtimestamp(self.timestamp)
+
+
+def read_head(root='.'):
+    """Resolve HEAD to a commit sha by reading .git directly. Returns None if it can not be resolved."""
+    git = os.path.join(root, '.git')
+
+    try:
+        with open(os.path.join(git, 'HEAD')) as f:
+            head = f.read().strip()
+    except OSError:
+        return None
+
+    if not head.startswith('ref: '):
+        return head
+
+    ref = head[5:]
+    try:
+        with open(os.path.join(git, ref)) as f:
+            return f.read().strip()
+    except OSError:
+        pass
+
+    try:
+        with open(os.path.join(git, 'packed-refs')) as f:
+            for line in f:
+                if line.endswith(f' {ref}\n'):
+                    return line.split(' ', 1)[0]
+    except OSError:
+        pass
+
+    return None
+
+
+def _read_commit(git, sha):
+    with open(os.path.join(git, 'objects', sha[:2], sha[2:]), 'rb') as f:
+        raw = zlib.decompress(f.read())
+
+    header, _, body = raw.partition(b'\x00')
+    if not header.startswith(b'commit '):
+        raise ValueError(f'Object {sha} is not a commit.')
+
+    meta, _, message = body.decode(errors='replace').partition('\n\n')
+    parent = None
+    timestamp = 0
+
+    for line in meta.splitlines():
+        if line.startswith('parent ') and parent is None:
+            parent = line[7:]
+        elif line.startswith('committer '):
+            timestamp = int(line.rsplit(' ', 2)[1])
+
+    return Revision(sha, message.strip().split('\n', 1)[0], timestamp), parent
+
+
+def read_revisions(sha, count=5, root='.'):
+    """Walk first parents from sha using loose objects only.
+
+    Raises OSError when an object has been packed, in which case git itself needs to be asked.
+    """
+    git = os.path.join(root, '.git')
+    revisions = []
+
+    while sha and len(revisions) < count:
+        revision, sha = _read_commit(git, sha)
+        revisions.append(revision)
+
+    return revisions
+
+
+async def get_revisions(count=5, root='.'):
+    """Return the latest revisions, reading .git directly and falling back to a single cached git call."""
+    head = read_head(root)
+
+    if head:
+        try:
+            return head, read_revisions(head, count, root)
+        except (OSError, ValueError, zlib.error):
+            pass
+
+    result = await utils.run_cached('git', 'log', f'-{count}', '--format=%H%x00%s%x00%ct', head or 'HEAD',
+                                    cwd=root, ttl=86400, timeout=10)
+    if not result.ok:
+        return head, []
+
+    revisions = []
+
+    for line in result.out.splitlines():
+        sha, subject, timestamp = line.split('\x00')
+        revisions.append(Revision(sha, subject, int(timestamp)))
+
+    return head, revisions
@@ -0,0 +1,177 @@
+"""The MIT License (MIT)
+
+Copyright (c) 2018 EvieePy
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+import ast
+import json
+import os
+import re
+
+from .fuzzy import FinderIndex
+
+
+__all__ = ('DPYSource', 'RTFSIndex')
+
+
+CACHE_DIR = 'cache'
+FORMAT = 1
+
+
+class DPYSource:
+
+    __slots__ = ('file', 'obj', 'parent', 'index', 'path', 'match')
+
+    def __init__(self, **attrs):
+        self.file = attrs.get('file')
+        self.obj = attrs.get('obj')
+        self.parent = attrs.get('parent')
+        self.index = attrs.get('index')
+        self.path = attrs.get('path')
+        self.match = attrs.get('match')
+
+    def to_list(self):
+        return [self.file, self.obj, self.parent, self.index, self.path]
+
+    @classmethod
+    def from_list(cls, data):
+        file, obj, parent, index, path = data
+        match = f'{file}.{parent}.{obj}' if parent else f'{file}.{obj}'
+
+        return cls(file=file, obj=obj, parent=parent, index=index, path=path, match=match)
+
+
+class RTFSIndex:
+    """An anchor index of the installed discord.py, built by parsing its files with ast.
+
+    The anchors are persisted to disk keyed by package version and a file signature, so a restart only
+    re-parses when the package has actually changed.
+    """
+
+    PACKAGES = ('discord', 'discord/ext/commands')
+
+    def __init__(self, version, anchors):
+        self.version = version
+        self.anchors = anchors
+
+        self.files = FinderIndex(anchors, key=lambda a: a.file)
+        self.matches = FinderIndex(anchors, key=lambda a: a.match)
+        self.tails = FinderIndex(anchors, key=lambda a: a.match.split('.', 1)[-1])
+        self.objects = FinderIndex(anchors, key=lambda a: a.obj)
+
+    def __repr__(self):
+        return f'<RTFSIndex version: {self.version}, anchors: {len(self.anchors)}>'
+
+    def __len__(self):
+        return len(self.anchors)
+
+    @staticmethod
+    def get_version(root):
+        with open(os.path.join(root, 'discord', '__init__.py'), encoding='utf-8') as f:
+            match = re.search(r'^__version__\s*=\s*[\'"]([^\'"]*)[\'"]', f.read(), re.MULTILINE)
+
+        return match.group(1) if match else 'unknown'
+
+    @classmethod
+    def get_files(cls, root):
+        for package in cls.PACKAGES:
+            directory = os.path.join(root, package)
+
+            for name in sorted(os.listdir(directory)):
+                if name.endswith('.py') and not name.startswith('__'):
+                    yield package, os.path.join(directory, name)
+
+    @classmethod
+    def signature(cls, root):
+        sig = []
+        for package, path in cls.get_files(root):
+            stat = os.stat(path)
+            sig.append([package, os.path.basename(path), stat.st_mtime_ns, stat.st_size])
+
+        return sig
+
+    @staticmethod
+    def parse(package, path):
+        with open(path, encoding='utf-8') as f:
+            tree = ast.parse(f.read(), filename=path)
+
+        file = os.path.basename(path)[:-3]
+        anchors = []
+
+        def add(node, parent=None):
+            if '__' in node.name:
+                return
+            if parent == node.name:
+                parent = None
+            anchors.append([file, node.name, parent, node.lineno - 1, package])
+
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                add(node)
+            elif isinstance(node, ast.ClassDef):
+                add(node)
+                for child in node.body:
+                    if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                        add(child, node.name)
+
+        return anchors
+
+    @classmethod
+    def load(cls, root, *, cache_dir=CACHE_DIR):
+        """Load the index from disk, rebuilding and persisting it when the installed package changed.
+
+        root is the directory containing the discord package. This blocks, so run it in an executor.
+        """
+        version = cls.get_version(root)
+        signature = cls.signature(root)
+        path = os.path.join(cache_dir, f'rtfs-{version}.json')
+
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = None
+
+        if data and data.get('format') == FORMAT and data.get('signature') == signature:
+            return cls(version, [DPYSource.from_list(a) for a in data['anchors']])
+
+        raw = []
+        for package, file in cls.get_files(root):
+            try:
+                raw.extend(cls.parse(package, file))
+            except (SyntaxError, UnicodeDecodeError):
+                continue
+
+        os.makedirs(cache_dir, exist_ok=True)
+        temp = f'{path}.tmp'
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump({'format': FORMAT, 'version': version, 'signature': signature, 'anchors': raw}, f)
+        os.replace(temp, path)
+
+        return cls(version, [DPYSource.from_list(a) for a in raw])
+
+    def search(self, source, limit=5):
+        """Search anchors the same way rtfs always has. Returns a list of DPYSource."""
+        if source.endswith('.py'):
+            return self.files.search(source.replace('.py', '').lower(), limit=limit)
+        elif '.' in source:
+            return self.matches.search(source, limit=limit) or self.tails.search(source, limit=limit)
+
+        return self.objects.search(source, limit=limit)
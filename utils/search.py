@@ -0,0 +1,187 @@
+"""The MIT License (MIT)
+
+Copyright (c) 2018 EvieePy
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+import asyncio
+import datetime
+import json
+import time
+from collections import OrderedDict
+
+
+__all__ = ('TrackSearchCache', )
+
+
+SEARCH_PREFIXES = ('ytsearch:', 'scsearch:')
+
+
+class TrackSearchCache:
+    """Cross guild cache in front of Lavalink's get_tracks.
+
+    Results are kept in memory for ttl seconds, least recently used first out past limit, and in the
+    track_searches table for persist_ttl seconds, so restarts do not start cold. Concurrent identical searches
+    share one in flight request. Empty results are never cached.
+    """
+
+    def __init__(self, bot, *, ttl=3600, limit=4096, persist_ttl=7 * 86400):
+        self.bot = bot
+        self.ttl = ttl
+        self.limit = limit
+        self.persist_ttl = datetime.timedelta(seconds=persist_ttl)
+
+        self._cache = OrderedDict()
+        self._inflight = {}
+        self._persist = False
+
+        self.hits = 0
+        self.persisted = 0
+        self.coalesced = 0
+        self.misses = 0
+        self.fetch_time = 0.0
+
+    def __repr__(self):
+        return f'<TrackSearchCache entries: {len(self._cache)}, hit rate: {self.hit_rate:.1%}>'
+
+    def __len__(self):
+        return len(self._cache)
+
+    @property
+    def lookups(self):
+        return self.hits + self.persisted + self.coalesced + self.misses
+
+    @property
+    def hit_rate(self):
+        return (self.lookups - self.misses) / self.lookups if self.lookups else 0.0
+
+    @property
+    def average_fetch(self):
+        return self.fetch_time / self.misses if self.misses else 0.0
+
+    @property
+    def saved(self):
+        """Estimated seconds of Lavalink requests avoided, at the average cost of a miss."""
+        return (self.lookups - self.misses) * self.average_fetch
+
+    @staticmethod
+    def normalize(query):
+        """Searches are case and whitespace insensitive, URLs are kept as they are."""
+        query = query.strip()
+
+        for prefix in SEARCH_PREFIXES:
+            if query.startswith(prefix):
+                return prefix + ' '.join(query[len(prefix):].split()).casefold()
+        return query
+
+    async def prepare(self):
+        """Create the persistent tier. Without a pool the cache is memory only."""
+        pool = getattr(self.bot, 'pool', None)
+        if pool is None:
+            return
+
+        await pool.execute("""CREATE TABLE IF NOT EXISTS track_searches(
+                                  query TEXT PRIMARY KEY,
+                                  result TEXT NOT NULL,
+                                  cached TIMESTAMP NOT NULL DEFAULT (now() at time zone 'utc'))""")
+        await pool.execute("""DELETE FROM track_searches WHERE cached < (now() at time zone 'utc') - $1::interval""",
+                           self.persist_ttl)
+        self._persist = True
+
+    def invalidate(self, query=None):
+        if query is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(self.normalize(query), None)
+
+    async def get_tracks(self, query):
+        key = self.normalize(query)
+
+        try:
+            expires, result = self._cache[key]
+        except KeyError:
+            pass
+        else:
+            if expires > time.monotonic():
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return result
+            del self._cache[key]
+
+        try:
+            future = self._inflight[key]
+        except KeyError:
+            pass
+        else:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        future = self.bot.loop.create_task(self._lookup(key, query))
+        self._inflight[key] = future
+
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if future.done():
+                self._inflight.pop(key, None)
+            else:
+                future.add_done_callback(lambda f: self._inflight.pop(key, None))
+
+    async def _lookup(self, key, query):
+        result = await self._load(key) if self._persist else None
+
+        if result:
+            self.persisted += 1
+        else:
+            started = time.perf_counter()
+            result = await self.bot.nodes.get_tracks(query)
+            self.fetch_time += time.perf_counter() - started
+            self.misses += 1
+
+            if not result or not result.get('tracks'):
+                return result
+
+            if self._persist:
+                self.bot.loop.create_task(self._store(key, result))
+
+        self._cache[key] = (time.monotonic() + self.ttl, result)
+        if len(self._cache) > self.limit:
+            self._cache.popitem(last=False)
+
+        return result
+
+    async def _load(self, key):
+        try:
+            raw = await self.bot.pool.fetchval("""SELECT result FROM track_searches
+                                                  WHERE query = $1
+                                                  AND cached >= (now() at time zone 'utc') - $2::interval""",
+                                               key, self.persist_ttl)
+        except Exception:
+            return None
+
+        return json.loads(raw) if raw else None
+
+    async def _store(self, key, result):
+        try:
+            await self.bot.pool.execute("""INSERT INTO track_searches(query, result) VALUES($1, $2)
+                                           ON CONFLICT(query) DO UPDATE
+                                           SET result = EXCLUDED.result, cached = EXCLUDED.cached""",
+                                        key, json.dumps(result))
+        except Exception:
+            pass
@@ -0,0 +1,187 @@
+"""The MIT License (MIT)
+
+Copyright (c) 2018 EvieePy
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+import functools
+import inspect
+import linecache
+import os
+import pathlib
+import textwrap
+
+import utils
+
+
+__all__ = ('SourceEntry', 'SourceIndex')
+
+
+class SourceEntry:
+
+    __slots__ = ('path', 'source', 'lines')
+
+    def __init__(self, path, source):
+        self.path = path
+        self.source = source
+        self.lines = source.count('\n')
+
+    def __repr__(self):
+        return f'<SourceEntry path: {self.path}, lines: {self.lines}>'
+
+
+class SourceIndex:
+    """Line counts and source for our own files, commands, cogs and extensions.
+
+    Files are keyed by path and mtime. update() only re-reads files whose mtime changed and drops any
+    command, cog or extension entries which came from them, so lookups never touch the filesystem.
+    """
+
+    def __init__(self, root='.', exclude=('venv',)):
+        self.root = pathlib.Path(root).resolve()
+        self.exclude = exclude
+
+        self.files = {}
+        self.commands = {}
+        self.cogs = {}
+        self.modules = {}
+
+    def __repr__(self):
+        return f'<SourceIndex files: {len(self.files)}, lines: {self.total}>'
+
+    @property
+    def total(self):
+        return sum(lines for _, lines in self.files.values())
+
+    def walk(self):
+        for path in self.root.rglob('*.py'):
+            if not str(path.relative_to(self.root)).startswith(self.exclude):
+                yield str(path)
+
+    @staticmethod
+    def count(path):
+        with open(path, 'rb') as f:
+            return sum(1 for _ in f)
+
+    async def update(self, bot):
+        """Scan our files and read the source of new bot objects in an executor, then swap the results in."""
+        to_do = functools.partial(self.scan, dict(self.files))
+        files, changed = await utils.evieecutor(to_do, loop=bot.loop)
+        self.apply(files, changed)
+
+        # inspect reads and tokenizes each source file, so only collecting the objects happens on the loop.
+        to_do = functools.partial(self.read, self.pending(bot))
+        for name, key, entry in await utils.evieecutor(to_do, loop=bot.loop):
+            getattr(self, name).setdefault(key, entry)
+
+        return changed
+
+    def scan(self, cached):
+        """Build a new file mapping from cached, re-reading changed files. Returns (files, changed).
+
+        This blocks, but does not touch the index, so it is safe to run in an executor.
+        """
+        files = {}
+        changed = set()
+
+        for path in self.walk():
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                continue
+
+            entry = cached.get(path)
+            if entry and entry[0] == mtime:
+                files[path] = entry
+                continue
+
+            try:
+                files[path] = (mtime, self.count(path))
+            except OSError:
+                continue
+            changed.add(path)
+
+        changed.update(set(cached) - set(files))
+        return files, changed
+
+    def apply(self, files, changed):
+        """Swap in a file mapping from scan and drop the entries which came from changed files."""
+        self.files = files
+
+        if not changed:
+            return
+
+        linecache.checkcache()
+
+        self.commands = {k: e for k, e in self.commands.items() if e.path not in changed}
+        self.cogs = {k: e for k, e in self.cogs.items() if e.path not in changed}
+        self.modules = {k: e for k, e in self.modules.items() if e.path not in changed}
+
+    def pending(self, bot):
+        """Drop entries for objects the bot no longer has. Returns (mapping name, key, obj) for those not indexed."""
+        commands = {c.qualified_name: c.callback for c in bot.walk_commands()}
+        cogs = {type(c).__name__: type(c) for c in bot.cogs.values()}
+        modules = {**bot.extensions, **bot.extensions_other}
+
+        pending = []
+        for name, objects in (('commands', commands), ('cogs', cogs), ('modules', modules)):
+            mapping = {k: e for k, e in getattr(self, name).items() if k in objects}
+            setattr(self, name, mapping)
+
+            pending.extend((name, key, obj) for key, obj in objects.items() if key not in mapping)
+        return pending
+
+    @classmethod
+    def read(cls, pending):
+        """Read the source for pending objects. This blocks. Returns (mapping name, key, entry) for each found."""
+        found = []
+        for name, key, obj in pending:
+            entry = cls.entry(obj)
+            if entry:
+                found.append((name, key, entry))
+        return found
+
+    @staticmethod
+    def entry(obj):
+        try:
+            source = textwrap.dedent(inspect.getsource(obj))
+        except (OSError, TypeError):
+            return None
+
+        return SourceEntry(os.path.abspath(inspect.getsourcefile(obj)), source)
+
+    def _get(self, mapping, key, obj):
+        try:
+            return mapping[key]
+        except KeyError:
+            pass
+
+        entry = self.entry(obj)
+        if entry:
+            mapping[key] = entry
+        return entry
+
+    def command(self, command):
+        return self._get(self.commands, command.qualified_name, command.callback)
+
+    def cog(self, cog):
+        return self._get(self.cogs, type(cog).__name__, type(cog))
+
+    def module(self, module, name=None):
+        return self._get(self.modules, name or module.__name__, module)
@@ -0,0 +1,285 @@
+"""The MIT License (MIT)
+
+Copyright (c) 2018 EvieePy
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+import asyncio
+import heapq
+import inspect
+import itertools
+import math
+import traceback
+
+
+__all__ = ('TimerWheel', 'TimerHandle')
+
+
+class TimerHandle:
+    """A scheduled callback on a TimerWheel. Cancelling is O(1) and safe to call more than once."""
+
+    __slots__ = ('wheel', 'when', 'tick', 'seq', 'callback', 'args', 'interval', 'cancelled', 'task', '_slot')
+
+    def __init__(self, wheel, when, callback, args, interval=None):
+        self.wheel = wheel
+        self.when = when
+        self.tick = 0
+        self.seq = 0
+        self.callback = callback
+        self.args = args
+        self.interval = interval
+        self.cancelled = False
+        self.task = None
+        self._slot = None
+
+    def __repr__(self):
+        name = getattr(self.callback, '__qualname__', repr(self.callback))
+        state = 'cancelled' if self.cancelled else f'when: {self.when:.2f}'
+        return f'<TimerHandle {name} {state}{" periodic" if self.interval else ""}>'
+
+    def __lt__(self, other):
+        return (self.when, self.seq) < (other.when, other.seq)
+
+    @property
+    def pending(self):
+        return self._slot is not None
+
+    def remaining(self):
+        return max(0.0, self.when - self.wheel.loop.time())
+
+    def cancel(self):
+        if self.cancelled:
+            return
+
+        self.cancelled = True
+        self.wheel._remove(self)
+
+        if self.task and not self.task.done():
+            self.task.cancel()
+
+
+class TimerWheel:
+    """Hashed hierarchical timer wheel shared by the whole bot.
+
+    Deadlines are rounded up to ticks of resolution seconds. Each level has 2 ** bits slots, and a level covers
+    2 ** bits times the span of the level below it; timers far in the future sit in a coarse slot and cascade
+    down a level as the wheel reaches them. Scheduling and cancelling are O(1) no matter how many timers exist.
+
+    The wheel is driven by a single loop handle armed for the next tick that has work, so an idle wheel or one
+    holding only distant timers does not wake up every tick. Callbacks due on the same tick run in deadline order.
+    Coroutine functions are run as tasks, and periodic coroutines are rescheduled once they finish, so they never
+    overlap.
+    """
+
+    def __init__(self, loop=None, *, resolution=0.1, bits=8, levels=4):
+        self.loop = loop or asyncio.get_event_loop()
+        self.resolution = resolution
+        self.bits = bits
+        self.mask = (1 << bits) - 1
+        self.levels = [[set() for _ in range(1 << bits)] for _ in range(levels)]
+        self.overflow = set()
+
+        self.origin = self.loop.time()
+        self.current = 0
+        self.count = 0
+        self.fired = 0
+
+        self._seq = itertools.count()
+        self._handle = None
+        self._armed = None
+
+    def __repr__(self):
+        return f'<TimerWheel timers: {self.count}, fired: {self.fired}, resolution: {self.resolution}>'
+
+    def __len__(self):
+        return self.count
+
+    def call_later(self, delay, callback, *args):
+        """Schedule callback(*args) to run in delay seconds."""
+        return self.call_at(self.loop.time() + max(0, delay), callback, *args)
+
+    def call_at(self, when, callback, *args):
+        """Schedule callback(*args) to run at the loop time when."""
+        handle = TimerHandle(self, when, callback, args)
+        self._insert(handle)
+        return handle
+
+    def every(self, interval, callback, *args, delay=None):
+        """Run callback(*args) every interval seconds, first after delay seconds. Defaults to interval."""
+        if interval <= 0:
+            raise ValueError('Interval must be greater than 0.')
+
+        handle = TimerHandle(self, self.loop.time() + (interval if delay is None else delay), callback, args,
+                             interval=interval)
+        self._insert(handle)
+        return handle
+
+    def reschedule(self, handle, delay):
+        """Move a pending or fired, but not cancelled, handle to fire in delay seconds."""
+        if handle.cancelled:
+            raise ValueError('Can not reschedule a cancelled timer.')
+
+        self._remove(handle)
+        handle.when = self.loop.time() + max(0, delay)
+        self._insert(handle)
+        return handle
+
+    def cancel_all(self):
+        for handle in [h for level in self.levels for slot in level for h in slot] + list(self.overflow):
+            handle.cancel()
+
+    def _insert(self, handle):
+        handle.seq = next(self._seq)
+        handle.tick = tick = max(self.current + 1, math.ceil((handle.when - self.origin) / self.resolution))
+
+        slot = self._slot_for(tick)
+        slot.add(handle)
+        handle._slot = slot
+        self.count += 1
+
+        if self._armed is None or tick < self._armed:
+            self._arm(tick)
+
+    def _slot_for(self, tick):
+        delta = tick - self.current
+
+        for index, level in enumerate(self.levels):
+            if delta < 1 << (self.bits * (index + 1)):
+                return level[(tick >> (self.bits * index)) & self.mask]
+        return self.overflow
+
+    def _remove(self, handle):
+        slot = handle._slot
+        if slot is None:
+            return
+
+        handle._slot = None
+        slot.discard(handle)
+        self.count -= 1
+
+    def _next_tick(self):
+        """The first tick at or after current + 1 that has timers due or a cascade to perform."""
+        base = self.levels[0]
+        boundary = (self.current | self.mask) + 1
+
+        for tick in range(self.current + 1, boundary):
+            if base[tick & self.mask]:
+                return tick
+
+        return boundary
+
+    def _arm(self, tick):
+        if self._handle:
+            self._handle.cancel()
+
+        self._armed = tick
+        self._handle = self.loop.call_at(self.origin + tick * self.resolution, self._run)
+
+    def _cascade(self, tick):
+        depth = 1
+        while depth < len(self.levels) and not tick & ((1 << (self.bits * depth)) - 1):
+            depth += 1
+
+        # Higher levels first, so timers they hand down are picked up by the cascades below them.
+        spills = [self.overflow] if depth == len(self.levels) else []
+        spills += [self.levels[level][(tick >> (self.bits * level)) & self.mask] for level in range(depth - 1, 0, -1)]
+
+        for slot in spills:
+            handles = list(slot)
+            slot.clear()
+
+            for handle in handles:
+                target = self._slot_for(handle.tick)
+                target.add(handle)
+                handle._slot = target
+
+    def _run(self):
+        self._handle = None
+        self._armed = None
+
+        # The loop may run us a hair before the deadline, so allow for its clock resolution.
+        now = math.floor((self.loop.time() - self.origin) / self.resolution + 1e-6)
+        due = []
+
+        while self.current < now and self.count:
+            tick = self.current + 1
+            self.current = tick
+
+            if not tick & self.mask:
+                self._cascade(tick)
+
+            slot = self.levels[0][tick & self.mask]
+            if slot:
+                for handle in slot:
+                    handle._slot = None
+                self.count -= len(slot)
+                due.extend(slot)
+                slot.clear()
+
+            if not self.count:
+                break
+
+            # Skip straight to the next tick with work instead of stepping through empty ones.
+            self.current = min(self._next_tick(), now + 1) - 1
+
+        if not self.count:
+            self.current = max(self.current, now)
+
+        heapq.heapify(due)
+        while due:
+            self._fire(heapq.heappop(due))
+
+        # Callbacks may have armed us for their own timers, which is not necessarily the next tick with work.
+        if self.count:
+            tick = self._next_tick()
+            if self._armed is None or tick < self._armed:
+                self._arm(tick)
+
+    def _fire(self, handle):
+        if handle.cancelled:
+            return
+
+        self.fired += 1
+
+        try:
+            result = handle.callback(*handle.args)
+        except Exception:
+            traceback.print_exc()
+            result = None
+
+        if inspect.isawaitable(result):
+            handle.task = asyncio.ensure_future(result, loop=self.loop)
+            handle.task.add_done_callback(lambda t: self._finished(handle, t))
+        elif handle.interval:
+            self._repeat(handle)
+
+    def _finished(self, handle, task):
+        if not task.cancelled() and task.exception():
+            traceback.print_exception(type(task.exception()), task.exception(), task.exception().__traceback__)
+
+        handle.task = None
+        if handle.interval:
+            self._repeat(handle)
+
+    def _repeat(self, handle):
+        if handle.cancelled or handle.pending:
+            return
+
+        handle.when = max(handle.when + handle.interval, self.loop.time())
+        self._insert(handle)